@@ -61,6 +61,36 @@ class StorageType(Enum):
     def __str__(self):
         return self.value
 
+class ByteSourceType(Enum):
+    """
+    How readers fetch the bytes of a dataset file.
+    - Auto = derived from the storage type (posix for file systems, s3 for S3)
+    - Posix = regular file I/O on a mounted file system
+    - MMap = memory-mapped local files
+    - S3 = ranged reads of objects through the S3 storage backend
+    - Cached = read-through copy of the backing storage in a local cache folder
+    """
+    AUTO = 'auto'
+    POSIX = 'posix'
+    MMAP = 'mmap'
+    S3 = 's3'
+    CACHED = 'cached'
+
+    def __str__(self):
+        return self.value
+
+class CachePolicy(Enum):
+    """
+    Eviction policy of the in-memory sample cache.
+    """
+    LRU = 'lru'
+    LFU = 'lfu'
+    ARC = 'arc'
+    FIFO = 'fifo'
+
+    def __str__(self):
+        return self.value
+
 class MetadataType(Enum):
     """
     Different types of storage metadata
@@ -127,6 +157,9 @@ class FormatType(Enum):
     NPZ = 'npz'
     NPY = 'npy'
     HDF5_OPT = 'hdf5_opt'
+    PARQUET = 'parquet'
+    TAR_SHARD = 'tar_shard'
+    CHUNKED_ARRAY = 'chunked_array'
     JPEG = 'jpeg'
     PNG = 'png'
     INDEXED_BINARY = 'indexed_binary'
@@ -150,6 +183,12 @@ class FormatType(Enum):
             return FormatType.NPY            
         elif FormatType.HDF5_OPT.value == value:
             return FormatType.HDF5_OPT
+        elif FormatType.PARQUET.value == value:
+            return FormatType.PARQUET
+        elif FormatType.TAR_SHARD.value == value:
+            return FormatType.TAR_SHARD
+        elif FormatType.CHUNKED_ARRAY.value == value:
+            return FormatType.CHUNKED_ARRAY
         elif FormatType.JPEG.value == value:
             return FormatType.JPEG
         elif FormatType.PNG.value == value:
@@ -172,6 +211,8 @@ class DataLoaderType(Enum):
     CUSTOM='custom'
     NONE='none'
     SYNTHETIC='synthetic'
+    THREADED='threaded'
+    ASYNCIO='asyncio'
     
     def __str__(self):
         return self.value
@@ -274,6 +315,9 @@ class Compression(Enum):
     BZIP2 = 'bz2'
     ZIP = 'zip'
     XZ = 'xz'
+    ZSTD = 'zstd'
+    LZ4 = 'lz4'
+    ZLIB = 'zlib'
 
     def __str__(self):
         return self.value
@@ -0,0 +1,84 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import itertools
+import json
+import os
+
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_DATA_GENERATOR
+from dlio_benchmark.common.enumerations import StorageType
+from dlio_benchmark.data_generator.data_generator import DataGenerator
+from dlio_benchmark.utils.utility import Profile, progress
+
+dlp = Profile(MODULE_DATA_GENERATOR)
+
+
+def chunk_folder(data_folder, filename):
+    """
+    Folder (or bucket prefix) holding the chunk objects of the array stored in filename.
+    Chunks live outside the train/valid folders so that only the metadata files are listed as dataset files.
+    """
+    folder = "valid" if "/valid/" in filename else "train"
+    return f"{data_folder}/chunks/{folder}/{os.path.basename(filename)}"
+
+
+"""
+Generator for creating chunked arrays: a JSON metadata file per array and one object per chunk.
+"""
+class ChunkedArrayGenerator(DataGenerator):
+    def __init__(self):
+        super().__init__()
+
+    def write(self, path, data):
+        if self._args.storage_type == StorageType.S3:
+            self.storage.write(path, data)
+        else:
+            with open(self.storage.get_uri(path), "wb") as fd:
+                fd.write(data)
+
+    @dlp.log
+    def generate(self):
+        """
+        Stores each file as an array of shape (num_samples_per_file, dim1, dim2) split into chunks of
+        dataset.array_chunk_shape. Edge chunks are padded to the full chunk shape and chunk objects are
+        named by their grid coordinates, e.g. 0.1.2.
+        """
+        super().generate()
+        np.random.seed(10)
+        dim = self.get_dimension(self.total_files_to_generate)
+        for i in dlp.iter(range(self.my_rank, self.total_files_to_generate, self.comm_size)):
+            progress(i+1, self.total_files_to_generate, "Generating Chunked Arrays")
+            dim1 = dim[2*i]
+            dim2 = dim[2*i+1]
+            shape = (self.num_samples, int(dim1), int(dim2))
+            chunks = tuple(min(c, s) for c, s in zip(self._args.array_chunk_shape, shape))
+            grid = [range((s + c - 1) // c) for s, c in zip(shape, chunks)]
+            record = np.random.randint(255, size=(dim1, dim2), dtype=np.uint8)
+            array = np.broadcast_to(record, shape)
+            filename = self._file_list[i]
+            folder = chunk_folder(self._args.data_folder, filename)
+            self.storage.create_node(folder, exist_ok=True)
+            for index in itertools.product(*grid):
+                region = tuple(slice(k * c, (k + 1) * c) for k, c in zip(index, chunks))
+                chunk = np.zeros(chunks, dtype=np.uint8)
+                part = array[region]
+                chunk[tuple(slice(0, n) for n in part.shape)] = part
+                self.write(f"{folder}/{'.'.join(str(k) for k in index)}", chunk.tobytes())
+            metadata = {"shape": list(shape), "chunks": list(chunks), "dtype": np.dtype(np.uint8).str}
+            self.write(filename, json.dumps(metadata).encode())
+        np.random.seed()
@@ -17,8 +17,14 @@
 
 from dlio_benchmark.common.enumerations import Compression
 from dlio_benchmark.data_generator.data_generator import DataGenerator
+import bz2
+import contextlib
+import gzip
+import io
+import lzma
 import math
 import os
+import zipfile
 
 import numpy as np
 import csv
@@ -33,9 +39,34 @@ Generator for creating data in CSV format.
 class CSVGenerator(DataGenerator):
     def __init__(self):
         super().__init__()
+
+    @contextlib.contextmanager
+    def open_output(self, out_path_spec):
+        """
+        Opens a text stream to the output file that compresses what is written to it.
+        """
+        if self.compression == Compression.GZIP:
+            fd = gzip.open(out_path_spec, "wt", newline="")
+        elif self.compression == Compression.BZIP2:
+            fd = bz2.open(out_path_spec, "wt", newline="")
+        elif self.compression == Compression.XZ:
+            fd = lzma.open(out_path_spec, "wt", newline="")
+        elif self.compression == Compression.ZIP:
+            with zipfile.ZipFile(out_path_spec, "w", zipfile.ZIP_DEFLATED) as archive:
+                member = os.path.basename(out_path_spec)[:-len(".zip")]
+                with io.TextIOWrapper(archive.open(member, "w"), newline="") as fd:
+                    yield fd
+            return
+        else:
+            fd = open(out_path_spec, "w", newline="")
+        with fd:
+            yield fd
+
     def generate(self):
         """
         Generate csv data for training. It generates a 2d dataset and writes it to file.
+        Rows are written in chunks that fit in generation_buffer_size so the whole file
+        never has to be held in memory.
         """
         super().generate()
         np.random.seed(10)
@@ -46,14 +77,10 @@ class CSVGenerator(DataGenerator):
             dim1 = dim[2*i]
             dim2 = dim[2*i+1]
             record = np.random.randint(255, size=dim1*dim2, dtype=np.uint8)
-            records = [record]*self.num_samples
-            df = pd.DataFrame(data=records)
+            # a uint8 value takes up to four characters of text
+            chunk_rows = max(1, self._args.generation_buffer_size // (4 * record.size))
             out_path_spec = self.storage.get_uri(self._file_list[i])
-            compression = None
             if self.compression != Compression.NONE:
-                compression = {
-                    "method": str(self.compression)
-                }
                 if self.compression == Compression.GZIP:
                     out_path_spec = out_path_spec + ".gz"
                 elif self.compression == Compression.BZIP2:
@@ -62,5 +89,10 @@ class CSVGenerator(DataGenerator):
                     out_path_spec = out_path_spec + ".zip"
                 elif self.compression == Compression.XZ:
                     out_path_spec = out_path_spec + ".xz"
-            df.to_csv(out_path_spec, compression=compression)
+            with self.open_output(out_path_spec) as fd:
+                for start in range(0, self.num_samples, chunk_rows):
+                    stop = min(start + chunk_rows, self.num_samples)
+                    records = np.broadcast_to(record, (stop - start, record.size))
+                    df = pd.DataFrame(data=records, index=range(start, stop))
+                    df.to_csv(fd, header=start == 0)
         np.random.seed()
@@ -24,6 +24,10 @@ from dlio_benchmark.utils.config import ConfigArguments
 # stock generators
 from dlio_benchmark.data_generator.tf_generator import TFRecordGenerator
 from dlio_benchmark.data_generator.hdf5_generator import HDF5Generator
+from dlio_benchmark.data_generator.hdf5_opt_generator import HDF5OptGenerator
+from dlio_benchmark.data_generator.parquet_generator import ParquetGenerator
+from dlio_benchmark.data_generator.tar_shard_generator import TarShardGenerator
+from dlio_benchmark.data_generator.chunked_array_generator import ChunkedArrayGenerator
 from dlio_benchmark.data_generator.csv_generator import CSVGenerator
 from dlio_benchmark.data_generator.npz_generator import NPZGenerator
 from dlio_benchmark.data_generator.npy_generator import NPYGenerator
@@ -58,6 +62,10 @@ except ImportError as e:
 _GEN_MAP = {
     FormatType.TFRECORD: TFRecordGenerator,
     FormatType.HDF5: HDF5Generator,
+    FormatType.HDF5_OPT: HDF5OptGenerator,
+    FormatType.PARQUET: ParquetGenerator,
+    FormatType.TAR_SHARD: TarShardGenerator,
+    FormatType.CHUNKED_ARRAY: ChunkedArrayGenerator,
     FormatType.CSV: CSVGenerator,
     FormatType.NPZ: NPZGenerator,
     FormatType.NPY: NPYGenerator,
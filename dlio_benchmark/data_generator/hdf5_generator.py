@@ -38,6 +38,18 @@ class HDF5Generator(DataGenerator):
         self.chunk_size = self._args.chunk_size
         self.enable_chunking = self._args.enable_chunking
 
+    @dlp.log
+    def save_file(self, out_path_spec, records, record_labels, chunks, compression, compression_level):
+        """
+        Hook for writing one HDF5 file.
+        """
+        dim1, dim2 = records.shape[0], records.shape[1]
+        hf = h5py.File(out_path_spec, 'w')
+        hf.create_dataset('records', (self.num_samples, dim1, dim2), chunks=chunks, compression=compression,
+                                compression_opts=compression_level, dtype=np.uint8, data=records)
+        hf.create_dataset('labels', data=record_labels)
+        hf.close()
+
     @dlp.log    
     def generate(self):
         """
@@ -65,9 +77,5 @@ class HDF5Generator(DataGenerator):
             records = np.random.randint(255, size=(dim1, dim2, self.num_samples), dtype=np.uint8)
             out_path_spec = self.storage.get_uri(self._file_list[i])
             progress(i+1, self.total_files_to_generate, "Generating HDF5 Data")
-            hf = h5py.File(out_path_spec, 'w')
-            hf.create_dataset('records', (self.num_samples, dim1, dim2), chunks=chunks, compression=compression,
-                                    compression_opts=compression_level, dtype=np.uint8, data=records)
-            hf.create_dataset('labels', data=record_labels)
-            hf.close()
+            self.save_file(out_path_spec, records, record_labels, chunks, compression, compression_level)
         np.random.seed()
@@ -0,0 +1,53 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from io import BytesIO
+
+import h5py
+import numpy as np
+
+from dlio_benchmark.common.enumerations import StorageType
+from dlio_benchmark.data_generator.hdf5_generator import HDF5Generator
+from dlio_benchmark.utils.utility import Profile
+
+from dlio_benchmark.common.constants import MODULE_DATA_GENERATOR
+
+dlp = Profile(MODULE_DATA_GENERATOR)
+
+"""
+Generator for creating data in HDF5 format with paged aggregation.
+"""
+class HDF5OptGenerator(HDF5Generator):
+    def __init__(self):
+        super().__init__()
+        self.page_size = self._args.hdf5_page_size
+
+    @dlp.log
+    def save_file(self, out_path_spec, records, record_labels, chunks, compression, compression_level):
+        """
+        Writes one HDF5 file using the paged file space strategy, so that metadata and raw data are
+        aggregated into fs_page_size pages and readers can use the page buffer.
+        Samples are stored sample-major, so a range of samples is one contiguous hyperslab.
+        """
+        dim1, dim2 = records.shape[0], records.shape[1]
+        target = BytesIO() if self._args.storage_type == StorageType.S3 else out_path_spec
+        hf = h5py.File(target, 'w', fs_strategy='page', fs_persist=True, fs_page_size=self.page_size)
+        hf.create_dataset('records', data=records.reshape((self.num_samples, dim1, dim2)), chunks=chunks,
+                          compression=compression, compression_opts=compression_level)
+        hf.create_dataset('labels', data=record_labels)
+        hf.close()
+        if isinstance(target, BytesIO):
+            self.storage.write(out_path_spec[len(self.storage.root):], target.getvalue())
@@ -23,6 +23,7 @@ import numpy as np
 
 from dlio_benchmark.utils.utility import progress, utcnow, DLIOMPI
 from dlio_benchmark.utils.utility import Profile
+from dlio_benchmark.utils.sample_codec import SampleCodec, SAMPLE_CODECS
 from shutil import copyfile
 from dlio_benchmark.common.constants import MODULE_DATA_GENERATOR
 import struct
@@ -43,6 +44,39 @@ class IndexedBinaryGenerator(DataGenerator):
     def index_file_path_size(self, prefix_path):
         return prefix_path + '.sz.idx'
 
+    def compressible_sample(self, sample_size):
+        """
+        Random bytes of which dataset.compressible_fraction are zeros. The zeros end every run of
+        256 bytes, so that all blocks of a sample compress about equally.
+        """
+        sample = np.random.randint(255, size=sample_size, dtype=np.uint8)
+        keep = int(256 * (1 - self._args.compressible_fraction))
+        full = sample_size // 256 * 256
+        sample[:full].reshape(-1, 256)[:, keep:] = 0
+        sample[full + keep:] = 0
+        return sample
+
+    def generate_compressed(self, dim):
+        """
+        Writes every sample compressed on its own; .sz.idx holds the compressed sizes.
+        Samples are generated one by one, so no two of them compress to the same bytes.
+        """
+        codec = SampleCodec(self.compression, self.compression_level, self._args.compression_block_size)
+        for i in dlp.iter(range(self.my_rank, int(self.total_files_to_generate), self.comm_size)):
+            sample_size = dim[2*i] * dim[2*i + 1]
+            out_path_spec = self.storage.get_uri(self._file_list[i])
+            progress(i + 1, self.total_files_to_generate, "Generating Compressed Indexed Binary Data")
+            sizes = np.empty(self.num_samples, dtype=np.uint64)
+            with open(out_path_spec, "wb") as data_file:
+                for j in range(self.num_samples):
+                    sample = codec.compress(self.compressible_sample(sample_size))
+                    sizes[j] = len(sample)
+                    data_file.write(sample)
+            offsets = np.zeros(self.num_samples, dtype=np.uint64)
+            offsets[1:] = np.cumsum(sizes)[:-1]
+            offsets.tofile(self.index_file_path_off(out_path_spec))
+            sizes.tofile(self.index_file_path_size(out_path_spec))
+
     @dlp.log
     def generate(self):
         """
@@ -55,7 +89,11 @@ class IndexedBinaryGenerator(DataGenerator):
         total_samples = self.total_files_to_generate * self.num_samples
         dim = self.get_dimension(self.total_files_to_generate)
         # self.logger.info(dim)
-        if self.total_files_to_generate <= self.comm_size:
+        if Compression(self.compression) in SAMPLE_CODECS:
+            # compressed sizes are only known once a sample is compressed, so no collective I/O
+            self.generate_compressed(dim)
+            np.random.seed()
+        elif self.total_files_to_generate <= self.comm_size:
             # Use collective I/O
             # we need even number os samples for collective I/O
             samples_per_rank = (self.num_samples + (self.num_samples % self.comm_size)) // self.comm_size
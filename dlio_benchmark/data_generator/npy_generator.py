@@ -51,5 +51,6 @@ class NPYGenerator(DataGenerator):
             out_path_spec = self.storage.get_uri(self._file_list[i])
             progress(i+1, self.total_files_to_generate, "Generating NPY Data")
             prev_out_spec = out_path_spec
-            np.save(out_path_spec, records)
+            # Fortran order keeps every sample ([..., i]) contiguous on disk, so it can be read on its own
+            np.save(out_path_spec, np.asfortranarray(records))
         np.random.seed()
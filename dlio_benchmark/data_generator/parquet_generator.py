@@ -0,0 +1,74 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_DATA_GENERATOR
+from dlio_benchmark.common.enumerations import StorageType
+from dlio_benchmark.data_generator.data_generator import DataGenerator
+from dlio_benchmark.utils.utility import Profile, progress
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+dlp = Profile(MODULE_DATA_GENERATOR)
+
+"""
+Generator for creating data in Parquet format.
+"""
+class ParquetGenerator(DataGenerator):
+    def __init__(self):
+        super().__init__()
+        self.row_group_size = self._args.parquet_row_group_size
+        self.num_columns = self._args.parquet_num_columns
+        self.parquet_compression = None if self._args.parquet_compression == "none" else self._args.parquet_compression
+
+    @dlp.log
+    def generate(self):
+        """
+        Generates Parquet files with one sample per row. The bytes of a sample are split over
+        parquet_num_columns binary columns (data_0, data_1, ...) and rows are written in row groups
+        of parquet_row_group_size. Every row gets random bytes of its own and dictionary encoding is
+        off, so the files are as large as the samples they hold.
+        """
+        if not PYARROW_AVAILABLE:
+            raise Exception("pyarrow is required for the parquet format; install dlio_benchmark[arrow]")
+        super().generate()
+        np.random.seed(10)
+        dim = self.get_dimension(self.total_files_to_generate)
+        names = [f"data_{k}" for k in range(self.num_columns)]
+        schema = pa.schema([(name, pa.binary()) for name in names])
+        for i in dlp.iter(range(self.my_rank, self.total_files_to_generate, self.comm_size)):
+            progress(i+1, self.total_files_to_generate, "Generating Parquet Data")
+            dim1 = dim[2*i]
+            dim2 = dim[2*i+1]
+            out_path_spec = self.storage.get_uri(self._file_list[i])
+            sink = pa.BufferOutputStream() if self._args.storage_type == StorageType.S3 else out_path_spec
+            writer = pq.ParquetWriter(sink, schema, compression=self.parquet_compression, use_dictionary=False)
+            for start in range(0, self.num_samples, self.row_group_size):
+                count = min(self.row_group_size, self.num_samples - start)
+                records = np.random.randint(255, size=(count, dim1*dim2), dtype=np.uint8)
+                columns = [pa.array([row.tobytes() for row in part], type=pa.binary())
+                           for part in np.array_split(records, self.num_columns, axis=1)]
+                writer.write_table(pa.table(columns, schema=schema), row_group_size=self.row_group_size)
+            writer.close()
+            if self._args.storage_type == StorageType.S3:
+                self.storage.write(out_path_spec[len(self.storage.root):], sink.getvalue().to_pybytes())
+        np.random.seed()
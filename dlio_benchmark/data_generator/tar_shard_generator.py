@@ -0,0 +1,72 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from io import BytesIO
+import tarfile
+
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_DATA_GENERATOR
+from dlio_benchmark.common.enumerations import StorageType
+from dlio_benchmark.data_generator.data_generator import DataGenerator
+from dlio_benchmark.utils.utility import Profile, progress
+
+dlp = Profile(MODULE_DATA_GENERATOR)
+
+"""
+Generator for creating WebDataset style tar shards.
+"""
+class TarShardGenerator(DataGenerator):
+    def __init__(self):
+        super().__init__()
+
+    @staticmethod
+    def add_member(tar, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        tar.addfile(info, BytesIO(data))
+
+    @dlp.log
+    def generate(self):
+        """
+        Packs num_samples_per_file samples into each shard. A sample is a pair of members sharing
+        a key, <key>.bin with the record and <key>.cls with its label, written one after the other.
+        """
+        super().generate()
+        np.random.seed(10)
+        record_label = 0
+        dim = self.get_dimension(self.total_files_to_generate)
+        for i in dlp.iter(range(self.my_rank, self.total_files_to_generate, self.comm_size)):
+            progress(i+1, self.total_files_to_generate, "Generating Tar Shards")
+            dim1 = dim[2*i]
+            dim2 = dim[2*i+1]
+            record = np.random.randint(255, size=dim1*dim2, dtype=np.uint8).tobytes()
+            label = str(record_label).encode()
+            out_path_spec = self.storage.get_uri(self._file_list[i])
+            if self._args.storage_type == StorageType.S3:
+                target = BytesIO()
+                tar = tarfile.open(fileobj=target, mode="w")
+            else:
+                target = None
+                tar = tarfile.open(out_path_spec, mode="w")
+            with tar:
+                for j in range(self.num_samples):
+                    key = f"{j:08d}"
+                    self.add_member(tar, f"{key}.bin", record)
+                    self.add_member(tar, f"{key}.cls", label)
+            if target is not None:
+                self.storage.write(out_path_spec[len(self.storage.root):], target.getvalue())
+        np.random.seed()
@@ -14,12 +14,13 @@
    See the License for the specific language governing permissions and
    limitations under the License.
 """
+from io import BytesIO
 import os
-from subprocess import call
 
+from dlio_benchmark.common.enumerations import StorageType
 from dlio_benchmark.data_generator.data_generator import DataGenerator
 import numpy as np
-import tensorflow as tf
+from dlio_benchmark.utils.tfrecord import CRC32C_NATIVE, FOOTER_SIZE, HEADER_SIZE, encode_example, format_index, frame_record
 from dlio_benchmark.utils.utility import Profile
 
 from dlio_benchmark.utils.utility import progress, utcnow
@@ -31,9 +32,28 @@ import logging
 class TFRecordGenerator(DataGenerator):
     """
     Generator for creating data in TFRecord format.
+    Records and their tfrecord2idx index are written directly, so TensorFlow is not needed.
     """
     def __init__(self):
         super().__init__()
+
+    def tf_writer(self, is_s3):
+        """
+        tf.io.TFRecordWriter when records would otherwise be checksummed in pure Python, None otherwise.
+        """
+        if CRC32C_NATIVE:
+            return None
+        tf = None
+        if not is_s3:
+            try:
+                import tensorflow as tf
+            except ImportError:
+                pass
+        if tf is None and self.my_rank == 0:
+            self.logger.warning(f"{utcnow()} Neither the crc32c package nor TensorFlow is available; TFRecord checksums are "
+                                f"computed in pure Python, which is very slow. Install crc32c (pip install crc32c).")
+        return None if tf is None else tf.io.TFRecordWriter
+
     @dlp.log
     def generate(self):
         """
@@ -45,31 +65,37 @@ class TFRecordGenerator(DataGenerator):
         np.random.seed(10)
         # This creates a 2D image representing a single record
         record_label = 0
+        is_s3 = self._args.storage_type == StorageType.S3
+        tf_writer = self.tf_writer(is_s3)
         dim = self.get_dimension(self.total_files_to_generate)
         for i in dlp.iter(range(self.my_rank, self.total_files_to_generate, self.comm_size)):
             progress(i+1, self.total_files_to_generate, "Generating TFRecord Data")
             out_path_spec = self.storage.get_uri(self._file_list[i])
             dim1 = dim[2*i]
             dim2 = dim[2*i+1]
-            # Open a TFRecordWriter for the output-file.
-            with tf.io.TFRecordWriter(out_path_spec) as writer:
-                for i in range(0, self.num_samples):
-                    # This creates a 2D image representing a single record
-                    record = np.random.randint(255, size=(dim1, dim2), dtype=np.uint8)
-                    img_bytes = record.tobytes()
-                    data = {
-                        'image': tf.train.Feature(bytes_list=tf.train.BytesList(value=[img_bytes])),
-                        'size': tf.train.Feature(int64_list=tf.train.Int64List(value=[self._dimension]))
-                    }
-                    # Wrap the data as TensorFlow Features.
-                    feature = tf.train.Features(feature=data)
-                    # Wrap again as a TensorFlow Example.
-                    example = tf.train.Example(features=feature)
-                    # Serialize the data.
-                    serialized = example.SerializeToString()
-                    # Write the serialized data to the TFRecords file.
+            offsets, sizes = [], []
+            offset = 0
+            if tf_writer is not None:
+                writer = tf_writer(out_path_spec)
+            else:
+                writer = BytesIO() if is_s3 else open(out_path_spec, "wb")
+            for j in range(0, self.num_samples):
+                # This creates a 2D image representing a single record
+                record = np.random.randint(255, size=(dim1, dim2), dtype=np.uint8)
+                # Serialize the record as a tf.train.Example and frame it.
+                serialized = encode_example({'image': record.tobytes(), 'size': self._dimension})
+                if tf_writer is not None:
+                    # TensorFlow frames the record with its native checksum
                     writer.write(serialized)
-            tfrecord2idx_script = "tfrecord2idx"
+                    size = HEADER_SIZE + len(serialized) + FOOTER_SIZE
+                else:
+                    size = writer.write(frame_record(serialized))
+                offsets.append(offset)
+                sizes.append(size)
+                offset += size
+            if is_s3:
+                self.storage.write(out_path_spec[len(self.storage.root):], writer.getvalue())
+            writer.close()
             folder = "train"
             if "valid" in out_path_spec:
                 folder = "valid"
@@ -77,6 +103,9 @@ class TFRecordGenerator(DataGenerator):
             filename = os.path.basename(out_path_spec)
             self.storage.create_node(index_folder, exist_ok=True)
             tfrecord_idx = f"{index_folder}/{filename}.idx"
-            if not os.path.isfile(tfrecord_idx):
-                call([tfrecord2idx_script, out_path_spec, tfrecord_idx])
+            if is_s3:
+                self.storage.write(tfrecord_idx, format_index(offsets, sizes).encode())
+            elif not os.path.isfile(tfrecord_idx):
+                with open(tfrecord_idx, "w") as fd:
+                    fd.write(format_index(offsets, sizes))
         np.random.seed()
@@ -0,0 +1,173 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import math
+import queue
+import threading
+
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_DATA_LOADER
+from dlio_benchmark.common.enumerations import DataLoaderType, DatasetType
+from dlio_benchmark.data_loader.threaded_data_loader import ThreadedDataLoader
+from dlio_benchmark.utils.payload import pad_payloads
+from dlio_benchmark.utils.reorder import ReorderBuffer
+from dlio_benchmark.utils.utility import utcnow, Profile
+
+dlp = Profile(MODULE_DATA_LOADER)
+
+
+class AsyncDataLoader(ThreadedDataLoader):
+    """
+    Index based data loader driven by one asyncio event loop per rank. The loop keeps up to
+    reader.async_concurrency sample reads in flight across as many batches as it takes to fill them
+    (and at least prefetch_size batches), and assembles a batch as soon as its last sample arrives.
+    The format parsers are synchronous, so every read is offloaded to a thread that owns a reader.
+    The loop runs on a background thread so that reads continue while the training loop computes.
+    """
+
+    @dlp.log_init
+    def __init__(self, format_type, dataset_type, epoch_number):
+        super().__init__(format_type, dataset_type, epoch_number, DataLoaderType.ASYNCIO)
+        self.concurrency = self._args.async_concurrency
+        self.num_threads = self.concurrency
+        self.depth = max(self._args.prefetch_size, math.ceil(self.concurrency / self.batch_size), 1)
+        self.stopped = threading.Event()
+        # reservations are granted in batch order, so one thread waiting for the budget is enough
+        self.budget_executor = ThreadPoolExecutor(max_workers=1) if self.budget is not None else None
+
+    def read_index(self, index, step):
+        return self.reader().read_index(index, step)
+
+    def make_batch(self, samples):
+        if self._args.return_payload:
+            return pad_payloads(samples, self._args.payload_bucket_size)
+        return np.array(samples)
+
+    async def produce(self, epoch, batches, ready):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def read_sample(index, step):
+            async with semaphore:
+                return await loop.run_in_executor(self.executor, self.read_index, index, step)
+
+        async def read_batch(step, indices):
+            reserved = False
+            if self.budget is not None:
+                reserved = await loop.run_in_executor(self.budget_executor, self.budget.reserve, epoch, step - 1)
+            try:
+                batch = self.make_batch(await asyncio.gather(*[read_sample(index, step) for index in indices]))
+            except BaseException:
+                # a failed or cancelled read gives its reservation back, as MemoryBudget.read does
+                if reserved:
+                    self.budget.release(epoch, self.budget.estimate)
+                raise
+            if reserved:
+                self.budget.adjust(epoch, batch.nbytes - self.budget.estimate)
+            return batch
+
+        async def deliver(pending):
+            if self._args.in_order:
+                released = [await pending.popleft()]
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                released = []
+                for task in done:
+                    released.extend(reorder.push(pending.pop(task), task.result()))
+            for batch in released:
+                # the queue is bounded, so a slow training loop holds the reads back
+                await loop.run_in_executor(None, ready.put, batch)
+
+        # tasks in request order, or mapped to their batch number when delivered as they complete
+        pending = deque() if self._args.in_order else {}
+        reorder = None if self._args.in_order else ReorderBuffer(self._args.reorder_window)
+        try:
+            for step, indices in batches:
+                if self.stopped.is_set():
+                    break
+                task = loop.create_task(read_batch(step, indices))
+                if self._args.in_order:
+                    pending.append(task)
+                else:
+                    pending[task] = step - 1
+                # batches held back by the reorder window count against the read ahead depth
+                while len(pending) + (reorder.holding() if reorder is not None else 0) >= self.depth \
+                        and not self.stopped.is_set():
+                    await deliver(pending)
+            while len(pending) > 0 and not self.stopped.is_set():
+                await deliver(pending)
+        except Exception as e:
+            ready.put(e)
+        finally:
+            for task in pending:
+                task.cancel()
+            if reorder is not None:
+                reorder.report()
+            ready.put(None)
+
+    @dlp.log
+    def next(self):
+        super(ThreadedDataLoader, self).next()
+        total = self._args.training_steps if self.dataset_type is DatasetType.TRAIN else self._args.eval_steps
+        self.logger.debug(f"{utcnow()} Rank {self._args.my_rank} should read {total} batches with {self.concurrency} reads in flight")
+        ready = queue.Queue(maxsize=self.depth)
+        self.stopped.clear()
+        batches = enumerate(self.batches(), start=1)
+        epoch = self.epoch_number
+        if self.budget is not None:
+            self.budget.reset(epoch)
+        producer = threading.Thread(target=lambda: asyncio.run(self.produce(epoch, batches, ready)), daemon=True)
+        producer.start()
+        step = 1
+        try:
+            while True:
+                batch = ready.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                dlp.update(image_size=batch.nbytes)
+                dlp.update(step=step)
+                step += 1
+                if self.budget is not None:
+                    self.budget.sample()
+                yield batch
+                if self.budget is not None:
+                    self.budget.release(epoch, batch.nbytes)
+        finally:
+            # training stops after its last step; unblock the producer and let it wind down
+            self.stopped.set()
+            if self.budget is not None:
+                self.budget.report()
+                self.budget.close()
+            while producer.is_alive():
+                try:
+                    ready.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            self.epoch_number += 1
+            dlp.update(epoch=self.epoch_number)
+
+    @dlp.log
+    def close(self):
+        if self.budget_executor is not None:
+            self.budget_executor.shutdown(wait=True)
+            self.budget_executor = None
+        super().close()
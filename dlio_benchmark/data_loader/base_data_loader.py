@@ -24,6 +24,10 @@ from dlio_benchmark.common.enumerations import FileAccess, DatasetType, Metadata
 from dlio_benchmark.framework.framework_factory import FrameworkFactory
 from dlio_benchmark.storage.storage_factory import StorageFactory
 from dlio_benchmark.utils.config import ConfigArguments
+from dlio_benchmark.utils.counters import SharedCounters
+from dlio_benchmark.utils.memory_budget import MemoryBudget
+from dlio_benchmark.utils.sample_map import distinct_per_batch
+from dlio_benchmark.utils.utility import DLIOMPI
 
 
 class BaseDataLoader(ABC):
@@ -37,6 +41,40 @@ class BaseDataLoader(ABC):
         self.batch_size = self._args.batch_size if self.dataset_type is DatasetType.TRAIN else self._args.batch_size_eval
         self.logger = self._args.logger
 
+    def index_map(self):
+        # the maps are rebuilt by ConfigArguments.reconfigure between epochs
+        if self.dataset_type is DatasetType.TRAIN:
+            return self._args.train_global_index_map
+        return self._args.val_global_index_map
+
+    def memory_budget(self):
+        """
+        MemoryBudget for the batches in flight on this rank: reader.prefetch_memory_budget bytes, or
+        the share of the rank in reader.node_prefetch_memory_budget. None when neither is set.
+        """
+        budget = self._args.prefetch_memory_budget
+        if self._args.node_prefetch_memory_budget > 0:
+            budget = self._args.node_prefetch_memory_budget // DLIOMPI.get_instance().npernode()
+        if budget <= 0:
+            return None
+        record_length = self._args.record_length if self._args.return_payload else self._args.resized_image.nbytes
+        return MemoryBudget(budget, self.batch_size * record_length, self._args.multiprocessing_context)
+
+    def sample_order(self, epoch):
+        """
+        Order in which an index based loader visits the global indices of this rank in epoch
+        (see ConfigArguments.sample_order). For training, the number of distinct files each batch
+        of the order touches is reported through the shared counters.
+        """
+        index_map = self.index_map()
+        order = self._args.sample_order(index_map, epoch)
+        if self.dataset_type is DatasetType.TRAIN:
+            files = distinct_per_batch(index_map.file_indices(order), self.batch_size)
+            counters = SharedCounters.get_instance()
+            counters.add("sampled_steps", len(files))
+            counters.add("sampled_step_files", int(files.sum()))
+        return order
+
     @abstractmethod
     def read(self):
         pass
@@ -48,3 +86,10 @@ class BaseDataLoader(ABC):
     @abstractmethod
     def finalize(self):
         pass
+
+    def close(self):
+        """
+        Releases what the loader keeps across epochs. Called once after the last epoch of the run,
+        whereas finalize is called after every epoch.
+        """
+        pass
@@ -26,6 +26,7 @@ from dlio_benchmark.common.constants import MODULE_DATA_LOADER
 from dlio_benchmark.common.enumerations import Shuffle, DataLoaderType, DatasetType
 from dlio_benchmark.data_loader.base_data_loader import BaseDataLoader
 from dlio_benchmark.reader.reader_factory import ReaderFactory
+from dlio_benchmark.utils.counters import SharedCounters
 from dlio_benchmark.utils.utility import utcnow
 from dlio_benchmark.utils.utility import Profile, DLIOLogger
 import os
@@ -63,10 +64,14 @@ class DaliIndexDataset(object):
         step = sample_info.iteration       
         if step >= self.total_num_steps or sample_info.idx_in_epoch >= self.samples_per_worker:
             # Indicate end of the epoch
+            SharedCounters.get_instance().flush()
             raise StopIteration()
         sample_idx = self.indices[sample_info.idx_in_epoch]
         with Profile(MODULE_DATA_LOADER, epoch=self.epoch, image_idx=sample_idx, step=step):
             image = self.reader.read_index(sample_idx, step)
+        if (sample_info.idx_in_epoch + 1) % self.batch_size == 0:
+            # parallel external sources run in worker processes
+            SharedCounters.get_instance().flush()
         return image, np.uint8([sample_idx])
 
 class DaliIteratorDataset(object):
@@ -89,6 +94,7 @@ class DaliIteratorDataset(object):
     def __iter__(self):
         with Profile(MODULE_DATA_LOADER):
             for image in self.reader.next():
+                SharedCounters.get_instance().flush()
                 yield image.numpy(), np.uint8([0])
 
 class DaliDataLoader(BaseDataLoader):
@@ -49,6 +49,12 @@ class DataLoaderFactory(object):
         elif type == DataLoaderType.NATIVE_DALI:
             from dlio_benchmark.data_loader.native_dali_data_loader import NativeDaliDataLoader
             return NativeDaliDataLoader(format_type, dataset_type, epoch)
+        elif type == DataLoaderType.THREADED:
+            from dlio_benchmark.data_loader.threaded_data_loader import ThreadedDataLoader
+            return ThreadedDataLoader(format_type, dataset_type, epoch)
+        elif type == DataLoaderType.ASYNCIO:
+            from dlio_benchmark.data_loader.async_data_loader import AsyncDataLoader
+            return AsyncDataLoader(format_type, dataset_type, epoch)
         elif type == DataLoaderType.SYNTHETIC:
             from dlio_benchmark.data_loader.synthetic_data_loader import SyntheticDataLoader
             return SyntheticDataLoader(format_type, dataset_type, epoch)
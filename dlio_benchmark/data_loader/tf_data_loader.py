@@ -82,11 +82,13 @@ class TFDataLoader(BaseDataLoader):
             options.experimental_threading.max_intra_op_parallelism = read_threads
         if self.format_type != FormatType.TFRECORD:
             self._dataset = tf.data.Dataset.from_tensor_slices(np.arange(read_threads)).with_options(options)
+            if self._args.return_payload:
+                # payloads are flat and padded per batch, so only the batch size is known
+                shape = (self.batch_size, None)
+            else:
+                shape = (self.batch_size, self._args.max_dimension, self._args.max_dimension)
             self._dataset = self._dataset.interleave(lambda x: TensorflowDataset(self.format_type, self.dataset_type,
-                                                                                self.epoch_number, (
-                                                                                self.batch_size,
-                                                                                self._args.max_dimension,
-                                                                                self._args.max_dimension), x),
+                                                                                self.epoch_number, shape, x),
                                                                                 cycle_length=read_threads,
                                                                                 num_parallel_calls=read_threads)
             if self._args.prefetch_size > 0:
@@ -0,0 +1,159 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import threading
+
+from dlio_benchmark.common.constants import MODULE_DATA_LOADER
+from dlio_benchmark.common.enumerations import DataLoaderType, DatasetType
+from dlio_benchmark.data_loader.base_data_loader import BaseDataLoader
+from dlio_benchmark.reader.reader_factory import ReaderFactory
+from dlio_benchmark.utils.reorder import ReorderBuffer
+from dlio_benchmark.utils.utility import utcnow, Profile
+
+dlp = Profile(MODULE_DATA_LOADER)
+
+
+class ThreadedDataLoader(BaseDataLoader):
+    """
+    Index based data loader that reads on a pool of read_threads threads inside the rank instead of
+    forking worker processes. Every thread owns a reader (its thread_index is the number of the
+    thread) and reads whole batches with FormatReader.read_batch; storage clients and os.pread release
+    the GIL while they wait. Up to prefetch_size batches, and at least one per thread, are in flight,
+    fewer when their bytes would exceed the prefetch memory budget.
+    Batches are delivered in sampler order, or as they complete when reader.in_order is off, at most
+    reader.reorder_window batches ahead of the oldest batch not delivered yet.
+    """
+
+    @dlp.log_init
+    def __init__(self, format_type, dataset_type, epoch_number, data_loader_type=DataLoaderType.THREADED):
+        super().__init__(format_type, dataset_type, epoch_number, data_loader_type)
+        self.num_threads = max(self._args.read_threads, 1)
+        self.depth = max(self._args.prefetch_size, self.num_threads)
+        self.executor = None
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.readers = []
+        self.budget = self.memory_budget()
+
+    @dlp.log
+    def read(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.num_threads)
+        self.logger.debug(f"{utcnow()} Rank {self._args.my_rank} reads with {self.num_threads} threads and {self.depth} batches in flight")
+
+    def reader(self):
+        reader = getattr(self.local, "reader", None)
+        if reader is None:
+            with self.lock:
+                thread_index = len(self.readers)
+                reader = ReaderFactory.get_reader(type=self.format_type,
+                                                  dataset_type=self.dataset_type,
+                                                  thread_index=thread_index,
+                                                  epoch_number=self.epoch_number)
+                self.readers.append(reader)
+            self.local.reader = reader
+        return reader
+
+    def read_batch(self, indices, step):
+        return self.reader().read_batch(indices, step)
+
+    def batches(self):
+        order = self.sample_order(self.epoch_number)
+        for begin in range(0, len(order) - self.batch_size + 1, self.batch_size):
+            yield order[begin:begin + self.batch_size].tolist()
+
+    @dlp.log
+    def next(self):
+        super().next()
+        total = self._args.training_steps if self.dataset_type is DatasetType.TRAIN else self._args.eval_steps
+        self.logger.debug(f"{utcnow()} Rank {self._args.my_rank} should read {total} batches")
+        batches = enumerate(self.batches(), start=1)
+        epoch = self.epoch_number
+        if self.budget is not None:
+            self.budget.reset(epoch)
+        # futures in request order, or mapped to their batch number when delivered as they complete
+        pending = deque() if self._args.in_order else {}
+        reorder = None if self._args.in_order else ReorderBuffer(self._args.reorder_window)
+
+        def submit():
+            for step, indices in batches:
+                if self.budget is not None:
+                    future = self.executor.submit(self.budget.read, epoch, step - 1, self.read_batch, indices, step)
+                else:
+                    future = self.executor.submit(self.read_batch, indices, step)
+                if self._args.in_order:
+                    pending.append(future)
+                else:
+                    pending[future] = step - 1
+                return True
+            return False
+
+        def in_flight():
+            # batches held back by the reorder window count against the read ahead depth
+            return len(pending) + (reorder.holding() if reorder is not None else 0)
+
+        try:
+            step = 1
+            while True:
+                while in_flight() < self.depth and submit():
+                    pass
+                if len(pending) == 0:
+                    break
+                if self._args.in_order:
+                    ready = [pending.popleft().result()]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    ready = []
+                    for future in done:
+                        ready.extend(reorder.push(pending.pop(future), future.result()))
+                for batch in ready:
+                    dlp.update(image_size=batch.nbytes)
+                    dlp.update(step=step)
+                    step += 1
+                    if self.budget is not None:
+                        self.budget.sample()
+                    yield batch
+                    if self.budget is not None:
+                        # the training loop is done with the batch once it asks for the next one
+                        self.budget.release(epoch, batch.nbytes)
+        finally:
+            # training stops after its last step, so batches read ahead are dropped
+            for future in pending:
+                future.cancel()
+            if reorder is not None:
+                reorder.report()
+            if self.budget is not None:
+                self.budget.report()
+                self.budget.close()
+            self.epoch_number += 1
+            dlp.update(epoch=self.epoch_number)
+
+    @dlp.log
+    def finalize(self):
+        # called after every epoch; the threads and their readers live until close
+        pass
+
+    @dlp.log
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        for reader in self.readers:
+            reader.finalize()
+        self.readers = []
+        self.local = threading.local()
@@ -14,56 +14,97 @@
    See the License for the specific language governing permissions and
    limitations under the License.
 """
-from time import time
+import inspect
 import logging
 import math
 import pickle
 import torch
-from torch.utils.data import Dataset, DataLoader, RandomSampler, SequentialSampler
+from torch.utils.data import Dataset, DataLoader
 from torch.utils.data.sampler import Sampler
+from torch.utils.data._utils.collate import default_collate
 import numpy as np
-import os
 
 from dlio_benchmark.common.constants import MODULE_DATA_LOADER
-from dlio_benchmark.common.enumerations import Shuffle, DatasetType, DataLoaderType
+from dlio_benchmark.common.enumerations import DatasetType, DataLoaderType
 from dlio_benchmark.data_loader.base_data_loader import BaseDataLoader
 from dlio_benchmark.reader.reader_factory import ReaderFactory
 from dlio_benchmark.utils.utility import utcnow, DLIOMPI
 from dlio_benchmark.utils.config import ConfigArguments
-from dlio_benchmark.utils.utility import Profile
-
-# Add to count stats correctly 
-from torch.utils.data._utils.collate import default_collate
-from dlio_benchmark.common.constants import MODULE_DATA_LOADER
+from dlio_benchmark.utils.counters import SharedCounters
+from dlio_benchmark.utils.batch_ring import BatchRing, BatchSlot
+from dlio_benchmark.utils.payload import pad_payloads, padded_length
+from dlio_benchmark.utils.reorder import ReorderBuffer
+from dlio_benchmark.utils.sample_map import ITERATION_BLOCK
 from dlio_benchmark.utils.utility import Profile
 
 dlp = Profile(MODULE_DATA_LOADER)
 
-#
-# Probably need to delete this function
-#
-def collate_and_profile(batch):
-    # batch is a list of numpy arrays or torch.Tensors
-    total_bytes = 0
-    for item in batch:
-        # if numpy array, .nbytes; if Tensor, convert to numpy
-        if hasattr(item, "nbytes"):
-            total_bytes += item.nbytes
-        else:
-            total_bytes += item.detach().cpu().numpy().nbytes
 
-    # record I/O bytes and sample count in main
-    print(f"[DEBUG_STATS][collate_and_profile pid={os.getpid()}] batch_size={len(batch)} total_bytes={total_bytes}")
-    #  The next two lines should probably stay 
-    dlp.update(image_size=total_bytes)
-    dlp.update(step=len(batch))   # 
-    #  I think these are bogus, probably delete next two lintes 
-    #stats.update(image_size=total_bytes)
-    #stats.update(step=len(batch))
+class SequencedBatch(object):
+    """
+    A batch together with its position in the epoch, so that batches delivered as they complete
+    can be put through a ReorderBuffer in the main process.
+    """
+
+    def __init__(self, sequence, batch):
+        self.sequence = sequence
+        self.batch = batch
+
+    def pin_memory(self):
+        # called by the pin memory thread of the data loader in place of pinning the wrapper
+        if isinstance(self.batch, torch.Tensor):
+            return SequencedBatch(self.sequence, self.batch.pin_memory())
+        return self
+
+
+class PayloadCollate(object):
+    """
+    Collates the flat payloads returned with reader.return_payload, zero padding them to the
+    longest payload of the batch (rounded up to reader.payload_bucket_size when set).
+    """
+
+    def __init__(self, bucket_size):
+        self.bucket_size = bucket_size
+
+    def __call__(self, batch):
+        if isinstance(batch, SequencedBatch):
+            return SequencedBatch(batch.sequence, self(batch.batch))
+        if isinstance(batch, BatchSlot):
+            return batch
+        if isinstance(batch, np.ndarray):
+            # already padded by the reader in TorchDataset.__getitems__
+            return torch.from_numpy(batch)
+        return torch.from_numpy(pad_payloads(batch, self.bucket_size))
+
 
+def collate_batch(batch):
+    """
+    Collates a batch fetched as one array through TorchDataset.__getitems__ without copying it,
+    and lists of samples (torch versions that fetch sample by sample) with default_collate.
+    """
+    if isinstance(batch, SequencedBatch):
+        return SequencedBatch(batch.sequence, collate_batch(batch.batch))
+    if isinstance(batch, BatchSlot):
+        # resolved against the batch ring in the main process
+        return batch
+    if isinstance(batch, np.ndarray):
+        return torch.from_numpy(batch)
     return default_collate(batch)
 
 
+def batch_nbytes(batch):
+    """
+    Size of a batch of tensors or arrays, without copying them.
+    """
+    total = 0
+    for x in batch if isinstance(batch, (list, tuple)) else (batch,):
+        if isinstance(x, torch.Tensor):
+            total += x.element_size() * x.nelement()
+        else:
+            total += np.asarray(x).nbytes
+    return total
+
+
 class TorchDataset(Dataset):
     """
     Currently, we only support loading one sample per file
@@ -81,6 +122,18 @@ class TorchDataset(Dataset):
         self.batch_size = batch_size
         args = ConfigArguments.get_instance()
         self.serial_args = pickle.dumps(args)
+        # the pickle refers to the files of the sample maps of this epoch, which reconfigure replaces;
+        # workers may unpickle it epochs later (the eval workers start at the first evaluation)
+        self.sample_maps = [args.train_global_index_map, args.val_global_index_map,
+                            args.train_file_map, args.val_file_map]
+        # travels to the workers with the dataset so that their reader statistics reach this rank
+        self.counters = SharedCounters.get_instance()
+        # set by TorchDataLoader when workers hand batches over through shared memory
+        self.ring = None
+        # set by TorchDataLoader when batches are delivered as they complete
+        self.sequenced = False
+        # set by TorchDataLoader to cap the bytes in flight on the rank
+        self.budget = None
         self.dlp_logger = None
         if num_workers == 0:
             self.worker_init(-1)
@@ -88,6 +141,7 @@ class TorchDataset(Dataset):
     @dlp.log
     def worker_init(self, worker_id):
         pickle.loads(self.serial_args)
+        SharedCounters.set_instance(self.counters)
         _args = ConfigArguments.get_instance()
         _args.configure_dlio_logging(is_child=True)
         self.dlp_logger = _args.configure_dftracer(is_child=True, use_pid=True)
@@ -111,40 +165,126 @@ class TorchDataset(Dataset):
         step = int(math.ceil(self.num_images_read / self.batch_size))
         logging.debug(f"{utcnow()} Rank {DLIOMPI.get_instance().rank()} reading {image_idx} sample")
         dlp.update(step = step)
-        return self.reader.read_index(image_idx, step)
+        sample = self.reader.read_index(image_idx, step)
+        if self.num_images_read % self.batch_size == 0:
+            self.counters.flush()
+        return sample
+
+    @dlp.log
+    def __getitems__(self, indices):
+        """
+        Fetches all samples of a batch with one call so that the reader can group and overlap
+        their reads and assemble them into a single array.
+        """
+        self.num_images_read += len(indices)
+        step = int(math.ceil(self.num_images_read / self.batch_size))
+        logging.debug(f"{utcnow()} Rank {DLIOMPI.get_instance().rank()} reading batch of {len(indices)} samples")
+        dlp.update(step = step)
+        if isinstance(indices, BatchIndices) and indices.permutation is not None:
+            # persistent workers keep the configuration of the epoch they started in
+            self.reader.global_index_map.permutation = indices.permutation
+        try:
+            if self.budget is not None and isinstance(indices, BatchIndices):
+                batch = self.budget.read(indices.epoch, indices.sequence, self.reader.read_batch, indices, step)
+            else:
+                batch = self.reader.read_batch(indices, step)
+            if self.ring is not None and isinstance(indices, BatchIndices):
+                slot = self.ring.put(indices.sequence, batch)
+                if slot is not None:
+                    self.counters.add("ring_batches")
+                    return slot
+                self.counters.add("ring_overflows")
+            if self.sequenced and isinstance(indices, BatchIndices):
+                return SequencedBatch(indices.sequence, batch)
+            return batch
+        finally:
+            # the counts of the batch reach the rank before the batch does
+            self.counters.flush()
 
 
 class dlio_sampler(Sampler):
-    def __init__(self, rank, size, num_samples, epochs):
-        self.size = size
-        self.rank = rank
-        self.num_samples = num_samples
-        self.epochs = epochs
-        samples_per_proc = int(math.ceil(num_samples/size)) 
-        start_sample = self.rank * samples_per_proc
-        end_sample = (self.rank + 1) * samples_per_proc - 1
-        if end_sample > num_samples - 1:
-            end_sample = num_samples - 1
-        self.indices = list(range(start_sample, end_sample + 1))
+    """
+    Visits the global indices of this rank in the order of BaseDataLoader.sample_order, drawn anew
+    for the epoch given to set_epoch every time the sampler is iterated.
+    """
+    def __init__(self, loader, epoch):
+        self.loader = loader
+        self.epoch = epoch
 
+    def set_epoch(self, epoch):
+        self.epoch = epoch
 
     def __len__(self):
-        return self.num_samples
+        return len(self.loader.index_map())
+
+    def __iter__(self):
+        order = self.loader.sample_order(self.epoch)
+        for begin in range(0, len(order), ITERATION_BLOCK):
+            yield from order[begin:begin + ITERATION_BLOCK].tolist()
+
+
+class BatchIndices(list):
+    """
+    Indices of a batch together with the epoch, the position of the batch in the epoch and, with
+    reader.sample_permutation, the sample permutation of the epoch.
+    """
+    def __init__(self, indices, sequence, epoch=None, permutation=None):
+        super().__init__(indices)
+        self.sequence = sequence
+        self.epoch = epoch
+        self.permutation = permutation
+
+
+class dlio_batch_sampler(Sampler):
+    """
+    Groups the indices of a sampler into complete batches numbered in the order they are delivered.
+    """
+    def __init__(self, sampler, batch_size):
+        self.sampler = sampler
+        self.batch_size = batch_size
+
+    def __len__(self):
+        return len(self.sampler) // self.batch_size
 
     def __iter__(self):
-        for sample in self.indices:
-            yield sample
+        batch = []
+        sequence = 0
+        epoch = getattr(self.sampler, "epoch", None)
+        # the map of the current epoch, read before the sampler draws the order from it
+        permutation = getattr(self.sampler.loader.index_map(), "permutation", None)
+        for index in self.sampler:
+            batch.append(index)
+            if len(batch) == self.batch_size:
+                yield BatchIndices(batch, sequence, epoch, permutation)
+                sequence += 1
+                batch = []
 
 
 class TorchDataLoader(BaseDataLoader):
     @dlp.log_init
     def __init__(self, format_type, dataset_type, epoch_number):
         super().__init__(format_type, dataset_type, epoch_number, DataLoaderType.PYTORCH)
+        self.ring = None
+        self.sequenced = False
+        self.budget = None
+
+    def ring_slot_size(self):
+        """
+        Bytes of a batch ring slot: reader.batch_ring_slot_size, or a batch of resized images or of
+        payloads three standard deviations above the mean record length.
+        """
+        if self._args.batch_ring_slot_size > 0:
+            return self._args.batch_ring_slot_size
+        if not self._args.return_payload:
+            return self.batch_size * self._args.resized_image.nbytes
+        record_length = self._args.record_length + 3 * self._args.record_length_stdev
+        return self.batch_size * padded_length(record_length, self._args.payload_bucket_size)
+
     @dlp.log
     def read(self):
         dataset = TorchDataset(self.format_type, self.dataset_type, self.epoch_number, self.num_samples,
                                self._args.read_threads, self.batch_size)
-        sampler = dlio_sampler(self._args.my_rank, self._args.comm_size, self.num_samples, self._args.epochs)
+        self.sampler = dlio_sampler(self, self.epoch_number)
         if self._args.read_threads >= 1:
             prefetch_factor = math.ceil(self._args.prefetch_size / self._args.read_threads)
         else:
@@ -160,27 +300,6 @@ class TorchDataLoader(BaseDataLoader):
                     f"{utcnow()} Prefetch size is 0; a default prefetch factor of 2 will be set to Torch DataLoader.")
         logging.debug(f"{utcnow()} Setup dataloader with {self._args.read_threads} workers {torch.__version__}")
 
-        #
-        # Do we ?   
-        # We need to modify the threading and allow spawning
-        # This is the code to do so if desired 
-        #
-        #import multiprocessing as mp
-        #
-        #if self._args.read_threads == 0:
-        #    kwargs = {}
-        #else:
-        #    # create a fresh spawn‐based context
-        #    spawn_ctx = mp.get_context("spawn")
-        #    kwargs = {
-        #        "multiprocessing_context": spawn_ctx,
-        #        "prefetch_factor": prefetch_factor,
-        #        "persistent_workers": (torch.__version__ != "1.3.1"),
-        #    }
-
-        #
-        # Orig code, with forking mp 
-        #
         if self._args.read_threads==0:
             kwargs={}
         else:
@@ -188,40 +307,46 @@ class TorchDataLoader(BaseDataLoader):
                     'prefetch_factor': prefetch_factor}
             if torch.__version__ != '1.3.1':       
                 kwargs['persistent_workers'] = True
-
-        #
-        # End MP mods
-        #
-
-        #
-        # Did have a call to "collate_and_profile" but is this nececssary?
-        # Commented out the call in both branches of if below 
-        #
+        if self._args.return_payload:
+            kwargs['collate_fn'] = PayloadCollate(self._args.payload_bucket_size)
+        else:
+            kwargs['collate_fn'] = collate_batch
+        # whole batches of indices go to the workers, which fetch them through TorchDataset.__getitems__
+        batch_sampler = dlio_batch_sampler(self.sampler, self.batch_size)
+        if self._args.batch_ring and self._args.read_threads > 0:
+            # every outstanding batch of every worker, plus the one the training loop holds
+            self.ring = BatchRing(prefetch_factor * self._args.read_threads + 2, self.ring_slot_size())
+            dataset.ring = self.ring
+        if not self._args.in_order and self._args.read_threads > 0:
+            # workers hand batches over as they complete (torch 2.6 and later); the reorder window
+            # is applied here, so batches are numbered to restore their order
+            if 'in_order' in inspect.signature(DataLoader.__init__).parameters:
+                kwargs['in_order'] = False
+            elif self._args.my_rank == 0:
+                logging.warning(f"{utcnow()} Torch {torch.__version__} delivers batches in order; reader.in_order has no effect")
+            self.sequenced = True
+            dataset.sequenced = True
+        # created before the workers start so that they share it
+        self.budget = self.memory_budget()
+        dataset.budget = self.budget
         if torch.__version__ == '1.3.1':
             if 'prefetch_factor' in kwargs:
                 del kwargs['prefetch_factor']
             self._dataset = DataLoader(dataset,
-                                       batch_size=self.batch_size,
-                                       sampler=sampler,
+                                       batch_sampler=batch_sampler,
                                        num_workers=self._args.read_threads,
                                        pin_memory=self._args.pin_memory,
-                                       drop_last=True,
-                                       worker_init_fn=dataset.worker_init, 
-                                       #collate_fn=collate_and_profile,   # Added for multi threaded stats
+                                       worker_init_fn=dataset.worker_init,
                                        **kwargs)
         else: 
             self._dataset = DataLoader(dataset,
-                                       batch_size=self.batch_size,
-                                       sampler=sampler,
+                                       batch_sampler=batch_sampler,
                                        num_workers=self._args.read_threads,
                                        pin_memory=self._args.pin_memory,
-                                       drop_last=True,
                                        worker_init_fn=dataset.worker_init,
-                                       #collate_fn=collate_and_profile,   # Added for multi threaded stats
-                                       **kwargs)  # 2 is the default value
+                                       **kwargs)
         logging.debug(f"{utcnow()} Rank {self._args.my_rank} will read {len(self._dataset) * self.batch_size} files")
 
-        # self._dataset.sampler.set_epoch(epoch_number)
 
     @dlp.log
     def next(self):
@@ -229,50 +354,50 @@ class TorchDataLoader(BaseDataLoader):
         total = self._args.training_steps if self.dataset_type is DatasetType.TRAIN else self._args.eval_steps
         logging.debug(f"{utcnow()} Rank {self._args.my_rank} should read {total} batches")
         step = 1
+        # the data loader is built once, so the sampler reshuffles for every epoch it is iterated in
+        self.sampler.set_epoch(self.epoch_number)
         # TODO: @hariharan-devarajan: change below line when we bump the dftracer version to 
         #       `dlp.iter(self._dataset, name=self.next.__qualname__)`
-
-        #
-        # Orig code to count batches
-        #
-        #for batch in dlp.iter(self._dataset):
-        #    dlp.update(step = step)
-        #    step += 1
-        #    yield batch
-
-        #
-        # New Code for batches
-        #
+        # training stops after its last step without exhausting the loader, so the epoch advances on close too
+        reorder = ReorderBuffer(self._args.reorder_window) if self.sequenced else None
+        epoch = self.epoch_number
+        if self.budget is not None:
+            self.budget.reset(epoch)
+        try:
+            for batch in self.delivered(reorder):
+                if isinstance(batch, BatchSlot):
+                    # the batch stays in its slot until prefetch has moved around the ring
+                    batch_bytes = batch.nbytes
+                    batch = torch.from_numpy(self.ring.get(batch))
+                else:
+                    batch_bytes = batch_nbytes(batch)
+                dlp.update(image_size=batch_bytes)
+                dlp.update(step=step)
+                step += 1
+                if self.budget is not None:
+                    self.budget.sample()
+                yield batch
+                if self.budget is not None:
+                    # the training loop is done with the batch once it asks for the next one
+                    self.budget.release(epoch, batch_bytes)
+        finally:
+            if reorder is not None:
+                reorder.report()
+            if self.budget is not None:
+                self.budget.report()
+                self.budget.close()
+            self.epoch_number += 1
+            dlp.update(epoch=self.epoch_number)
+
+    def delivered(self, reorder):
+        """
+        Batches of the data loader, passed through reorder when they arrive as they complete.
+        """
         for batch in dlp.iter(self._dataset):
-            # 1) compute total bytes in this batch
-            try:
-                import numpy as _np
-                batch_bytes = 0
-                # assume batch is a tensor or tuple/list of arrays
-                for x in batch if isinstance(batch, (list,tuple)) else (batch,):
-                    arr = x.detach().cpu().numpy() if hasattr(x, "detach") else _np.asarray(x)
-                    batch_bytes += arr.nbytes
-                dlp.update(image_size=batch_bytes)         # count I/O bytes
-            except Exception:
-                pass
-
-            # 2) count the samples
-            print(f"[DEBUG_STATS][next pid={os.getpid()}] yielding batch of {len(batch)} samples, step={step}")
-            # Next line stays for now, maybe delete
-            dlp.update(step=step)
-            # Next line seems to be a problem 
-            #stats.update(step=step)
-
-            # Now update counter
-            step += 1
-            yield batch
-     
-        #
-        # End code mod for batch counting
-        #
-
-        self.epoch_number += 1
-        dlp.update(epoch=self.epoch_number)
+            if reorder is None or not isinstance(batch, SequencedBatch):
+                yield batch
+                continue
+            yield from reorder.push(batch.sequence, batch.batch)
 
     @dlp.log
     def finalize(self):
@@ -415,6 +415,9 @@ class DLIOBenchmark(object):
                     self.framework.get_loader(DatasetType.VALID).finalize()
                 self.args.reconfigure(epoch + 1) # reconfigure once per epoch
                 self.stats.end_epoch(epoch)
+            self.framework.get_loader(DatasetType.TRAIN).close()
+            if self.do_eval:
+                self.framework.get_loader(DatasetType.VALID).close()
 
         if (self.args.checkpoint_only):
             self._checkpoint()            
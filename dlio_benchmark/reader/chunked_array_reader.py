@@ -0,0 +1,136 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import json
+
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_DATA_READER
+from dlio_benchmark.data_generator.chunked_array_generator import chunk_folder
+from dlio_benchmark.reader.reader_handler import FormatReader
+from dlio_benchmark.storage.storage_factory import StorageFactory
+from dlio_benchmark.utils.counters import SharedCounters
+from dlio_benchmark.utils.utility import Profile
+
+dlp = Profile(MODULE_DATA_READER)
+
+
+class ChunkedArray(object):
+    """
+    Metadata of a chunked array and the location of its chunk objects.
+    """
+
+    def __init__(self, metadata, folder):
+        self.shape = tuple(metadata["shape"])
+        self.chunks = tuple(metadata["chunks"])
+        self.dtype = np.dtype(metadata["dtype"])
+        self.folder = folder
+
+    def intersecting_chunks(self, region):
+        """
+        Returns (chunk path, chunk region, output region) for every chunk intersecting region,
+        a tuple of slices with explicit bounds over the array.
+        """
+        ranges = [range(r.start // c, (r.stop - 1) // c + 1) for r, c in zip(region, self.chunks)]
+        for index in itertools.product(*ranges):
+            chunk_region, out_region = [], []
+            for k, r, c in zip(index, region, self.chunks):
+                start, stop = max(r.start, k * c), min(r.stop, (k + 1) * c)
+                chunk_region.append(slice(start - k * c, stop - k * c))
+                out_region.append(slice(start - r.start, stop - r.start))
+            yield f"{self.folder}/{'.'.join(str(k) for k in index)}", tuple(chunk_region), tuple(out_region)
+
+
+class ChunkedArrayReader(FormatReader):
+    """
+    Reader for chunked arrays stored as one object per chunk.
+    A sample is one plane of the array; the chunk objects intersecting it are fetched
+    concurrently by reader.chunk_fetch_threads threads and assembled with numpy.
+    """
+
+    @dlp.log_init
+    def __init__(self, dataset_type, thread_index, epoch):
+        super().__init__(dataset_type, thread_index)
+        # chunks are found where the generator put them, under the storage root
+        self.storage = StorageFactory().get_storage(self._args.storage_type, self._args.storage_root,
+                                                    self._args.framework)
+        self.fetch_threads = max(1, self._args.chunk_fetch_threads)
+        self.executor = None
+
+    @dlp.log
+    def open(self, filename):
+        super().open(filename)
+        metadata = json.loads(bytes(self.byte_source.read(filename)))
+        return ChunkedArray(metadata, self.storage.get_uri(chunk_folder(self._args.data_folder, filename)))
+
+    @dlp.log
+    def close(self, filename):
+        super().close(filename)
+
+    def fetch_chunk(self, array, path):
+        data = self.byte_source.read(path)
+        chunk = np.frombuffer(data, dtype=array.dtype)
+        if not isinstance(data, bytes):
+            # memory mapped chunks are copied out so the mapping can be dropped right away
+            chunk = chunk.copy()
+            self.byte_source.release(path)
+        return chunk.reshape(array.chunks)
+
+    @dlp.log
+    def read_region(self, array, region):
+        shape = tuple(r.stop - r.start for r in region)
+        image = np.empty(shape, dtype=array.dtype)
+        requests = list(array.intersecting_chunks(region))
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.fetch_threads)
+        futures = [self.executor.submit(self.fetch_chunk, array, path) for path, _, _ in requests]
+        for (_, chunk_region, out_region), future in zip(requests, futures):
+            image[out_region] = future.result()[chunk_region]
+        SharedCounters.get_instance().add("chunks_fetched", len(requests))
+        return image
+
+    @dlp.log
+    def get_sample(self, filename, sample_index):
+        super().get_sample(filename, sample_index)
+        array = self.open_file_map[filename]
+        region = (slice(sample_index, sample_index + 1),) + tuple(slice(0, s) for s in array.shape[1:])
+        image = self.read_region(array, region)[0]
+        dlp.update(image_size=image.nbytes)
+        return image
+
+    def next(self):
+        for batch in super().next():
+            yield batch
+
+    @dlp.log
+    def read_index(self, image_idx, step):
+        return super().read_index(image_idx, step)
+
+    @dlp.log
+    def finalize(self):
+        result = super().finalize()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        return result
+
+    def is_index_based(self):
+        return True
+
+    def is_iterator_based(self):
+        return True
@@ -14,38 +14,109 @@
    See the License for the specific language governing permissions and
    limitations under the License.
 """
+from bisect import bisect_right
+
+import numpy as np
 import pandas as pd
 
 from dlio_benchmark.common.constants import MODULE_DATA_READER
 from dlio_benchmark.utils.utility import Profile
 from dlio_benchmark.reader.reader_handler import FormatReader
 
+try:
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 dlp = Profile(MODULE_DATA_READER)
 
+# compressions the Arrow CSV reader detects from the file name
+ARROW_COMPRESSIONS = ('.gz', '.bz2')
+
+
+class ArrowCSVFile(object):
+    """
+    Streams a CSV file as Arrow record batches parsed on multiple threads.
+    Blocks are parsed only as far as the rows asked for so far, and a block is
+    turned into a numpy array the first time one of its rows is accessed.
+    """
+
+    def __init__(self, source, block_size):
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=block_size)
+        self.stream = pacsv.open_csv(source, read_options=read_options)
+        self.batches = []
+        self.offsets = [0]
+        self.arrays = {}
+        self.exhausted = False
+
+    def _parse_until(self, row):
+        while row >= self.offsets[-1] and not self.exhausted:
+            try:
+                batch = self.stream.read_next_batch()
+            except StopIteration:
+                self.exhausted = True
+                break
+            self.batches.append(batch)
+            self.offsets.append(self.offsets[-1] + batch.num_rows)
+
+    def __getitem__(self, row):
+        self._parse_until(row)
+        if row >= self.offsets[-1]:
+            raise IndexError(f"row {row} is out of range for a file with {self.offsets[-1]} rows")
+        block = bisect_right(self.offsets, row) - 1
+        if block not in self.arrays:
+            columns = self.batches[block].columns
+            self.arrays[block] = np.stack([column.to_numpy(zero_copy_only=False) for column in columns], axis=1)
+        return self.arrays[block][row - self.offsets[block]]
+
+    def close(self):
+        self.batches = []
+        self.arrays = {}
+        self.stream.close()
+
 
 class CSVReader(FormatReader):
     """
     CSV Reader reader and iterator logic.
+    Files are parsed with the multithreaded Arrow CSV reader when pyarrow is installed
+    and the compression is one it handles; otherwise pandas parses the whole file.
     """
 
     @dlp.log_init
     def __init__(self, dataset_type, thread_index, epoch):
         super().__init__(dataset_type, thread_index)
+        # a block has to hold at least one full row of text
+        self.block_size = max(1 << 20, 8 * (self._args.record_length + 4 * self._args.record_length_stdev))
+
+    def use_arrow(self, filename):
+        if not PYARROW_AVAILABLE:
+            return False
+        if filename.endswith('.csv'):
+            return True
+        # compression is only inferred from the name of a local file
+        return filename.endswith(ARROW_COMPRESSIONS) and self.byte_source.is_local()
 
     @dlp.log
     def open(self, filename):
         super().open(filename)
-        return pd.read_csv(filename, compression="infer").to_numpy()
+        if self.use_arrow(filename):
+            return ArrowCSVFile(self.byte_source.locate(filename), self.block_size)
+        return pd.read_csv(self.byte_source.locate(filename), compression="infer").to_numpy()
 
     @dlp.log
     def close(self, filename):
         super().close(filename)
+        handle = self.open_file_map[filename]
+        if isinstance(handle, ArrowCSVFile):
+            handle.close()
 
     @dlp.log
     def get_sample(self, filename, sample_index):
         super().get_sample(filename, sample_index)
         image = self.open_file_map[filename][sample_index]
         dlp.update(image_size=image.nbytes)
+        return image
 
     def next(self):
         for batch in super().next():
@@ -58,9 +129,9 @@ class CSVReader(FormatReader):
     @dlp.log
     def finalize(self):
         return super().finalize()
-    
+
     def is_index_based(self):
         return True
 
     def is_iterator_based(self):
-        return True
\ No newline at end of file
+        return True
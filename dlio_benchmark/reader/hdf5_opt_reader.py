@@ -0,0 +1,185 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import h5py
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_DATA_READER
+from dlio_benchmark.utils.utility import Profile, utcnow
+from dlio_benchmark.reader.reader_handler import FormatReader
+
+dlp = Profile(MODULE_DATA_READER)
+
+
+class HDF5OptReader(FormatReader):
+    """
+    Optimized reader for HDF5 files.
+
+    Compared to HDF5Reader it
+      - opens files with a configurable raw data chunk cache and the page buffer,
+      - keeps file handles open in the handle pool until they are evicted,
+      - reads samples with read_direct into preallocated buffers,
+      - reads runs of contiguous samples of a file as a single hyperslab.
+    """
+    @dlp.log_init
+    def __init__(self, dataset_type, thread_index, epoch):
+        super().__init__(dataset_type, thread_index)
+        self.keep_open = True
+        self.dataset_map = {}
+        self.buffer_map = {}
+
+    def _open_file(self, filename):
+        kwargs = dict(rdcc_nbytes=self._args.hdf5_rdcc_nbytes,
+                      rdcc_nslots=self._args.hdf5_rdcc_nslots,
+                      rdcc_w0=self._args.hdf5_rdcc_w0)
+        if self._args.hdf5_page_buffer_size > 0:
+            try:
+                return h5py.File(self.byte_source.locate(filename), 'r',
+                                 page_buf_size=self._args.hdf5_page_buffer_size, **kwargs)
+            except (OSError, ValueError):
+                # the page buffer is only available for files written with paged aggregation
+                self.logger.debug(f"{utcnow()} {filename} is not a paged HDF5 file; opening without page buffer")
+        return h5py.File(self.byte_source.locate(filename), 'r', **kwargs)
+
+    @dlp.log
+    def open(self, filename):
+        super().open(filename)
+        return self._open_file(filename)
+
+    @dlp.log
+    def close(self, filename):
+        self.dataset_map.pop(filename, None)
+        self.open_file_map[filename].close()
+
+    def _buffer(self, dataset, count):
+        key = (dataset.shape[1:], dataset.dtype)
+        buffer = self.buffer_map.get(key)
+        if buffer is None or len(buffer) < count:
+            buffer = np.empty((max(count, self.batch_size),) + dataset.shape[1:], dtype=dataset.dtype)
+            self.buffer_map[key] = buffer
+        return buffer
+
+    @dlp.log
+    def read_range(self, filename, start, count):
+        """
+        Reads samples [start, start + count) of filename with one hyperslab selection.
+        The returned array is a view of a reused buffer and is only valid until the next read.
+        """
+        if filename not in self.dataset_map:
+            self.dataset_map[filename] = self.open_file_map[filename]['records']
+        dataset = self.dataset_map[filename]
+        buffer = self._buffer(dataset, count)
+        dataset.read_direct(buffer, np.s_[start:start + count], np.s_[0:count])
+        images = buffer[:count]
+        dlp.update(image_size=images.nbytes)
+        return images
+
+    @dlp.log
+    def get_sample(self, filename, sample_index):
+        super().get_sample(filename, sample_index)
+        image = self.read_range(filename, sample_index, 1)[0]
+        # the read buffer is reused, so a sample that leaves the reader has to be a copy
+        return image.copy() if self._args.return_payload else image
+
+    def next(self):
+        batch = []
+        image_processed = 0
+        self.step = 1
+        samples = self.file_map[self.thread_index]
+        total_images = len(samples)
+        self.logger.debug(f"{utcnow()} Reading {total_images} images thread {self.thread_index} rank {self._args.my_rank}")
+        self.start_prefetch(samples)
+        previous_filename = None
+        i = 0
+        try:
+            while i < total_images:
+                global_sample_idx, filename, sample_index = samples[i]
+                # grow the run while the next samples are consecutive in the same file
+                count = 1
+                while count < self.batch_size - len(batch) and i + count < total_images:
+                    _, next_filename, next_sample_index = samples[i + count]
+                    if next_filename != filename or next_sample_index != sample_index + count:
+                        break
+                    count += 1
+                self.image_idx = samples[i + count - 1][0]
+                self.acquire_file(filename, filename != previous_filename)
+                previous_filename = filename
+                images = self.read_range(filename, sample_index, count)
+                self.handle_pool.release(self, filename)
+                for k in range(count):
+                    self.preprocess()
+                    # payloads are copied out of the reused read buffer
+                    batch.append(self.batch_item(images[k].copy() if self._args.return_payload else None))
+                image_processed += count
+                i += count
+                is_last = 0 if image_processed < total_images else 1
+                if is_last:
+                    while len(batch) is not self.batch_size:
+                        batch.append(self.batch_item())
+                if len(batch) == self.batch_size:
+                    self.step += 1
+                    batch = self.make_batch(batch)
+                    yield batch
+                    batch = []
+                if is_last:
+                    break
+        finally:
+            self.stop_prefetch()
+
+    @dlp.log
+    def read_batch(self, global_sample_indices, step):
+        """
+        Reads the samples of a batch sorted by file and sample, with one hyperslab per run of
+        consecutive samples. Batches are read through the sample cache one by one when it is enabled.
+        """
+        if self.sample_cache is not None:
+            return super().read_batch(global_sample_indices, step)
+        self.step = step
+        entries = sorted(tuple(self.global_index_map[global_sample_idx]) + (position, global_sample_idx)
+                         for position, global_sample_idx in enumerate(global_sample_indices))
+        batch = [None] * len(entries)
+        i = 0
+        while i < len(entries):
+            filename, sample_index, _, _ = entries[i]
+            count = 1
+            while i + count < len(entries) and entries[i + count][0] == filename \
+                    and entries[i + count][1] == sample_index + count:
+                count += 1
+            self.image_idx = entries[i + count - 1][3]
+            self.handle_pool.acquire(self, filename)
+            images = self.read_range(filename, sample_index, count)
+            self.handle_pool.release(self, filename)
+            for k in range(count):
+                self.preprocess()
+                batch[entries[i + k][2]] = self.batch_item(images[k].copy() if self._args.return_payload else None)
+            FormatReader.read_images += count
+            i += count
+        return self.make_batch(batch)
+
+    @dlp.log
+    def read_index(self, image_idx, step):
+        return super().read_index(image_idx, step)
+
+    @dlp.log
+    def finalize(self):
+        self.buffer_map = {}
+        return super().finalize()
+
+    def is_index_based(self):
+        return True
+
+    def is_iterator_based(self):
+        return True
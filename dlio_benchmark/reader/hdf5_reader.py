@@ -35,7 +35,7 @@ class HDF5Reader(FormatReader):
     @dlp.log
     def open(self, filename):
         super().open(filename)
-        return h5py.File(filename, 'r')
+        return h5py.File(self.byte_source.locate(filename), 'r')
 
     @dlp.log
     def close(self, filename):
@@ -46,6 +46,7 @@ class HDF5Reader(FormatReader):
         super().get_sample(filename, sample_index)
         image = self.open_file_map[filename]['records'][sample_index]
         dlp.update(image_size=image.nbytes)
+        return image
 
     def next(self):
         for batch in super().next():
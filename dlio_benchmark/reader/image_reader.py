@@ -14,13 +14,18 @@
    See the License for the specific language governing permissions and
    limitations under the License.
 """
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import io
 import logging
+from time import perf_counter_ns
 
 import numpy as np
 from PIL import Image
 
 from dlio_benchmark.common.constants import MODULE_DATA_READER
 from dlio_benchmark.reader.reader_handler import FormatReader
+from dlio_benchmark.utils.counters import SharedCounters
 from dlio_benchmark.utils.utility import utcnow
 from dlio_benchmark.utils.utility import Profile
 
@@ -29,16 +34,54 @@ dlp = Profile(MODULE_DATA_READER)
 class ImageReader(FormatReader):
     """
     Reader for PNG / JPEG files
+
+    With reader.image_decode set, every image is decoded from its bytes and resized to
+    record_length_resize, and the time spent reading, decoding and resizing is counted per stage.
+    JPEGs are decoded at a reduced scale (draft mode) when reader.image_jpeg_draft is set,
+    and reader.image_decode_threads threads decode the images of a batch in parallel, ahead of the batch
+    in next() and across the files of the batch in read_batch().
     """
 
     @dlp.log_init
     def __init__(self, dataset_type, thread_index, epoch):
         super().__init__(dataset_type, thread_index)
+        self.decode_images = self._args.image_decode
+        self.size = None
+        if self._args.record_length_resize > 0:
+            self.size = (self._args.max_dimension, self._args.max_dimension)
+        self.executor = None
+
+    def decode(self, filename):
+        """
+        Reads, decodes and resizes an image, adding the time of each stage to the shared counters.
+        """
+        start = perf_counter_ns()
+        data = self.byte_source.read(filename)
+        read = perf_counter_ns()
+        image = Image.open(io.BytesIO(data))
+        self.byte_source.release(filename)
+        if self._args.image_jpeg_draft and self.size is not None and image.format == "JPEG":
+            # lets libjpeg scale by 1/2, 1/4 or 1/8 while decoding, as long as the result is not smaller than size
+            image.draft(image.mode, self.size)
+        image.load()
+        decoded = perf_counter_ns()
+        if self.size is not None and image.size != self.size:
+            image = image.resize(self.size, Image.BILINEAR)
+        image = np.asarray(image)
+        resized = perf_counter_ns()
+        counters = SharedCounters.get_instance()
+        counters.add("images_decoded")
+        counters.add("image_read_ns", read - start)
+        counters.add("image_decode_ns", decoded - read)
+        counters.add("image_resize_ns", resized - decoded)
+        return image
 
     @dlp.log
     def open(self, filename):
         super().open(filename)
-        return np.asarray(Image.open(filename))
+        if self.decode_images:
+            return self.decode(filename)
+        return np.asarray(Image.open(self.byte_source.locate(filename)))
 
     @dlp.log
     def close(self, filename):
@@ -50,10 +93,83 @@ class ImageReader(FormatReader):
         super().get_sample(filename, sample_index)
         image = self.open_file_map[filename]
         dlp.update(image_size=image.nbytes)
+        return image
+
+    def decode_ahead(self, samples):
+        """
+        Yields (global sample index, image) in order while up to twice the number of decode
+        threads images are being read and decoded in the pool.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self._args.image_decode_threads)
+        counters = SharedCounters.get_instance()
+        window = 2 * self._args.image_decode_threads
+        pending = deque()
+        samples = iter(samples)
+        try:
+            while True:
+                while len(pending) < window:
+                    sample = next(samples, None)
+                    if sample is None:
+                        break
+                    global_sample_idx, filename, _ = sample
+                    # an image file holding several samples is decoded once for all of them
+                    if len(pending) > 0 and pending[-1][1] == filename:
+                        pending.append((global_sample_idx, filename, pending[-1][2]))
+                    else:
+                        counters.add("files_opened")
+                        pending.append((global_sample_idx, filename, self.executor.submit(self.decode, filename)))
+                if len(pending) == 0:
+                    break
+                global_sample_idx, filename, future = pending.popleft()
+                image = future.result()
+                if len(pending) == 0 or pending[0][1] != filename:
+                    counters.add("files_closed")
+                yield global_sample_idx, image
+        finally:
+            for _, _, future in pending:
+                future.cancel()
 
     def next(self):
-        for batch in super().next():
-            yield batch
+        if not self.decode_images or self._args.image_decode_threads <= 1:
+            for batch in super().next():
+                yield batch
+            return
+        samples = self.file_map[self.thread_index]
+        total_images = len(samples)
+        self.logger.debug(f"{utcnow()} Decoding {total_images} images thread {self.thread_index} rank {self._args.my_rank}")
+        batch = []
+        image_processed = 0
+        self.step = 1
+        for global_sample_idx, image in self.decode_ahead(samples):
+            self.image_idx = global_sample_idx
+            dlp.update(image_size=image.nbytes)
+            self.preprocess(image)
+            batch.append(self.batch_item(image))
+            image_processed += 1
+            is_last = 0 if image_processed < total_images else 1
+            if is_last:
+                while len(batch) is not self.batch_size:
+                    batch.append(self.batch_item())
+            if len(batch) == self.batch_size:
+                self.step += 1
+                batch = self.make_batch(batch)
+                yield batch
+                batch = []
+            if is_last:
+                break
+
+    def batch_pool(self, num_files):
+        """
+        Decodes the files of a batch in the decode pool, so that index based loaders reading whole
+        batches decode in parallel too.
+        """
+        if not self.decode_images or self._args.image_decode_threads <= 1 \
+                or num_files <= 1 or self.sample_cache is not None:
+            return super().batch_pool(num_files)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self._args.image_decode_threads)
+        return self.executor
 
     @dlp.log
     def read_index(self, image_idx, step):
@@ -61,16 +177,14 @@ class ImageReader(FormatReader):
 
     @dlp.log
     def finalize(self):
-        return super().finalize()
+        result = super().finalize()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        return result
 
     def is_index_based(self):
         return True
 
     def is_iterator_based(self):
         return True
-    
-    def is_index_based(self):
-        return True
-
-    def is_iterator_based(self):
-        return True
\ No newline at end of file
@@ -15,13 +15,17 @@
    limitations under the License.
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 import numpy as np
 import struct
 
 from dlio_benchmark.common.constants import MODULE_DATA_READER
-from dlio_benchmark.common.enumerations import DataLoaderSampler
+from dlio_benchmark.common.enumerations import Compression, DataLoaderSampler
 from dlio_benchmark.reader.reader_handler import FormatReader
+from dlio_benchmark.utils.counters import SharedCounters
+from dlio_benchmark.utils.sample_codec import SampleCodec, SAMPLE_CODECS
 from dlio_benchmark.utils.utility import Profile
 
 dlp = Profile(MODULE_DATA_READER)
@@ -36,7 +40,13 @@ class IndexedBinaryMMapReader(FormatReader):
     def __init__(self, dataset_type, thread_index, epoch):
         super().__init__(dataset_type, thread_index)
         self.file_map_ibr = {}
+        self.codec = None
+        if Compression(self._args.compression) in SAMPLE_CODECS:
+            self.codec = SampleCodec(self._args.compression, self._args.compression_level,
+                                     self._args.compression_block_size)
+        self.executor = None
         self.buffer_map = {}
+        self.index_lock = threading.Lock()
         self.load_index()
 
     def index_file_path_off(self, prefix_path):
@@ -50,36 +60,67 @@ class IndexedBinaryMMapReader(FormatReader):
         f.readinto(a)
         return a
 
-    def load_index_file(self, global_sample_idx, filename, sample_index):
+    def load_index_file(self, filename):
         if filename not in self.file_map_ibr:
             offset_file = self.index_file_path_off(filename)
             sz_file = self.index_file_path_size(filename)
-            self.file_map_ibr[filename] = []
+            index = []
             bin_buffer_mmap = np.memmap(offset_file, mode='r', order='C')
             bin_buffer = memoryview(bin_buffer_mmap)
-            self.file_map_ibr[filename].append(np.frombuffer(bin_buffer, dtype=np.uint64))
+            index.append(np.frombuffer(bin_buffer, dtype=np.uint64))
             bin_buffer_mmap = np.memmap(sz_file, mode='r', order='C')
             bin_buffer = memoryview(bin_buffer_mmap)
-            self.file_map_ibr[filename].append(np.frombuffer(bin_buffer, dtype=np.uint64))
+            index.append(np.frombuffer(bin_buffer, dtype=np.uint64))
             bin_buffer_mmap = np.memmap(filename, mode='r', order='C')
             bin_buffer = memoryview(bin_buffer_mmap)
             self.buffer_map[filename] = np.frombuffer(bin_buffer, dtype=np.uint8)
-
-    @dlp.log
-    def load_index(self):
+            # published last, so that a file is either fully mapped or not at all
+            self.file_map_ibr[filename] = index
+
+    def index(self, filename):
+        """
+        Offsets and sizes of the samples of filename, mapped on first use along with the file: the
+        reader outlives the epoch it was created in, and later epochs may reach files outside the
+        first epoch's map.
+        """
+        entry = self.file_map_ibr.get(filename)
+        if entry is None:
+            with self.index_lock:
+                self.load_index_file(filename)
+                entry = self.file_map_ibr[filename]
+        return entry
+
+    def filenames(self):
+        """
+        Files this reader reads samples from.
+        """
         if self._args.data_loader_sampler == DataLoaderSampler.ITERATIVE:
-            for global_sample_idx, filename, sample_index in self.file_map[self.thread_index]:
-                self.load_index_file(global_sample_idx, filename, sample_index)
+            return self.file_map[self.thread_index].filenames()
         elif self._args.data_loader_sampler == DataLoaderSampler.INDEX:
-            for global_sample_idx, (filename, sample_index) in self.global_index_map.items():
-                self.load_index_file(global_sample_idx, filename, sample_index)
-
-
+            return self.global_index_map.filenames()
+        return []
 
+    @dlp.log
+    def load_index(self):
+        for filename in self.filenames():
+            self.load_index_file(filename)
+
+    def decompress(self, data):
+        """
+        Decompresses a sample, spreading its blocks over reader.decompression_threads threads.
+        """
+        if self.executor is None and self._args.decompression_threads > 1:
+            self.executor = ThreadPoolExecutor(max_workers=self._args.decompression_threads)
+        image = self.codec.decompress(data, self.executor)
+        counters = SharedCounters.get_instance()
+        counters.add("compressed_bytes_read", len(data))
+        counters.add("logical_bytes_read", image.nbytes)
+        return image
 
     @dlp.log
     def open(self, filename):
-        super().open(filename)        
+        super().open(filename)
+        self.index(filename)
         return self.buffer_map[filename]
 
     @dlp.log
@@ -90,11 +131,15 @@ class IndexedBinaryMMapReader(FormatReader):
     @dlp.log
     def get_sample(self, filename, sample_index):
         super().get_sample(filename, sample_index)
+        offsets, sizes = self.index(filename)
         buffer = self.buffer_map[filename]
-        offset = self.file_map_ibr[filename][0][sample_index]
-        size = self.file_map_ibr[filename][1][sample_index]
+        offset = offsets[sample_index]
+        size = sizes[sample_index]
         image = buffer[offset:offset+size]
-        dlp.update(image_size=size)
+        if self.codec is not None:
+            image = self.decompress(image)
+        dlp.update(image_size=image.nbytes)
+        return image
 
     def next(self):
         for batch in super().next():
@@ -103,23 +148,27 @@ class IndexedBinaryMMapReader(FormatReader):
     @dlp.log
     def read_index(self, image_idx, step):
         filename, sample_index = self.global_index_map[image_idx]
-        self.get_sample(filename, sample_index)
+        image = self.get_sample(filename, sample_index)
         self.preprocess()
-        return self._args.resized_image
+        return self.batch_item(image)
+
+    @dlp.log
+    def read_batch(self, global_sample_indices, step):
+        # the files are mapped once, so there are no handles to group the batch by
+        self.step = step
+        return self.make_batch([self.read_index(image_idx, step) for image_idx in global_sample_indices])
 
     @dlp.log
     def finalize(self):
         super().finalize()
-        if self._args.data_loader_sampler == DataLoaderSampler.ITERATIVE:
-            for global_sample_idx, filename, sample_index in self.file_map[self.thread_index]:
-                self.buffer_map[filename]._mmap.close()
-                self.file_map_ibr[filename][0]._mmap.close()
-                self.file_map_ibr[filename][1]._mmap.close()
-        elif self._args.data_loader_sampler == DataLoaderSampler.INDEX:
-            for global_sample_idx, (filename, sample_index) in self.global_index_map.items():
-                self.buffer_map[filename]._mmap.close()
-                self.file_map_ibr[filename][0]._mmap.close()
-                self.file_map_ibr[filename][1]._mmap.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        # drops every file mapped so far, not only the ones of the first epoch; samples handed out
+        # are views of the mappings, so a file is unmapped once the last view of it is gone
+        with self.index_lock:
+            self.file_map_ibr = {}
+            self.buffer_map = {}
             
 
     def is_index_based(self):
@@ -15,13 +15,17 @@
    limitations under the License.
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 import numpy as np
 import struct
 
 from dlio_benchmark.common.constants import MODULE_DATA_READER
-from dlio_benchmark.common.enumerations import DataLoaderSampler
+from dlio_benchmark.common.enumerations import Compression, DataLoaderSampler
 from dlio_benchmark.reader.reader_handler import FormatReader
+from dlio_benchmark.utils.counters import SharedCounters
+from dlio_benchmark.utils.sample_codec import SampleCodec, SAMPLE_CODECS
 from dlio_benchmark.utils.utility import Profile
 
 dlp = Profile(MODULE_DATA_READER)
@@ -36,6 +40,12 @@ class IndexedBinaryReader(FormatReader):
     def __init__(self, dataset_type, thread_index, epoch):
         super().__init__(dataset_type, thread_index)
         self.file_map_ibr = {}
+        self.codec = None
+        if Compression(self._args.compression) in SAMPLE_CODECS:
+            self.codec = SampleCodec(self._args.compression, self._args.compression_level,
+                                     self._args.compression_block_size)
+        self.executor = None
+        self.index_lock = threading.Lock()
         self.load_index()
 
     def index_file_path_off(self, prefix_path):
@@ -44,40 +54,63 @@ class IndexedBinaryReader(FormatReader):
     def index_file_path_size(self, prefix_path):
         return prefix_path + '.sz.idx'
 
-    def read_longs(self, f, n):
-        a = np.empty(n, dtype=np.int64)
-        f.readinto(a)
+    def read_longs(self, filename, n):
+        a = np.frombuffer(self.byte_source.read(filename, 0, n * np.dtype(np.int64).itemsize), dtype=np.int64)
         return a
 
-    def load_index_file(self, global_sample_idx, filename, sample_index):
+    def load_index_file(self, filename):
         if filename not in self.file_map_ibr:
             offset_file = self.index_file_path_off(filename)
             sz_file = self.index_file_path_size(filename)
-            self.file_map_ibr[filename] = []
-            with open(offset_file, 'rb') as f:
-                offsets = self.read_longs(f, self._args.num_samples_per_file)
-                self.logger.debug(f"read offsets {offsets} from file {offset_file}")
-                self.file_map_ibr[filename].append(offsets)
-            with open(sz_file, 'rb') as f:
-                sizes = self.read_longs(f, self._args.num_samples_per_file)
-                self.logger.debug(f"read sizes {sizes} from file {sz_file}")
-                self.file_map_ibr[filename].append(sizes)
-    @dlp.log
-    def load_index(self):
+            offsets = self.read_longs(offset_file, self._args.num_samples_per_file)
+            self.logger.debug(f"read offsets {offsets} from file {offset_file}")
+            sizes = self.read_longs(sz_file, self._args.num_samples_per_file)
+            self.logger.debug(f"read sizes {sizes} from file {sz_file}")
+            self.file_map_ibr[filename] = [offsets, sizes]
+
+    def index(self, filename):
+        """
+        Offsets and sizes of the samples of filename, loaded on first use: the reader outlives the
+        epoch it was created in, and later epochs may reach files outside the first epoch's map.
+        """
+        entry = self.file_map_ibr.get(filename)
+        if entry is None:
+            with self.index_lock:
+                self.load_index_file(filename)
+                entry = self.file_map_ibr[filename]
+        return entry
+
+    def filenames(self):
+        """
+        Files this reader reads samples from.
+        """
         if self._args.data_loader_sampler == DataLoaderSampler.ITERATIVE:
-            for global_sample_idx, filename, sample_index in self.file_map[self.thread_index]:
-                self.load_index_file(global_sample_idx, filename, sample_index)
+            return self.file_map[self.thread_index].filenames()
         elif self._args.data_loader_sampler == DataLoaderSampler.INDEX:
-            for global_sample_idx, (filename, sample_index) in self.global_index_map.items():
-                self.load_index_file(global_sample_idx, filename, sample_index)
-
-
+            return self.global_index_map.filenames()
+        return []
 
+    @dlp.log
+    def load_index(self):
+        for filename in self.filenames():
+            self.load_index_file(filename)
+
+    def decompress(self, data):
+        """
+        Decompresses a sample, spreading its blocks over reader.decompression_threads threads.
+        """
+        if self.executor is None and self._args.decompression_threads > 1:
+            self.executor = ThreadPoolExecutor(max_workers=self._args.decompression_threads)
+        image = self.codec.decompress(data, self.executor)
+        counters = SharedCounters.get_instance()
+        counters.add("compressed_bytes_read", len(data))
+        counters.add("logical_bytes_read", image.nbytes)
+        return image
 
     @dlp.log
     def open(self, filename):
         super().open(filename)
-        return open(filename, "rb")
+        return self.byte_source.open(filename)
 
     @dlp.log
     def close(self, filename):
@@ -88,13 +121,17 @@ class IndexedBinaryReader(FormatReader):
     def get_sample(self, filename, sample_index):
         super().get_sample(filename, sample_index)
         file = self.open_file_map[filename]
-        offset = self.file_map_ibr[filename][0][sample_index]
-        size = self.file_map_ibr[filename][1][sample_index]
+        offsets, sizes = self.index(filename)
+        offset = offsets[sample_index]
+        size = sizes[sample_index]
         self.logger.debug(f"reading sample from offset {offset} of size {size} from file {filename}")
         file.seek(offset)
         image = np.empty(size, dtype=np.uint8)
         file.readinto(image)
-        dlp.update(image_size=size)
+        if self.codec is not None:
+            image = self.decompress(image)
+        dlp.update(image_size=image.nbytes)
+        return image
 
     def next(self):
         for batch in super().next():
@@ -106,7 +143,11 @@ class IndexedBinaryReader(FormatReader):
 
     @dlp.log
     def finalize(self):
-        return super().finalize()
+        result = super().finalize()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        return result
 
     def is_index_based(self):
         return True
@@ -23,29 +23,87 @@ from dlio_benchmark.utils.utility import Profile
 dlp = Profile(MODULE_DATA_READER)
 
 
+class NPYFile(object):
+    """
+    Header of an .npy file together with the open file object it was parsed from.
+    Samples are stored along the last axis; in Fortran order each one is a contiguous
+    run of bytes that can be read without touching the rest of the file.
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+        version = np.lib.format.read_magic(fd)
+        if version == (1, 0):
+            self.shape, self.fortran_order, self.dtype = np.lib.format.read_array_header_1_0(fd)
+        else:
+            self.shape, self.fortran_order, self.dtype = np.lib.format.read_array_header_2_0(fd)
+        self.offset = fd.tell()
+        self.sample_shape = self.shape[:-1]
+        self.sample_bytes = int(np.prod(self.sample_shape)) * self.dtype.itemsize
+        self.array = None
+
+    def read_sample(self, sample_index):
+        if not self.fortran_order:
+            # samples are strided across the whole file; read it once
+            if self.array is None:
+                self.fd.seek(0)
+                self.array = np.load(self.fd)
+            return self.array[..., sample_index]
+        image = np.empty(self.sample_bytes, dtype=np.uint8)
+        self.fd.seek(self.offset + sample_index * self.sample_bytes)
+        self.fd.readinto(image)
+        return image.view(self.dtype).reshape(self.sample_shape, order='F')
+
+    def close(self):
+        self.array = None
+        self.fd.close()
+
+
 class NPYReader(FormatReader):
     """
     Reader for NPY files
+
+    Unless reader.dont_use_mmap is set, only the requested sample is read: local files
+    are memory mapped and other storage is accessed with ranged reads after parsing the
+    header. With dont_use_mmap the whole file is loaded when it is opened.
     """
 
     @dlp.log_init
     def __init__(self, dataset_type, thread_index, epoch):
         super().__init__(dataset_type, thread_index)
+        self.use_mmap = not self._args.dont_use_mmap
 
     @dlp.log
     def open(self, filename):
         super().open(filename)
-        return np.load(filename)
+        if not self.use_mmap:
+            return np.load(self.byte_source.locate(filename))
+        if self.byte_source.is_local():
+            return np.load(self.byte_source.locate(filename), mmap_mode='r')
+        return NPYFile(self.byte_source.open(filename))
 
     @dlp.log
     def close(self, filename):
         super().close(filename)
+        handle = self.open_file_map[filename]
+        if isinstance(handle, NPYFile):
+            handle.close()
+        elif isinstance(handle, np.memmap) and handle._mmap is not None:
+            handle._mmap.close()
 
     @dlp.log
     def get_sample(self, filename, sample_index):
         super().get_sample(filename, sample_index)
-        image = self.open_file_map[filename][..., sample_index]
+        handle = self.open_file_map[filename]
+        if isinstance(handle, NPYFile):
+            image = handle.read_sample(sample_index)
+        else:
+            image = handle[..., sample_index]
+            if isinstance(handle, np.memmap):
+                # copying out of the memory map is what faults the sample in
+                image = np.array(image)
         dlp.update(image_size=image.nbytes)
+        return image
 
     def next(self):
         for batch in super().next():
@@ -63,4 +121,4 @@ class NPYReader(FormatReader):
         return True
 
     def is_iterator_based(self):
-        return True
\ No newline at end of file
+        return True
@@ -36,7 +36,7 @@ class NPZReader(FormatReader):
     @dlp.log
     def open(self, filename):
         super().open(filename)
-        return np.load(filename, allow_pickle=True)['x']
+        return np.load(self.byte_source.locate(filename), allow_pickle=True)['x']
 
     @dlp.log
     def close(self, filename):
@@ -48,6 +48,7 @@ class NPZReader(FormatReader):
         image = self.open_file_map[filename][..., sample_index]
         print(f"[DEBUG_STATS][get_sample pid={os.getpid()}] filename={filename} sample_index={sample_index} image_size={image.nbytes}")
         dlp.update(image_size=image.nbytes)
+        return image
 
     def next(self):
         for batch in super().next():
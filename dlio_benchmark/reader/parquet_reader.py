@@ -0,0 +1,150 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from dlio_benchmark.common.constants import MODULE_DATA_READER
+from dlio_benchmark.reader.reader_handler import FormatReader
+from dlio_benchmark.utils.utility import Profile
+
+dlp = Profile(MODULE_DATA_READER)
+
+
+class ParquetRowGroups(object):
+    """
+    Row groups of one Parquet file, mapped from sample index to (row group, row).
+    Reading a row group also submits the following ones, up to the concurrency of the
+    thread pool, so consecutive row groups are read in parallel. Every read uses its own
+    ParquetFile built from the shared footer metadata, so reads do not share a file position.
+    """
+
+    def __init__(self, open_file, executor, columns, concurrency):
+        self.open_file = open_file
+        self.executor = executor
+        self.columns = columns
+        self.concurrency = concurrency
+        parquet = open_file()
+        self.metadata = parquet.metadata
+        parquet.close()
+        self.offsets = [0]
+        for i in range(self.metadata.num_row_groups):
+            self.offsets.append(self.offsets[-1] + self.metadata.row_group(i).num_rows)
+        self.row_groups = OrderedDict()
+
+    def _read(self, index):
+        parquet = self.open_file(self.metadata)
+        try:
+            table = parquet.read_row_group(index, columns=self.columns, use_threads=False)
+        finally:
+            parquet.close()
+        return table
+
+    def _submit(self, index):
+        if index not in self.row_groups:
+            self.row_groups[index] = self.executor.submit(self._read, index)
+        self.row_groups.move_to_end(index)
+        return self.row_groups[index]
+
+    def sample(self, row):
+        index = bisect_right(self.offsets, row) - 1
+        if index >= self.metadata.num_row_groups:
+            raise IndexError(f"row {row} is out of range for a file with {self.offsets[-1]} rows")
+        for ahead in range(min(index + self.concurrency, self.metadata.num_row_groups) - 1, index, -1):
+            self._submit(ahead)
+        table = self._submit(index).result()
+        # keep the row group being read and what was submitted after it
+        while len(self.row_groups) > 2 * self.concurrency:
+            _, future = self.row_groups.popitem(last=False)
+            future.cancel()
+        row = row - self.offsets[index]
+        parts = [np.frombuffer(column[row].as_buffer(), dtype=np.uint8) for column in table.columns]
+        return np.concatenate(parts) if len(parts) > 1 else parts[0].copy()
+
+    def close(self):
+        for future in self.row_groups.values():
+            future.cancel()
+        self.row_groups = OrderedDict()
+
+
+class ParquetReader(FormatReader):
+    """
+    Reader for Parquet files written with one sample per row.
+    Only the columns listed in reader.parquet_columns are read (all of them when empty), and
+    up to reader.parquet_row_group_concurrency row groups are read in parallel.
+    Local files are memory mapped unless reader.dont_use_mmap is set.
+    """
+
+    @dlp.log_init
+    def __init__(self, dataset_type, thread_index, epoch):
+        super().__init__(dataset_type, thread_index)
+        # a row group is read once for all of its samples, so handles have to outlive a sample
+        self.keep_open = True
+        self.use_mmap = not self._args.dont_use_mmap
+        self.columns = list(self._args.parquet_columns) or None
+        self.concurrency = max(1, self._args.parquet_row_group_concurrency)
+        self.executor = None
+
+    def _parquet_file(self, filename, metadata=None):
+        if self.byte_source.is_local():
+            return pq.ParquetFile(self.byte_source.locate(filename), metadata=metadata, memory_map=self.use_mmap)
+        return pq.ParquetFile(self.byte_source.open(filename), metadata=metadata)
+
+    @dlp.log
+    def open(self, filename):
+        super().open(filename)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        return ParquetRowGroups(lambda metadata=None: self._parquet_file(filename, metadata),
+                                self.executor, self.columns, self.concurrency)
+
+    @dlp.log
+    def close(self, filename):
+        super().close(filename)
+        self.open_file_map[filename].close()
+
+    @dlp.log
+    def get_sample(self, filename, sample_index):
+        super().get_sample(filename, sample_index)
+        image = self.open_file_map[filename].sample(sample_index)
+        dlp.update(image_size=image.nbytes)
+        return image
+
+    def next(self):
+        for batch in super().next():
+            yield batch
+
+    @dlp.log
+    def read_index(self, image_idx, step):
+        return super().read_index(image_idx, step)
+
+    @dlp.log
+    def finalize(self):
+        result = super().finalize()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        return result
+
+    def is_index_based(self):
+        return True
+
+    def is_iterator_based(self):
+        return True
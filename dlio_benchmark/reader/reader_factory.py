@@ -19,7 +19,7 @@ from dlio_benchmark.utils.utility import utcnow, DLIOMPI
 
 from dlio_benchmark.utils.config import ConfigArguments
 
-from dlio_benchmark.common.enumerations import FormatType, DataLoaderType
+from dlio_benchmark.common.enumerations import FormatType, DataLoaderType, StorageType
 from dlio_benchmark.common.error_code import ErrorCodes
 
 
@@ -31,6 +31,8 @@ class ReaderFactory(object):
     def get_reader(type, dataset_type, thread_index, epoch_number):
         """
         This function set the data reader based on the data format and the data loader specified. 
+        Readers fetch file contents through the byte source derived from storage_type,
+        so the same reader is used for file systems and object storage.
         """
 
         _args = ConfigArguments.get_instance()
@@ -41,6 +43,18 @@ class ReaderFactory(object):
         elif type == FormatType.HDF5:
             from dlio_benchmark.reader.hdf5_reader import HDF5Reader
             return HDF5Reader(dataset_type, thread_index, epoch_number)
+        elif type == FormatType.HDF5_OPT:
+            from dlio_benchmark.reader.hdf5_opt_reader import HDF5OptReader
+            return HDF5OptReader(dataset_type, thread_index, epoch_number)
+        elif type == FormatType.PARQUET:
+            from dlio_benchmark.reader.parquet_reader import ParquetReader
+            return ParquetReader(dataset_type, thread_index, epoch_number)
+        elif type == FormatType.TAR_SHARD:
+            from dlio_benchmark.reader.tar_shard_reader import TarShardReader
+            return TarShardReader(dataset_type, thread_index, epoch_number)
+        elif type == FormatType.CHUNKED_ARRAY:
+            from dlio_benchmark.reader.chunked_array_reader import ChunkedArrayReader
+            return ChunkedArrayReader(dataset_type, thread_index, epoch_number)
         elif type == FormatType.CSV:
             from dlio_benchmark.reader.csv_reader import CSVReader
             return CSVReader(dataset_type, thread_index, epoch_number)
@@ -59,10 +73,6 @@ class ReaderFactory(object):
                 from dlio_benchmark.reader.npy_reader import NPYReader
                 return NPYReader(dataset_type, thread_index, epoch_number)                         
         elif type == FormatType.NPZ:
-            # if we are using S3 call the s3-backend reader
-            if _args.storage_type == "s3":
-                from dlio_benchmark.reader.npz_s3_reader import NPZS3Reader
-                return NPZS3Reader(dataset_type, thread_index, epoch_number)
             if _args.data_loader == DataLoaderType.NATIVE_DALI:
                 raise Exception("Loading data of %s format is not supported without framework data loader; please use npy format instead." %type)
             else:
@@ -72,13 +82,22 @@ class ReaderFactory(object):
             if _args.data_loader == DataLoaderType.NATIVE_DALI: 
                 from dlio_benchmark.reader.dali_tfrecord_reader import DaliTFRecordReader
                 return DaliTFRecordReader(dataset_type, thread_index, epoch_number)
-            else:
+            elif _args.data_loader == DataLoaderType.TENSORFLOW:
                 from dlio_benchmark.reader.tf_reader import TFReader
                 return TFReader(dataset_type, thread_index, epoch_number)
+            else:
+                from dlio_benchmark.reader.tfrecord_reader import TFRecordReader
+                return TFRecordReader(dataset_type, thread_index, epoch_number)
         elif type == FormatType.INDEXED_BINARY:
             from dlio_benchmark.reader.indexed_binary_reader import IndexedBinaryReader
             return IndexedBinaryReader(dataset_type, thread_index, epoch_number)
         elif type == FormatType.MMAP_INDEXED_BINARY:
+            if _args.storage_type == StorageType.S3:
+                # objects cannot be memory-mapped; fall back to ranged reads of the same layout
+                if DLIOMPI.get_instance().rank() == 0:
+                    logging.info(f"{utcnow()} {type} is read with ranged reads on {_args.storage_type} storage")
+                from dlio_benchmark.reader.indexed_binary_reader import IndexedBinaryReader
+                return IndexedBinaryReader(dataset_type, thread_index, epoch_number)
             from dlio_benchmark.reader.indexed_binary_mmap_reader import IndexedBinaryMMapReader
             return IndexedBinaryMMapReader(dataset_type, thread_index, epoch_number)
         elif type == FormatType.SYNTHETIC:
@@ -15,14 +15,21 @@
    limitations under the License.
 """
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 from dlio_benchmark.common.enumerations import FrameworkType, Shuffle, FileAccess, DatasetType, MetadataType, DataLoaderType, \
     ReadType
 from dlio_benchmark.framework.framework_factory import FrameworkFactory
 from dlio_benchmark.storage.storage_factory import StorageFactory
+from dlio_benchmark.storage.byte_source import ByteSourceFactory
+from dlio_benchmark.reader.sample_cache import SampleCacheFactory
 from dlio_benchmark.utils.utility import utcnow
 from dlio_benchmark.utils.utility import Profile
 from dlio_benchmark.utils.config import ConfigArguments
+from dlio_benchmark.utils.counters import SharedCounters
+from dlio_benchmark.utils.payload import as_payload, pad_payloads
 import numpy as np
 import os
 import math
@@ -33,6 +40,213 @@ from dlio_benchmark.utils.utility import sleep
 
 dlp = Profile(MODULE_DATA_READER)
 
+
+class FileHandlePool(object):
+    """
+    LRU pool of the file handles opened by all readers of a process.
+
+    A handle is keyed by reader class, dataset type, thread index and file name, so a
+    reader created for a new epoch picks up the handles of its predecessor. Once more
+    than max_open_files handles are open, the least recently used idle handle is closed
+    through the reader that owns it. A max_open_files of 0 means no limit.
+    """
+    __instance = None
+
+    def __init__(self, max_open_files=0):
+        self.max_open_files = max_open_files
+        self.pid = os.getpid()
+        self.handles = OrderedDict()
+        self.in_use = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        # a worker process must not reuse the handles inherited from its parent
+        max_open_files = ConfigArguments.get_instance().max_open_files
+        if FileHandlePool.__instance is None or FileHandlePool.__instance.pid != os.getpid():
+            FileHandlePool.__instance = FileHandlePool(max_open_files)
+        FileHandlePool.__instance.max_open_files = max_open_files
+        return FileHandlePool.__instance
+
+    @staticmethod
+    def key(reader, filename):
+        return type(reader), reader.dataset_type, reader.thread_index, filename
+
+    def contains(self, reader, filename):
+        with self.lock:
+            return self.key(reader, filename) in self.handles
+
+    def acquire(self, reader, filename, handle=None):
+        """
+            Returns an open handle of filename for reader and pins it until release().
+            handle is a handle of filename opened beforehand (by the prefetcher); it is
+            adopted if the pool has none and closed otherwise.
+        """
+        key = self.key(reader, filename)
+        counters = SharedCounters.get_instance()
+        with self.lock:
+            entry = self.handles.get(key)
+            if entry is not None:
+                self.handles.move_to_end(key)
+                self.handles[key] = (reader, entry[1])
+                self.in_use[key] = self.in_use.get(key, 0) + 1
+        if entry is not None:
+            counters.add("handle_pool_hits")
+            if handle is not None:
+                reader.close_handle(filename, handle)
+            reader.open_file_map[filename] = entry[1]
+            return entry[1]
+        if handle is None:
+            handle = reader.open(filename)
+            counters.add("files_opened")
+        reader.open_file_map[filename] = handle
+        with self.lock:
+            self.handles[key] = (reader, handle)
+            self.in_use[key] = self.in_use.get(key, 0) + 1
+            evicted = self._evict()
+        for evicted_key, (owner, _) in evicted:
+            self._close(owner, evicted_key[-1])
+        return handle
+
+    def release(self, reader, filename):
+        key = self.key(reader, filename)
+        with self.lock:
+            if self.in_use.get(key, 0) > 1:
+                self.in_use[key] -= 1
+            else:
+                self.in_use.pop(key, None)
+            evicted = self._evict()
+        for evicted_key, (owner, _) in evicted:
+            self._close(owner, evicted_key[-1])
+
+    def discard(self, reader, filename):
+        """
+            Closes the handle of filename right away.
+        """
+        key = self.key(reader, filename)
+        with self.lock:
+            entry = self.handles.pop(key, None)
+            self.in_use.pop(key, None)
+        if entry is not None:
+            self._close(entry[0], filename)
+
+    def discard_all(self, reader):
+        with self.lock:
+            keys = [key for key, (owner, _) in self.handles.items() if owner is reader]
+        for key in keys:
+            self.discard(reader, key[-1])
+
+    def _evict(self):
+        evicted = []
+        if self.max_open_files <= 0:
+            return evicted
+        for key in list(self.handles.keys()):
+            if len(self.handles) <= self.max_open_files:
+                break
+            if key not in self.in_use:
+                evicted.append((key, self.handles.pop(key)))
+        return evicted
+
+    def _close(self, reader, filename):
+        reader.close(filename)
+        reader.open_file_map.pop(filename, None)
+        SharedCounters.get_instance().add("files_closed")
+
+
+class FilePrefetcher(object):
+    """
+    Opens the upcoming files of an iterative reader on a background thread and starts reading
+    their data through the byte source (see ByteSource.readahead), so that opening and reading
+    the next files overlaps with the samples of the current one.
+
+    filenames is the order in which the reader moves to a new file. At most depth files
+    are held ahead of the reader, and no more than max_bytes of file data unless
+    that would leave the queue empty (0 means no byte limit).
+    """
+
+    def __init__(self, reader, filenames, depth, max_bytes, file_bytes):
+        self.reader = reader
+        self.filenames = filenames
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self.file_bytes = file_bytes
+        self.ready = deque()
+        self.prefetched_bytes = 0
+        self.stopped = False
+        self.done = False
+        self.error = None
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _has_room(self):
+        if len(self.ready) >= self.depth:
+            return False
+        if self.max_bytes <= 0 or len(self.ready) == 0:
+            return True
+        return self.prefetched_bytes + self.file_bytes <= self.max_bytes
+
+    def _run(self):
+        counters = SharedCounters.get_instance()
+        try:
+            for filename in self.filenames:
+                with self.cond:
+                    while not self.stopped and not self._has_room():
+                        self.cond.wait()
+                    if self.stopped:
+                        return
+                    self.prefetched_bytes += self.file_bytes
+                handle = None
+                if not self.reader.handle_pool.contains(self.reader, filename):
+                    handle = self.reader.open(filename)
+                    counters.add("files_opened")
+                    counters.add("files_prefetched")
+                    counters.add("prefetched_bytes", self.reader.readahead(filename))
+                with self.cond:
+                    self.ready.append((filename, handle))
+                    self.cond.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.cond:
+                self.done = True
+                self.cond.notify_all()
+
+    def take(self, filename):
+        """
+            Returns the prefetched handle of filename, or None if the reader has to open it itself.
+        """
+        with self.cond:
+            while not self.ready and not self.done:
+                self.cond.wait()
+            if not self.ready:
+                if self.error is not None:
+                    raise self.error
+                return None
+            name, handle = self.ready.popleft()
+            self.prefetched_bytes -= self.file_bytes
+            self.cond.notify_all()
+        if name != filename:
+            if handle is not None:
+                self.reader.close_handle(name, handle)
+            return None
+        return handle
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        self.thread.join()
+        while self.ready:
+            name, handle = self.ready.popleft()
+            if handle is not None:
+                self.reader.close_handle(name, handle)
+        self.prefetched_bytes = 0
+
+
 class FormatReader(ABC):
     read_images = None
 
@@ -44,6 +258,21 @@ class FormatReader(ABC):
             f"Loading {self.__class__.__qualname__} reader on thread {self.thread_index} from rank {self._args.my_rank}")
         self.dataset_type = dataset_type
         self.open_file_map = {}
+        self.handle_pool = FileHandlePool.get_instance()
+        # with a bounded pool handles stay open until they are evicted
+        self.keep_open = self._args.max_open_files > 0
+        self.prefetcher = None
+        self.batch_executor = None
+        self.sample_cache = None
+        if self._args.sample_cache_size > 0:
+            # each data loader worker (process or thread) caches the samples it is handed
+            workers = max(self._args.read_threads, 1)
+            if self._args.data_loader == DataLoaderType.ASYNCIO:
+                workers = self._args.async_concurrency
+            self.sample_cache = SampleCacheFactory.get_cache(self._args.sample_cache_policy,
+                                                             self._args.sample_cache_size // workers)
+        # format parsers fetch file contents through the byte source chosen from storage_type
+        self.byte_source = ByteSourceFactory.get_byte_source()
 
         if FormatReader.read_images is None:
             FormatReader.read_images = 0
@@ -52,11 +281,16 @@ class FormatReader(ABC):
         self._file_list = self._args.file_list_train if self.dataset_type is DatasetType.TRAIN else self._args.file_list_eval 
         self.batch_size = self._args.batch_size if self.dataset_type is DatasetType.TRAIN else self._args.batch_size_eval
         if dataset_type is DatasetType.TRAIN:
-            self.global_index_map = self._args.train_global_index_map
             self.file_map = self._args.train_file_map
         else:
             self.file_map = self._args.val_file_map
-            self.global_index_map = self._args.val_global_index_map
+
+    @property
+    def global_index_map(self):
+        # looked up on every use, as readers outlive the epoch whose map reconfigure replaces
+        if self.dataset_type is DatasetType.TRAIN:
+            return self._args.train_global_index_map
+        return self._args.val_global_index_map
 
     @dlp.log
     def preprocess(self, a=None):
@@ -75,6 +309,55 @@ class FormatReader(ABC):
     def get_sample(self, filename, sample_index):
         return
 
+    def readahead(self, filename):
+        """
+            Starts reading the data of filename ahead of its samples; returns the bytes asked for.
+        """
+        return self.byte_source.readahead(filename)
+
+    def close_handle(self, filename, handle):
+        """
+            Closes a handle of filename that is not registered in open_file_map.
+        """
+        current = self.open_file_map.get(filename)
+        self.open_file_map[filename] = handle
+        self.close(filename)
+        if current is None:
+            self.open_file_map.pop(filename, None)
+        else:
+            self.open_file_map[filename] = current
+        SharedCounters.get_instance().add("files_closed")
+
+    def start_prefetch(self, samples):
+        """
+            Starts opening the files of samples ahead of next() if reader.file_prefetch_depth is set.
+        """
+        self.stop_prefetch()
+        if self._args.file_prefetch_depth <= 0:
+            return
+        filenames = []
+        for _, filename, _ in samples:
+            if len(filenames) == 0 or filenames[-1] != filename:
+                filenames.append(filename)
+        file_bytes = self._args.record_length * self._args.num_samples_per_file
+        self.prefetcher = FilePrefetcher(self, filenames, self._args.file_prefetch_depth,
+                                         self._args.file_prefetch_max_bytes, file_bytes).start()
+
+    def stop_prefetch(self):
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+            self.prefetcher = None
+
+    def acquire_file(self, filename, new_file):
+        """
+            Pins filename in the handle pool; when next() moves on to a new file the
+            prefetched handle is handed over to the pool.
+        """
+        handle = None
+        if new_file and self.prefetcher is not None:
+            handle = self.prefetcher.take(filename)
+        return self.handle_pool.acquire(self, filename, handle)
+
     @abstractmethod
     def next(self):
         batch_size = self._args.batch_size if self.dataset_type is DatasetType.TRAIN else self._args.batch_size_eval
@@ -84,28 +367,33 @@ class FormatReader(ABC):
         total_images = len(self.file_map[self.thread_index])
         self.logger.debug(f"{utcnow()} Reading {total_images} images thread {self.thread_index} rank {self._args.my_rank}")
 
-        for global_sample_idx, filename, sample_index in self.file_map[self.thread_index]:
-            self.image_idx = global_sample_idx
-            if filename not in self.open_file_map or self.open_file_map[filename] is None:
-                self.open_file_map[filename] = self.open(filename)
-            self.get_sample(filename, sample_index)
-            self.preprocess()
-            batch.append(self._args.resized_image)
-            image_processed += 1
-            is_last = 0 if image_processed < total_images else 1
-            if is_last:
-                while len(batch) is not self.batch_size:
-                    batch.append(self._args.resized_image)
-            if len(batch) == self.batch_size:
-                self.step += 1
-                batch = np.array(batch)
-                yield batch
-                batch = []
-            if image_processed % self._args.num_samples_per_file == 0:
-                self.close(filename)
-                self.open_file_map[filename] = None
-            if is_last:
-                break
+        self.start_prefetch(self.file_map[self.thread_index])
+        previous_filename = None
+        try:
+            for global_sample_idx, filename, sample_index in self.file_map[self.thread_index]:
+                self.image_idx = global_sample_idx
+                self.acquire_file(filename, filename != previous_filename)
+                previous_filename = filename
+                sample = self.get_sample(filename, sample_index)
+                self.handle_pool.release(self, filename)
+                self.preprocess()
+                batch.append(self.batch_item(sample))
+                image_processed += 1
+                is_last = 0 if image_processed < total_images else 1
+                if is_last:
+                    while len(batch) is not self.batch_size:
+                        batch.append(self.batch_item())
+                if len(batch) == self.batch_size:
+                    self.step += 1
+                    batch = self.make_batch(batch)
+                    yield batch
+                    batch = []
+                if image_processed % self._args.num_samples_per_file == 0 and not self.keep_open:
+                    self.handle_pool.discard(self, filename)
+                if is_last:
+                    break
+        finally:
+            self.stop_prefetch()
 
     @abstractmethod
     def read_index(self, global_sample_idx, step):
@@ -115,21 +403,122 @@ class FormatReader(ABC):
         filename, sample_index = self.global_index_map[global_sample_idx]
         self.logger.debug(f"{utcnow()} read_index {filename}, {sample_index}")
         FormatReader.read_images += 1
-        if self._args.read_type is ReadType.ON_DEMAND or filename not in self.open_file_map or self.open_file_map[filename] is None:
-            self.open_file_map[filename] = self.open(filename)
-        self.get_sample(filename, sample_index)
-        self.preprocess()
-        if self._args.read_type is ReadType.ON_DEMAND:
-            self.close(filename)
-            self.open_file_map[filename] = None
-        return self._args.resized_image
+        if self.sample_cache is not None:
+            cached = self.read_cached(global_sample_idx)
+            if cached is not None:
+                return self.batch_item(None if cached is True else cached)
+        self.handle_pool.acquire(self, filename)
+        sample = self.get_sample(filename, sample_index)
+        self.handle_pool.release(self, filename)
+        processed = self.preprocess(sample)
+        if self._args.read_type is ReadType.ON_DEMAND and not self.keep_open:
+            self.handle_pool.discard(self, filename)
+        if self.sample_cache is not None:
+            self.cache_sample(global_sample_idx, processed if self._args.sample_cache_preprocessed else sample)
+        return self.batch_item(processed)
+
+    def read_batch(self, global_sample_indices, step):
+        """
+            Reads the samples of a whole batch and returns them as one array. Samples are grouped by
+            file so that a handle is acquired once per file and batch; with reader.batch_read_threads
+            above 1 the files of a batch are read concurrently (sequentially when a sample cache is used).
+        """
+        self.step = step
+        groups = OrderedDict()
+        for position, global_sample_idx in enumerate(global_sample_indices):
+            filename, sample_index = self.global_index_map[global_sample_idx]
+            groups.setdefault(filename, []).append((position, global_sample_idx, sample_index))
+        samples = [None] * len(global_sample_indices)
+
+        def read_file(filename, entries):
+            acquired = False
+            try:
+                for position, global_sample_idx, sample_index in entries:
+                    self.image_idx = global_sample_idx
+                    FormatReader.read_images += 1
+                    if self.sample_cache is not None:
+                        cached = self.read_cached(global_sample_idx)
+                        if cached is not None:
+                            samples[position] = self.batch_item(None if cached is True else cached)
+                            continue
+                    if not acquired:
+                        self.handle_pool.acquire(self, filename)
+                        acquired = True
+                    sample = self.get_sample(filename, sample_index)
+                    processed = self.preprocess(sample)
+                    if self.sample_cache is not None:
+                        self.cache_sample(global_sample_idx, processed if self._args.sample_cache_preprocessed else sample)
+                    samples[position] = self.batch_item(processed)
+            finally:
+                if acquired:
+                    self.handle_pool.release(self, filename)
+                    if self._args.read_type is ReadType.ON_DEMAND and not self.keep_open:
+                        self.handle_pool.discard(self, filename)
+
+        pool = self.batch_pool(len(groups))
+        if pool is not None:
+            for future in [pool.submit(read_file, filename, entries) for filename, entries in groups.items()]:
+                future.result()
+        else:
+            for filename, entries in groups.items():
+                read_file(filename, entries)
+        return self.make_batch(samples)
+
+    def batch_pool(self, num_files):
+        """
+            Returns the pool the files of a batch are read in, or None to read them in turn.
+        """
+        threads = self._args.batch_read_threads
+        if threads <= 1 or num_files <= 1 or self.sample_cache is not None:
+            return None
+        if self.batch_executor is None:
+            self.batch_executor = ThreadPoolExecutor(max_workers=threads)
+        return self.batch_executor
+
+    def read_cached(self, global_sample_idx):
+        """
+            Serves a sample from the sample cache; returns None on a miss.
+        """
+        counters = SharedCounters.get_instance()
+        sample = self.sample_cache.get(global_sample_idx)
+        if sample is None:
+            counters.add("sample_cache_misses")
+            return None
+        counters.add("sample_cache_hits")
+        counters.add("sample_cache_bytes_saved", self._args.record_length if sample is True else sample.nbytes)
+        if not self._args.sample_cache_preprocessed:
+            self.preprocess(sample)
+        return sample
+
+    def batch_item(self, sample=None):
+        """
+            What a sample adds to a batch: with reader.return_payload the sample itself as flat bytes,
+            otherwise resized_image. Readers that do not hand back a sample, and padding entries, pass None.
+        """
+        if not self._args.return_payload:
+            return self._args.resized_image
+        return as_payload(self._args.resized_image if sample is None else sample)
+
+    def make_batch(self, batch):
+        if not self._args.return_payload:
+            return np.array(batch)
+        return pad_payloads(batch, self._args.payload_bucket_size)
+
+    def cache_sample(self, global_sample_idx, sample):
+        if sample is None:
+            # readers that do not hand back their samples still let the cache skip the read
+            self.sample_cache.put(global_sample_idx, True, self._args.record_length)
+        else:
+            sample = np.array(sample, copy=True)
+            self.sample_cache.put(global_sample_idx, sample, sample.nbytes)
 
     @abstractmethod
     def finalize(self):
-        for filename, sample_index in self._args.file_map:
-            if filename in self.open_file_map:
-                self.close(filename)
-                self.open_file_map[filename] = None
+        self.stop_prefetch()
+        if self.batch_executor is not None:
+            self.batch_executor.shutdown(wait=True)
+            self.batch_executor = None
+        self.handle_pool.discard_all(self)
 
     @dlp.log
     def resize(self, image):
@@ -140,6 +529,8 @@ class FormatReader(ABC):
         self._args = None
         self.dataset_type = None
         self.open_file_map = None
+        self.handle_pool = None
+        self.byte_source = None
         self.step = None
         self.image_idx = None
         self.batch_size = None
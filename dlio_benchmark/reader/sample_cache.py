@@ -0,0 +1,226 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from dlio_benchmark.common.enumerations import CachePolicy
+from dlio_benchmark.common.error_code import ErrorCodes
+
+
+class SampleCache(ABC):
+    """
+    In-memory cache of samples bounded by a capacity in bytes.
+    get() returns the cached value or None; put() is called after a miss.
+    Entries larger than the capacity are never cached.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.size = 0
+
+    @abstractmethod
+    def get(self, key):
+        pass
+
+    @abstractmethod
+    def put(self, key, value, nbytes):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+class FIFOCache(SampleCache):
+    """
+    Evicts the entry that was inserted first.
+    """
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key, value, nbytes):
+        if nbytes > self.capacity or key in self.entries:
+            return
+        while self.size + nbytes > self.capacity:
+            _, (_, evicted_bytes) = self.entries.popitem(last=False)
+            self.size -= evicted_bytes
+        self.entries[key] = (value, nbytes)
+        self.size += nbytes
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class LRUCache(FIFOCache):
+    """
+    Evicts the least recently used entry.
+    """
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+
+class LFUCache(SampleCache):
+    """
+    Evicts the least frequently used entry; ties are broken by recency.
+    """
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.entries = {}
+        self.buckets = {}
+        self.min_frequency = 0
+
+    def _bump(self, key):
+        value, nbytes, frequency = self.entries[key]
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if len(bucket) == 0:
+            del self.buckets[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = frequency + 1
+        self.entries[key] = (value, nbytes, frequency + 1)
+        self.buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def get(self, key):
+        if key not in self.entries:
+            return None
+        self._bump(key)
+        return self.entries[key][0]
+
+    def put(self, key, value, nbytes):
+        if nbytes > self.capacity or key in self.entries:
+            return
+        while self.size + nbytes > self.capacity:
+            bucket = self.buckets[self.min_frequency]
+            evicted, _ = bucket.popitem(last=False)
+            if len(bucket) == 0:
+                del self.buckets[self.min_frequency]
+                self.min_frequency = min(self.buckets) if self.buckets else 0
+            self.size -= self.entries.pop(evicted)[1]
+        self.entries[key] = (value, nbytes, 1)
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_frequency = 1
+        self.size += nbytes
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ARCCache(SampleCache):
+    """
+    Adaptive Replacement Cache (Megiddo and Modha) with sizes counted in bytes.
+    t1 holds entries seen once recently and t2 entries seen at least twice; the ghost
+    lists b1 and b2 remember what was evicted from them and steer the byte target p of t1.
+    """
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.t1_bytes = 0
+        self.t2_bytes = 0
+        self.b1_bytes = 0
+        self.b2_bytes = 0
+        self.p = 0
+
+    def get(self, key):
+        if key in self.t1:
+            value, nbytes = self.t1.pop(key)
+            self.t1_bytes -= nbytes
+            self.t2[key] = (value, nbytes)
+            self.t2_bytes += nbytes
+            return value
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return self.t2[key][0]
+        return None
+
+    def _replace(self, in_b2):
+        if self.t1 and (self.t1_bytes > self.p or (in_b2 and self.t1_bytes == self.p) or not self.t2):
+            key, (_, nbytes) = self.t1.popitem(last=False)
+            self.t1_bytes -= nbytes
+            self.b1[key] = nbytes
+            self.b1_bytes += nbytes
+        else:
+            key, (_, nbytes) = self.t2.popitem(last=False)
+            self.t2_bytes -= nbytes
+            self.b2[key] = nbytes
+            self.b2_bytes += nbytes
+
+    def _trim_ghosts(self):
+        while self.b1 and self.t1_bytes + self.b1_bytes > self.capacity:
+            self.b1_bytes -= self.b1.popitem(last=False)[1]
+        while self.b2 and self.t1_bytes + self.t2_bytes + self.b1_bytes + self.b2_bytes > 2 * self.capacity:
+            self.b2_bytes -= self.b2.popitem(last=False)[1]
+
+    def put(self, key, value, nbytes):
+        if nbytes > self.capacity or key in self.t1 or key in self.t2:
+            return
+        in_b2 = False
+        if key in self.b1:
+            self.p = min(self.capacity, self.p + max(self.b2_bytes / max(self.b1_bytes, 1), 1) * nbytes)
+            self.b1_bytes -= self.b1.pop(key)
+            target = self.t2
+        elif key in self.b2:
+            self.p = max(0, self.p - max(self.b1_bytes / max(self.b2_bytes, 1), 1) * nbytes)
+            self.b2_bytes -= self.b2.pop(key)
+            target = self.t2
+            in_b2 = True
+        else:
+            target = self.t1
+        while self.t1_bytes + self.t2_bytes + nbytes > self.capacity:
+            self._replace(in_b2)
+        target[key] = (value, nbytes)
+        if target is self.t1:
+            self.t1_bytes += nbytes
+        else:
+            self.t2_bytes += nbytes
+        self._trim_ghosts()
+        self.size = self.t1_bytes + self.t2_bytes
+
+    def __len__(self):
+        return len(self.t1) + len(self.t2)
+
+
+class SampleCacheFactory(object):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get_cache(policy, capacity):
+        if policy == CachePolicy.LRU:
+            return LRUCache(capacity)
+        elif policy == CachePolicy.LFU:
+            return LFUCache(capacity)
+        elif policy == CachePolicy.ARC:
+            return ARCCache(capacity)
+        elif policy == CachePolicy.FIFO:
+            return FIFOCache(capacity)
+        else:
+            raise Exception(str(ErrorCodes.EC1004))
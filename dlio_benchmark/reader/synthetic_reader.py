@@ -57,6 +57,11 @@ class SyntheticReader(FormatReader):
         dlp.update(step=step)
         return self._args.resized_image
 
+    @dlp.log
+    def read_batch(self, global_sample_indices, step):
+        dlp.update(step=step)
+        return self.make_batch([self._args.resized_image] * len(global_sample_indices))
+
     @dlp.log
     def finalize(self):
         return super().finalize()
@@ -0,0 +1,233 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import io
+import tarfile
+
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_DATA_READER
+from dlio_benchmark.common.enumerations import Shuffle
+from dlio_benchmark.reader.reader_handler import FormatReader
+from dlio_benchmark.utils.counters import SharedCounters
+from dlio_benchmark.utils.utility import Profile, utcnow
+
+dlp = Profile(MODULE_DATA_READER)
+
+SAMPLE_SUFFIX = ".bin"
+
+
+class ShardStream(io.RawIOBase):
+    """
+    Forward-only stream over a shard that is not on a local file system.
+    With read_size 0 the whole shard is fetched with a single request, otherwise
+    with consecutive ranged requests of read_size bytes. It never seeks.
+    """
+
+    def __init__(self, byte_source, filename, read_size):
+        super().__init__()
+        self.byte_source = byte_source
+        self.filename = filename
+        self.read_size = read_size
+        self.offset = 0
+        self.buffer = memoryview(b"")
+        self.eof = False
+
+    def readable(self):
+        return True
+
+    def _fill(self):
+        if self.read_size <= 0:
+            data = self.byte_source.read(self.filename)
+            self.eof = True
+        else:
+            data = self.byte_source.read(self.filename, self.offset, self.read_size)
+            self.eof = len(data) < self.read_size
+        self.offset += len(data)
+        self.buffer = memoryview(data).cast("B")
+
+    def readinto(self, b):
+        if len(self.buffer) == 0:
+            if self.eof:
+                return 0
+            self._fill()
+        view = memoryview(b).cast("B")
+        n = min(len(view), len(self.buffer))
+        view[:n] = self.buffer[:n]
+        self.buffer = self.buffer[n:]
+        return n
+
+
+class TarShardIndex(object):
+    """
+    Offsets of the samples of a shard, for random access through read_index.
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.entries = []
+        with tarfile.open(fileobj=fd, mode="r:") as tar:
+            for member in tar.getmembers():
+                if member.name.endswith(SAMPLE_SUFFIX):
+                    self.entries.append((member.offset_data, member.size))
+
+    def read_sample(self, sample_index):
+        offset, size = self.entries[sample_index]
+        self.fd.seek(offset)
+        return np.frombuffer(self.fd.read(size), dtype=np.uint8)
+
+    def close(self):
+        self.fd.close()
+
+
+class TarShardReader(FormatReader):
+    """
+    Reader for WebDataset style tar shards.
+
+    next() streams every shard of the thread from start to end without seeking, reading
+    only <key>.bin members as samples. Shards are shuffled when file_shuffle is set and
+    samples go through a shuffle buffer of shuffle_size when sample_shuffle is set.
+    read_index() indexes the members of a shard once and reads single samples at their offsets.
+    """
+
+    @dlp.log_init
+    def __init__(self, dataset_type, thread_index, epoch):
+        super().__init__(dataset_type, thread_index)
+        self.epoch = epoch
+
+    def _rng(self, shuffle):
+        if shuffle == Shuffle.RANDOM:
+            return np.random.default_rng()
+        seed = self._args.seed + self.epoch if self._args.seed_change_epoch else self._args.seed
+        return np.random.default_rng(seed + self.thread_index + 1)
+
+    @dlp.log
+    def open(self, filename):
+        super().open(filename)
+        return TarShardIndex(self.byte_source.open(filename))
+
+    @dlp.log
+    def close(self, filename):
+        super().close(filename)
+        self.open_file_map[filename].close()
+
+    @dlp.log
+    def get_sample(self, filename, sample_index):
+        super().get_sample(filename, sample_index)
+        image = self.open_file_map[filename].read_sample(sample_index)
+        dlp.update(image_size=image.nbytes)
+        return image
+
+    def _stream(self, filename):
+        if self.byte_source.is_local():
+            return self.byte_source.open(filename)
+        return ShardStream(self.byte_source, filename, self._args.tar_stream_read_size)
+
+    def stream_shard(self, filename, count):
+        """
+        Yields the first count samples of a shard read as one sequential stream.
+        """
+        counters = SharedCounters.get_instance()
+        counters.add("files_opened")
+        fd = self._stream(filename)
+        try:
+            with tarfile.open(fileobj=fd, mode="r|") as tar:
+                for member in tar:
+                    if not member.name.endswith(SAMPLE_SUFFIX):
+                        continue
+                    image = np.frombuffer(tar.extractfile(member).read(), dtype=np.uint8)
+                    dlp.update(image_size=image.nbytes)
+                    yield image
+                    count -= 1
+                    if count == 0:
+                        break
+        finally:
+            fd.close()
+            counters.add("files_closed")
+
+    def shuffled(self, samples):
+        """
+        Passes samples through a shuffle buffer of shuffle_size entries.
+        """
+        if self._args.sample_shuffle == Shuffle.OFF or self._args.shuffle_size <= 1:
+            yield from samples
+            return
+        rng = self._rng(self._args.sample_shuffle)
+        buffer = []
+        for sample in samples:
+            buffer.append(sample)
+            if len(buffer) >= self._args.shuffle_size:
+                i = rng.integers(len(buffer))
+                buffer[i], buffer[-1] = buffer[-1], buffer[i]
+                yield buffer.pop()
+        rng.shuffle(buffer)
+        yield from buffer
+
+    def next(self):
+        samples = self.file_map[self.thread_index]
+        total_images = len(samples)
+        self.logger.debug(f"{utcnow()} Streaming {total_images} images thread {self.thread_index} rank {self._args.my_rank}")
+        shards = {}
+        for _, filename, _ in samples:
+            shards[filename] = shards.get(filename, 0) + 1
+        shard_list = list(shards.items())
+        # file_shuffle may still hold the configured string
+        file_shuffle = Shuffle(self._args.file_shuffle)
+        if file_shuffle != Shuffle.OFF:
+            self._rng(file_shuffle).shuffle(shard_list)
+
+        def stream():
+            for filename, count in shard_list:
+                yield from self.stream_shard(filename, count)
+
+        batch = []
+        image_processed = 0
+        self.step = 1
+        for image in self.shuffled(stream()):
+            self.image_idx = image_processed
+            self.preprocess(image)
+            batch.append(self.batch_item(image))
+            image_processed += 1
+            is_last = 0 if image_processed < total_images else 1
+            if is_last:
+                while len(batch) is not self.batch_size:
+                    batch.append(self.batch_item())
+            if len(batch) == self.batch_size:
+                self.step += 1
+                batch = self.make_batch(batch)
+                yield batch
+                batch = []
+            if is_last:
+                break
+        if len(batch) > 0:
+            # shards held fewer samples than the thread was assigned
+            while len(batch) is not self.batch_size:
+                batch.append(self.batch_item())
+            yield self.make_batch(batch)
+
+    @dlp.log
+    def read_index(self, image_idx, step):
+        return super().read_index(image_idx, step)
+
+    @dlp.log
+    def finalize(self):
+        return super().finalize()
+
+    def is_index_based(self):
+        return True
+
+    def is_iterator_based(self):
+        return True
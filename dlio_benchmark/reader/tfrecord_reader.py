@@ -0,0 +1,124 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import os
+
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_DATA_READER
+from dlio_benchmark.common.enumerations import DatasetType
+from dlio_benchmark.reader.reader_handler import FormatReader
+from dlio_benchmark.utils.tfrecord import example_bytes_feature, parse_index, record_data, scan_records
+from dlio_benchmark.utils.utility import Profile
+
+dlp = Profile(MODULE_DATA_READER)
+
+
+class TFRecordFile(object):
+    """
+    A TFRecord file with the offsets of its records.
+    Records are sliced out of a memory map, or read with one positioned read each.
+    """
+
+    def __init__(self, offsets, sizes, buffer=None, fd=None):
+        self.offsets = offsets
+        self.sizes = sizes
+        self.buffer = buffer
+        self.fd = fd
+
+    def read_record(self, index, verify_crc):
+        offset = int(self.offsets[index])
+        if self.buffer is not None:
+            return record_data(self.buffer, offset, verify_crc)
+        self.fd.seek(offset)
+        return record_data(self.fd.read(int(self.sizes[index])), 0, verify_crc)
+
+    def close(self):
+        if self.buffer is not None and self.buffer._mmap is not None:
+            self.buffer._mmap.close()
+        if self.fd is not None:
+            self.fd.close()
+
+
+class TFRecordReader(FormatReader):
+    """
+    Random access reader for TFRecord files that does not need TensorFlow.
+    Records are located through the tfrecord2idx index written by the generator,
+    so the index based data loaders can read any sample of a file directly.
+    """
+
+    @dlp.log_init
+    def __init__(self, dataset_type, thread_index, epoch):
+        super().__init__(dataset_type, thread_index)
+        self.use_mmap = not self._args.dont_use_mmap
+        self.verify_crc = self._args.tfrecord_verify_crc
+        folder = "train" if dataset_type == DatasetType.TRAIN else "valid"
+        self.index_folder = f"{self._args.data_folder}/index/{folder}"
+
+    def load_index(self, filename, fd):
+        index_file = f"{self.index_folder}/{os.path.basename(filename)}.idx"
+        try:
+            return parse_index(self.byte_source.read(index_file))
+        except Exception:
+            # datasets written without an index are indexed by walking the record headers
+            self.logger.debug(f"No index {index_file} for {filename}; scanning the records")
+            return scan_records(fd)
+
+    @dlp.log
+    def open(self, filename):
+        super().open(filename)
+        fd = self.byte_source.open(filename)
+        offsets, sizes = self.load_index(filename, fd)
+        if self.use_mmap and self.byte_source.is_local():
+            fd.close()
+            buffer = np.memmap(self.byte_source.locate(filename), mode='r', dtype=np.uint8)
+            return TFRecordFile(offsets, sizes, buffer=buffer)
+        return TFRecordFile(offsets, sizes, fd=fd)
+
+    @dlp.log
+    def close(self, filename):
+        super().close(filename)
+        self.open_file_map[filename].close()
+
+    @dlp.log
+    def get_sample(self, filename, sample_index):
+        super().get_sample(filename, sample_index)
+        handle = self.open_file_map[filename]
+        data = handle.read_record(sample_index, self.verify_crc)
+        image = np.frombuffer(example_bytes_feature(data, 'image'), dtype=np.uint8)
+        if handle.buffer is not None:
+            # copying out of the memory map is what faults the record in
+            image = image.copy()
+        dlp.update(image_size=image.nbytes)
+        return image
+
+    def next(self):
+        for batch in super().next():
+            yield batch
+
+    @dlp.log
+    def read_index(self, image_idx, step):
+        return super().read_index(image_idx, step)
+
+    @dlp.log
+    def finalize(self):
+        return super().finalize()
+
+    def is_index_based(self):
+        return True
+
+    def is_iterator_based(self):
+        return True
@@ -0,0 +1,281 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from abc import ABC, abstractmethod
+import mmap
+import os
+
+import numpy as np
+
+from dlio_benchmark.common.constants import MODULE_STORAGE
+from dlio_benchmark.common.enumerations import ByteSourceType, StorageType
+from dlio_benchmark.common.error_code import ErrorCodes
+from dlio_benchmark.storage.storage_factory import StorageFactory
+from dlio_benchmark.utils.config import ConfigArguments
+from dlio_benchmark.utils.utility import Profile
+
+dlp = Profile(MODULE_STORAGE)
+
+
+class ByteSource(ABC):
+    """
+    Where the format readers get the bytes of a dataset file from.
+    Format parsers only ever see what locate(), open() and read() return, so the
+    same reader runs unchanged against a file system mount or object storage.
+    """
+
+    def __init__(self):
+        self._args = ConfigArguments.get_instance()
+
+    @abstractmethod
+    def locate(self, filename):
+        """
+            Returns what format parsers (h5py, PIL, np.load, pandas) should be given:
+            a local path when the data is on a file system, a seekable file object otherwise.
+        """
+        pass
+
+    @abstractmethod
+    def open(self, filename):
+        """
+            Returns a seekable binary file object supporting read/readinto/seek/tell.
+        """
+        pass
+
+    @abstractmethod
+    def read(self, filename, offset=0, length=None):
+        """
+            Returns length bytes of filename starting at offset (the rest of the file if length is None).
+        """
+        pass
+
+    @abstractmethod
+    def size(self, filename):
+        pass
+
+    def release(self, filename):
+        """
+            Drops any per file state kept by the byte source.
+        """
+        pass
+
+    def readahead(self, filename):
+        """
+            Starts moving the data of filename towards the reader before it is read, and returns
+            the number of bytes asked for (0 when the byte source cannot read ahead).
+        """
+        return 0
+
+    def is_local(self):
+        return True
+
+
+class PosixByteSource(ByteSource):
+    """
+    Regular file I/O on a mounted (local or parallel) file system.
+    """
+
+    def locate(self, filename):
+        return filename
+
+    def open(self, filename):
+        return open(filename, "rb")
+
+    @dlp.log
+    def read(self, filename, offset=0, length=None):
+        with open(filename, "rb") as fd:
+            if length is None:
+                length = os.fstat(fd.fileno()).st_size - offset
+            return os.pread(fd.fileno(), length, offset)
+
+    def size(self, filename):
+        return os.path.getsize(filename)
+
+    @dlp.log
+    def readahead(self, filename):
+        # the kernel reads the file into the page cache in the background
+        with open(filename, "rb") as fd:
+            size = os.fstat(fd.fileno()).st_size
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                while fd.read(4 * 1024 * 1024):
+                    pass
+        dlp.update(image_size=size)
+        return size
+
+
+class MMapByteSource(PosixByteSource):
+    """
+    Memory-mapped local files; ranged reads are zero-copy views of the mapping.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.buffer_map = {}
+
+    def _buffer(self, filename):
+        if filename not in self.buffer_map:
+            self.buffer_map[filename] = np.memmap(filename, mode='r', dtype=np.uint8, order='C')
+        return self.buffer_map[filename]
+
+    @dlp.log
+    def read(self, filename, offset=0, length=None):
+        buffer = self._buffer(filename)
+        end = len(buffer) if length is None else offset + length
+        return buffer[offset:end]
+
+    @dlp.log
+    def readahead(self, filename):
+        buffer = self._buffer(filename)
+        if hasattr(mmap, "MADV_WILLNEED") and buffer._mmap is not None:
+            buffer._mmap.madvise(mmap.MADV_WILLNEED)
+        else:
+            return super().readahead(filename)
+        dlp.update(image_size=len(buffer))
+        return len(buffer)
+
+    def release(self, filename):
+        buffer = self.buffer_map.pop(filename, None)
+        if buffer is not None and buffer._mmap is not None:
+            buffer._mmap.close()
+
+
+class S3ByteSource(ByteSource):
+    """
+    Ranged reads of objects through the S3 storage backend.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.storage = StorageFactory().get_storage(StorageType.S3, self._args.storage_root, self._args.framework)
+        self.base_folder = self._args.data_folder.rstrip('/')
+        # object sizes by key; the dataset does not change during a run
+        self.sizes = {}
+
+    def key(self, filename):
+        """
+            Maps a file list entry to the object key under the storage root.
+            Entries may be full s3:// URIs, keys, or URIs mangled by os.path.abspath.
+        """
+        parts = filename.rsplit(self.base_folder + '/', 1)
+        if len(parts) == 2:
+            return f"{self.base_folder}/{parts[1]}"
+        if filename.startswith(self.storage.root):
+            return filename[len(self.storage.root):]
+        return filename
+
+    def locate(self, filename):
+        return self.open(filename)
+
+    def open(self, filename):
+        key = self.key(filename)
+        return self.storage.open(key, size=self.sizes.get(key))
+
+    @dlp.log
+    def read(self, filename, offset=0, length=None):
+        return self.storage.read(self.key(filename), offset, length)
+
+    def size(self, filename):
+        key = self.key(filename)
+        if key not in self.sizes:
+            size = self.storage.get_size(key)
+            if size is None:
+                # without a metadata call the object has to be fetched to learn its length
+                size = self.storage.open(key).size()
+            self.sizes[key] = size
+        return self.sizes[key]
+
+    def is_local(self):
+        return False
+
+
+class CachedByteSource(ByteSource):
+    """
+    Read-through cache tier: the first access copies the file from the backing
+    byte source into cache_folder and every later access is served locally.
+    """
+
+    def __init__(self, backing):
+        super().__init__()
+        self.backing = backing
+        self.cache_folder = self._args.cache_folder
+        self.local = PosixByteSource()
+
+    def cache_path(self, filename):
+        if isinstance(self.backing, S3ByteSource):
+            relative = self.backing.key(filename)
+        else:
+            relative = os.path.abspath(filename).lstrip(os.sep)
+        return os.path.join(self.cache_folder, relative)
+
+    @dlp.log
+    def fetch(self, filename):
+        path = self.cache_path(filename)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = self.backing.read(filename)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fd:
+                fd.write(data)
+            # several readers may race to fill the same entry; rename is atomic
+            os.replace(tmp_path, path)
+            dlp.update(image_size=len(data))
+        return path
+
+    def locate(self, filename):
+        return self.fetch(filename)
+
+    def open(self, filename):
+        return self.local.open(self.fetch(filename))
+
+    def read(self, filename, offset=0, length=None):
+        return self.local.read(self.fetch(filename), offset, length)
+
+    def size(self, filename):
+        return self.local.size(self.fetch(filename))
+
+    def readahead(self, filename):
+        # copying the file into the cache tier is the read ahead
+        return self.local.size(self.fetch(filename))
+
+
+class ByteSourceFactory(object):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get_byte_source(byte_source_type=None, storage_type=None):
+        _args = ConfigArguments.get_instance()
+        if byte_source_type is None:
+            byte_source_type = _args.byte_source
+        if storage_type is None:
+            storage_type = _args.storage_type
+        if byte_source_type == ByteSourceType.AUTO:
+            if storage_type == StorageType.S3:
+                byte_source_type = ByteSourceType.S3
+            else:
+                byte_source_type = ByteSourceType.POSIX
+        if byte_source_type == ByteSourceType.POSIX:
+            return PosixByteSource()
+        elif byte_source_type == ByteSourceType.MMAP:
+            return MMapByteSource()
+        elif byte_source_type == ByteSourceType.S3:
+            return S3ByteSource()
+        elif byte_source_type == ByteSourceType.CACHED:
+            return CachedByteSource(ByteSourceFactory.get_byte_source(ByteSourceType.AUTO, storage_type))
+        else:
+            raise Exception(str(ErrorCodes.EC1004))
@@ -0,0 +1,187 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import io
+from collections import OrderedDict
+
+from dlio_benchmark.common.constants import MODULE_STORAGE
+from dlio_benchmark.utils.utility import Profile
+
+dlp = Profile(MODULE_STORAGE)
+
+
+class S3File(io.RawIOBase):
+    """
+    Read-only, seekable file object backed by ranged reads of a single object.
+
+    Reads are served from a per-object block cache. On a miss, a run of blocks
+    is fetched with one ranged read. The length of that run (the readahead
+    window) doubles on every miss that continues the previous read and falls
+    back to a single block on a miss after a random seek; hits leave it as is. h5py, PIL and np.load can consume the
+    object directly.
+    """
+
+    def __init__(self, storage, path, size=None, block_size=4 * 1024 * 1024,
+                 max_readahead=64 * 1024 * 1024, cache_size=256 * 1024 * 1024):
+        super().__init__()
+        self.storage = storage
+        self.path = path
+        self.block_size = max(int(block_size), 1)
+        self.max_readahead_blocks = max(int(max_readahead) // self.block_size, 1)
+        self.max_cached_blocks = max(int(cache_size) // self.block_size, self.max_readahead_blocks)
+        self._size = size
+        self._pos = 0
+        self._last_end = None
+        self._readahead_blocks = 1
+        self._blocks = OrderedDict()
+        self.requests = 0
+        self.bytes_fetched = 0
+        self.bytes_read = 0
+
+    # ---- io.RawIOBase interface ---------------------------------------------
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def writable(self):
+        return False
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size() + offset
+        else:
+            raise ValueError(f"invalid whence ({whence}, should be 0, 1 or 2)")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return self._pos
+
+    def readinto(self, b):
+        view = memoryview(b).cast("B")
+        wanted = len(view)
+        if wanted == 0:
+            return 0
+        sequential = self._last_end is not None and self._pos == self._last_end
+        copied = 0
+        while copied < wanted:
+            block_index, block_offset = divmod(self._pos, self.block_size)
+            block = self._get_block(block_index, sequential)
+            # the following blocks of this read continue it
+            sequential = True
+            available = len(block) - block_offset
+            if available <= 0:
+                break
+            n = min(available, wanted - copied)
+            view[copied:copied + n] = block[block_offset:block_offset + n]
+            copied += n
+            self._pos += n
+            if len(block) < self.block_size:
+                # a short block is the last block of the object
+                break
+        self._last_end = self._pos
+        self.bytes_read += copied
+        return copied
+
+    def readall(self):
+        remaining = self.size() - self._pos
+        if remaining <= 0:
+            return b""
+        buffer = bytearray(remaining)
+        n = self.readinto(buffer)
+        return bytes(buffer[:n])
+
+    def close(self):
+        self._blocks.clear()
+        super().close()
+
+    # ---- helpers ------------------------------------------------------------
+
+    def size(self):
+        if self._size is None:
+            self._size = self.storage.get_size(self.path)
+        if self._size is None:
+            # no metadata call available: fetch the whole object once and keep
+            # it in the block cache so the bytes are not transferred twice
+            self._fetch_all()
+        return self._size
+
+    def _update_readahead(self, sequential):
+        if sequential:
+            self._readahead_blocks = min(self._readahead_blocks * 2, self.max_readahead_blocks)
+        else:
+            self._readahead_blocks = 1
+
+    def _get_block(self, block_index, sequential):
+        block = self._blocks.get(block_index)
+        if block is not None:
+            self._blocks.move_to_end(block_index)
+            return block
+        self._update_readahead(sequential)
+        self._fetch(block_index)
+        return self._blocks.get(block_index, b"")
+
+    @dlp.log
+    def _fetch_all(self):
+        data = memoryview(self.storage.read(self.path))
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        dlp.update(image_size=len(data))
+        self._size = len(data)
+        self._insert(0, data, (len(data) + self.block_size - 1) // self.block_size)
+
+    @dlp.log
+    def _fetch(self, block_index):
+        """
+        Fetch a run of missing blocks starting at block_index with one ranged read.
+        The run stops at the readahead window, at the first cached block or at
+        the end of the object, whichever comes first.
+        """
+        num_blocks = 1
+        while num_blocks < self._readahead_blocks and (block_index + num_blocks) not in self._blocks:
+            num_blocks += 1
+        offset = block_index * self.block_size
+        length = num_blocks * self.block_size
+        if self._size is not None:
+            if offset >= self._size:
+                return
+            length = min(length, self._size - offset)
+        data = memoryview(self.storage.read(self.path, offset, length))
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        dlp.update(image_size=len(data))
+        if len(data) < length and self._size is None:
+            self._size = offset + len(data)
+        self._insert(block_index, data, num_blocks)
+
+    def _insert(self, block_index, data, num_blocks):
+        for i in range(num_blocks):
+            block = data[i * self.block_size:(i + 1) * self.block_size]
+            if len(block) == 0:
+                break
+            self._blocks[block_index + i] = block
+            self._blocks.move_to_end(block_index + i)
+        while len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
@@ -14,6 +14,7 @@ from dlio_benchmark.common.constants    import MODULE_STORAGE
 from dlio_benchmark.common.enumerations import NamespaceType, MetadataType, StorageType
 from dlio_benchmark.common.error_code   import ErrorCodes
 from dlio_benchmark.storage.storage_handler import DataStorage, Namespace
+from dlio_benchmark.storage.s3_file         import S3File
 from dlio_benchmark.utils.utility       import Profile
 
 import os
@@ -85,6 +86,25 @@ class S3Storage(DataStorage):
         else:
             return bytes(s3.read_tensor_py(self._uri(path), offset, length))
 
+    @dlp.log
+    def open(self, path: str, size=None) -> S3File:
+        """
+        Return a seekable, read-only file object over the object at path.
+        """
+        return S3File(self, path, size=size,
+                      block_size=self._args.s3_block_size,
+                      max_readahead=self._args.s3_max_readahead,
+                      cache_size=self._args.s3_cache_size)
+
+    @dlp.log
+    def get_size(self, path: str):
+        # use the binding's metadata call when it has one; None tells the
+        # caller the object has to be fetched to learn its length
+        if hasattr(s3, "stat"):
+            stat = s3.stat(self._uri(path))
+            return int(stat["size"] if isinstance(stat, dict) else stat)
+        return None
+
     @dlp.log
     def listdir(self, path: str):
         return s3.list(self._uri(path))
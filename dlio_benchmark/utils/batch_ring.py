@@ -0,0 +1,111 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from dlio_benchmark.utils.sample_map import SHARED_FOLDER
+
+"""
+Shared memory batch slots between data loader workers and the main process.
+
+A worker writes a batch into a slot of a memory-mapped file (in /dev/shm when available) and
+passes a BatchSlot, i.e. the slot number, shape, dtype and size, to the main process, which maps the slot
+instead of unpickling a copy of the batch.
+"""
+
+# slots start at page boundaries
+SLOT_ALIGNMENT = 4096
+
+
+class BatchSlot(object):
+    """
+    Location of a batch in a BatchRing.
+    """
+
+    def __init__(self, slot, shape, dtype, nbytes):
+        self.slot = slot
+        self.shape = shape
+        self.dtype = dtype
+        self.nbytes = nbytes
+
+    def __repr__(self):
+        return f"BatchSlot({self.slot}, {self.shape}, {self.dtype}, {self.nbytes} bytes)"
+
+
+class BatchRing(object):
+    """
+    num_slots slots of slot_size bytes. The batch with sequence number s goes to slot s % num_slots,
+    so no slot bookkeeping crosses processes: as long as fewer than num_slots batches are in flight or
+    held by the training loop, a slot is only written again once its previous batch has been consumed.
+    Pickling only carries the path of the file. The file is removed when the ring is garbage collected
+    in the process that created it.
+    """
+
+    def __init__(self, num_slots, slot_size):
+        self.num_slots = num_slots
+        self.slot_size = max(1, -(-slot_size // SLOT_ALIGNMENT)) * SLOT_ALIGNMENT
+        folder = SHARED_FOLDER if os.path.isdir(SHARED_FOLDER) else None
+        fd, self.path = tempfile.mkstemp(prefix="dlio_batch_ring_", suffix=".bin", dir=folder)
+        try:
+            os.ftruncate(fd, self.num_slots * self.slot_size)
+        finally:
+            os.close(fd)
+        self.owner = os.getpid()
+        self._map()
+
+    def _map(self):
+        # a plain array over the mapping, so that slots can be handed to torch.from_numpy
+        self.buffer = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(self.num_slots * self.slot_size,)).view(np.ndarray)
+
+    def _view(self, slot, shape, dtype, nbytes):
+        start = slot * self.slot_size
+        return self.buffer[start:start + nbytes].view(dtype).reshape(shape)
+
+    def put(self, sequence, batch):
+        """
+        Copies batch into the slot of sequence and returns its BatchSlot, or None when the batch is
+        larger than a slot and has to travel the usual way.
+        """
+        batch = np.ascontiguousarray(batch)
+        if batch.nbytes > self.slot_size:
+            return None
+        slot = BatchSlot(sequence % self.num_slots, batch.shape, batch.dtype.str, batch.nbytes)
+        self._view(slot.slot, slot.shape, slot.dtype, slot.nbytes)[...] = batch
+        return slot
+
+    def get(self, slot):
+        """
+        The batch in slot, without copying it. It stays valid until num_slots more batches have been put.
+        """
+        return self._view(slot.slot, slot.shape, slot.dtype, slot.nbytes)
+
+    def __getstate__(self):
+        return {"path": self.path, "num_slots": self.num_slots, "slot_size": self.slot_size}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.owner = None
+        self._map()
+
+    def __del__(self):
+        if getattr(self, "owner", None) == os.getpid():
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
@@ -25,9 +25,12 @@ from time import time
 from typing import Any, Dict, List, ClassVar
 
 from dlio_benchmark.common.constants import MODULE_CONFIG
-from dlio_benchmark.common.enumerations import StorageType, FormatType, Shuffle, ReadType, FileAccess, Compression, \
+from dlio_benchmark.common.enumerations import StorageType, ByteSourceType, CachePolicy, FormatType, Shuffle, ReadType, FileAccess, Compression, \
     FrameworkType, \
     DataLoaderType, Profiler, DatasetType, DataLoaderSampler, CheckpointLocationType, CheckpointMechanismType, CheckpointModeType
+from dlio_benchmark.utils.sample_codec import SAMPLE_CODECS
+from dlio_benchmark.utils.permutation import FeistelPermutation
+from dlio_benchmark.utils.sample_map import GlobalIndexMap, ThreadFileMap, PermutedIndexMap, PermutedFileMap, visit_order
 from dlio_benchmark.utils.utility import DLIOMPI, get_trace_name, utcnow
 from dlio_benchmark.utils.utility import Profile, PerfTrace, DFTRACER_ENABLE, DLIOLogger, OUTPUT_LEVEL
 from dataclasses import dataclass
@@ -51,11 +54,17 @@ class ConfigArguments:
     file_shuffle: Shuffle = Shuffle.OFF
     shuffle_size: int = 1024
     sample_shuffle: Shuffle = Shuffle.OFF
+    sample_shuffle_window: int = 0
     read_type: ReadType = ReadType.ON_DEMAND
     file_access: FileAccess = FileAccess.MULTI
     # Set root as the current directory by default
     storage_root: str = "./"
     storage_type: StorageType = StorageType.LOCAL_FS
+    s3_block_size: int = 4 * 1024 * 1024
+    s3_max_readahead: int = 64 * 1024 * 1024
+    s3_cache_size: int = 256 * 1024 * 1024
+    byte_source: ByteSourceType = ByteSourceType.AUTO
+    cache_folder: str = None
     record_length: int = 64 * 1024
     record_length_stdev: int = 0
     record_length_resize: int = 0
@@ -84,16 +93,53 @@ class ConfigArguments:
     epochs_between_checkpoints: int = 1
     steps_between_checkpoints: int = -1
     transfer_size: int = None
+    max_open_files: int = 0
+    file_prefetch_depth: int = 0
+    file_prefetch_max_bytes: int = 256 * 1024 * 1024
+    sample_cache_size: int = 0
+    sample_cache_policy: CachePolicy = CachePolicy.LRU
+    sample_cache_preprocessed: bool = False
     read_threads: int = 1
     dont_use_mmap: bool = False
+    tfrecord_verify_crc: bool = False
     computation_threads: int = 1
     computation_time: ClassVar[Dict[str, Any]] = {}
     preprocess_time: ClassVar[Dict[str, Any]] = {}
     prefetch_size: int = 2
     enable_chunking: bool = False
     chunk_size: int = 0
+    hdf5_page_size: int = 1024 * 1024
+    hdf5_rdcc_nbytes: int = 64 * 1024 * 1024
+    hdf5_rdcc_nslots: int = 10007
+    hdf5_rdcc_w0: float = 0.75
+    hdf5_page_buffer_size: int = 16 * 1024 * 1024
+    parquet_row_group_size: int = 1024
+    parquet_num_columns: int = 1
+    parquet_compression: str = "snappy"
+    parquet_columns: ClassVar[List[str]] = []
+    parquet_row_group_concurrency: int = 4
+    tar_stream_read_size: int = 0
+    array_chunk_shape: ClassVar[List[int]] = [1, 64, 64]
+    chunk_fetch_threads: int = 8
     compression: Compression = Compression.NONE
     compression_level: int = 4
+    compression_block_size: int = 1048576
+    compressible_fraction: float = 0.5
+    decompression_threads: int = 4
+    image_decode: bool = False
+    image_decode_threads: int = 4
+    image_jpeg_draft: bool = True
+    return_payload: bool = False
+    payload_bucket_size: int = 0
+    sample_permutation: bool = False
+    batch_read_threads: int = 1
+    batch_ring: bool = False
+    in_order: bool = True
+    reorder_window: int = 0
+    prefetch_memory_budget: int = 0
+    node_prefetch_memory_budget: int = 0
+    async_concurrency: int = 64
+    batch_ring_slot_size: int = 0
     total_training_steps: int = -1
     do_eval: bool = False
     batch_size_eval: int = 1
@@ -249,8 +295,6 @@ class ConfigArguments:
         if (self.do_profiling == True) and (self.profiler == Profiler('darshan')):
             if ('LD_PRELOAD' not in os.environ or os.environ["LD_PRELOAD"].find("libdarshan") == -1):
                 raise Exception("Please set darshan runtime library in LD_PRELOAD")
-        if self.format is FormatType.TFRECORD and (self.data_loader is DataLoaderType.PYTORCH):
-            raise Exception(f"{self.framework} support for tfrecord is not implemented for {self.data_loader}.")
         if (self.framework == FrameworkType.TENSORFLOW and self.data_loader == DataLoaderType.PYTORCH) or (
                 self.framework == FrameworkType.PYTORCH and self.data_loader == DataLoaderType.TENSORFLOW):
             raise Exception("Imcompatible between framework and data_loader setup.")
@@ -289,6 +333,81 @@ class ConfigArguments:
         if self.checkpoint_mode == CheckpointModeType.DEFAULT:
             if self.comm_size % (self.pipeline_parallelism * self.tensor_parallelism) != 0:
                 raise Exception(f"Number of processes {self.comm_size} is not a multiple of model parallelism size: {self.pipeline_parallelism * self.tensor_parallelism}")
+        if self.byte_source == ByteSourceType.CACHED and self.cache_folder is None:
+            raise Exception("storage.cache_folder needs to be set for the cached byte source.")
+        if self.byte_source in [ByteSourceType.POSIX, ByteSourceType.MMAP] and self.storage_type == StorageType.S3:
+            raise Exception(f"storage.byte_source {self.byte_source} cannot read from {self.storage_type} storage.")
+        if self.byte_source == ByteSourceType.S3 and self.storage_type != StorageType.S3:
+            raise Exception(f"storage.byte_source {self.byte_source} requires storage.storage_type {StorageType.S3}.")
+        if self.s3_block_size <= 0:
+            raise Exception(f"storage.s3_block_size should be positive but {self.s3_block_size} was given.")
+        if self.s3_max_readahead < self.s3_block_size:
+            raise Exception(f"storage.s3_max_readahead ({self.s3_max_readahead}) should not be smaller than storage.s3_block_size ({self.s3_block_size}).")
+        if self.max_open_files < 0:
+            raise Exception(f"reader.max_open_files should be non-negative but {self.max_open_files} was given.")
+        if self.file_prefetch_depth < 0 or self.file_prefetch_max_bytes < 0:
+            raise Exception(f"reader.file_prefetch_depth ({self.file_prefetch_depth}) and reader.file_prefetch_max_bytes ({self.file_prefetch_max_bytes}) should be non-negative.")
+        if self.sample_cache_size < 0:
+            raise Exception(f"reader.sample_cache_size should be non-negative but {self.sample_cache_size} was given.")
+        if self.format == FormatType.HDF5_OPT:
+            if not 0.0 <= self.hdf5_rdcc_w0 <= 1.0:
+                raise Exception(f"reader.hdf5_rdcc_w0 should be within [0, 1] but {self.hdf5_rdcc_w0} was given.")
+            if 0 < self.hdf5_page_buffer_size < self.hdf5_page_size:
+                raise Exception(f"reader.hdf5_page_buffer_size ({self.hdf5_page_buffer_size}) should not be smaller than dataset.hdf5_page_size ({self.hdf5_page_size}).")
+        if self.tar_stream_read_size < 0:
+            raise Exception(f"reader.tar_stream_read_size should be non-negative but {self.tar_stream_read_size} was given.")
+        if self.format == FormatType.CHUNKED_ARRAY:
+            if len(self.array_chunk_shape) != 3 or min(self.array_chunk_shape) <= 0:
+                raise Exception(f"dataset.array_chunk_shape should be three positive sizes (samples, rows, columns) but {self.array_chunk_shape} was given.")
+            if self.chunk_fetch_threads <= 0:
+                raise Exception(f"reader.chunk_fetch_threads should be positive but {self.chunk_fetch_threads} was given.")
+        if Compression(self.compression) in SAMPLE_CODECS:
+            if self.format not in [FormatType.INDEXED_BINARY, FormatType.MMAP_INDEXED_BINARY]:
+                raise Exception(f"dataset.compression {self.compression} is only supported by the indexed_binary and mmap_indexed_binary formats.")
+            if self.compression_block_size <= 0:
+                raise Exception(f"dataset.compression_block_size should be positive but {self.compression_block_size} was given.")
+            if not 0.0 <= self.compressible_fraction <= 1.0:
+                raise Exception(f"dataset.compressible_fraction should be within [0, 1] but {self.compressible_fraction} was given.")
+            if self.decompression_threads <= 0:
+                raise Exception(f"reader.decompression_threads should be positive but {self.decompression_threads} was given.")
+        if self.image_decode and self.image_decode_threads <= 0:
+            raise Exception(f"reader.image_decode_threads should be positive but {self.image_decode_threads} was given.")
+        if self.sample_shuffle_window < 0:
+            raise Exception(f"reader.sample_shuffle_window should be non-negative but {self.sample_shuffle_window} was given.")
+        if self.batch_read_threads <= 0:
+            raise Exception(f"reader.batch_read_threads should be positive but {self.batch_read_threads} was given.")
+        if self.batch_ring_slot_size < 0:
+            raise Exception(f"reader.batch_ring_slot_size should be non-negative but {self.batch_ring_slot_size} was given.")
+        if self.batch_ring and DataLoaderType(self.data_loader) != DataLoaderType.PYTORCH:
+            raise Exception("reader.batch_ring is only supported by the pytorch data loader.")
+        if self.payload_bucket_size < 0:
+            raise Exception(f"reader.payload_bucket_size should be non-negative but {self.payload_bucket_size} was given.")
+        if self.return_payload and DataLoaderType(self.data_loader) not in [DataLoaderType.PYTORCH, DataLoaderType.TENSORFLOW, DataLoaderType.THREADED, DataLoaderType.ASYNCIO]:
+            raise Exception("reader.return_payload is only supported by the pytorch, tensorflow, threaded and asyncio data loaders.")
+        if self.reorder_window < 0:
+            raise Exception(f"reader.reorder_window should be non-negative but {self.reorder_window} was given.")
+        if self.batch_ring and not self.in_order:
+            raise Exception("reader.batch_ring requires reader.in_order, as ring slots are reused in batch order.")
+        if self.prefetch_memory_budget < 0:
+            raise Exception(f"reader.prefetch_memory_budget should be non-negative but {self.prefetch_memory_budget} was given.")
+        if self.node_prefetch_memory_budget < 0:
+            raise Exception(f"reader.node_prefetch_memory_budget should be non-negative but {self.node_prefetch_memory_budget} was given.")
+        if self.prefetch_memory_budget > 0 and self.node_prefetch_memory_budget > 0:
+            raise Exception("reader.prefetch_memory_budget and reader.node_prefetch_memory_budget cannot be set together.")
+        if (self.prefetch_memory_budget > 0 or self.node_prefetch_memory_budget > 0) and \
+                DataLoaderType(self.data_loader) not in [DataLoaderType.PYTORCH, DataLoaderType.THREADED, DataLoaderType.ASYNCIO]:
+            raise Exception("A prefetch memory budget is only supported by the pytorch, threaded and asyncio data loaders.")
+        if self.async_concurrency <= 0:
+            raise Exception(f"reader.async_concurrency should be positive but {self.async_concurrency} was given.")
+        if self.return_payload and self.format == FormatType.TFRECORD and DataLoaderType(self.data_loader) == DataLoaderType.TENSORFLOW:
+            raise Exception("reader.return_payload is not supported for tfrecord read through tf.data; use the pytorch data loader.")
+        if self.format == FormatType.PARQUET:
+            if self.parquet_row_group_size <= 0 or self.parquet_num_columns <= 0:
+                raise Exception(f"dataset.parquet_row_group_size ({self.parquet_row_group_size}) and dataset.parquet_num_columns ({self.parquet_num_columns}) should be positive.")
+            if self.parquet_compression not in ["none", "snappy", "gzip", "brotli", "lz4", "zstd"]:
+                raise Exception(f"dataset.parquet_compression {self.parquet_compression} is not supported; use one of none, snappy, gzip, brotli, lz4 or zstd.")
+            if self.parquet_row_group_concurrency <= 0:
+                raise Exception(f"reader.parquet_row_group_concurrency should be positive but {self.parquet_row_group_concurrency} was given.")
         if self.num_checkpoints_write > 0:
             if self.num_checkpoints_read > self.num_checkpoints_write:
                 raise Exception(f"Number of checkpoints to read {self.num_checkpoints_read} cannot be larger than number of checkpoints to write {self.num_checkpoints_write}")
@@ -327,7 +446,7 @@ class ConfigArguments:
         if self.data_loader_sampler is None and self.data_loader_classname is None:
             if self.data_loader == DataLoaderType.TENSORFLOW:
                 self.data_loader_sampler = DataLoaderSampler.ITERATIVE
-            elif self.data_loader in [DataLoaderType.PYTORCH, DataLoaderType.DALI]:
+            elif self.data_loader in [DataLoaderType.PYTORCH, DataLoaderType.DALI, DataLoaderType.THREADED, DataLoaderType.ASYNCIO]:
                 self.data_loader_sampler = DataLoaderSampler.INDEX
         if self.data_loader_classname is not None:
             from dlio_benchmark.data_loader.base_data_loader import BaseDataLoader
@@ -373,76 +492,147 @@ class ConfigArguments:
 
     @dlp.log
     def build_sample_map_iter(self, file_list, total_samples, epoch_number):
+        """
+        Splits the samples of this rank over its reader threads. The map is built with array
+        operations: sample k of the (shuffled) sample list goes to thread (k // samples_per_thread) % threads
+        and is read from file (k // num_samples_per_file) % files.
+        """
         self.logger.debug(f"ranks {self.comm_size} threads {self.read_threads} tensors")
         
         num_files = len(file_list)
         samples_sum = 0
-        process_thread_file_map = {}
-        if num_files > 0:
-            num_threads = 1
-            if self.read_threads > 0 and self.data_loader is not DataLoaderType.DALI:
-                num_threads = self.read_threads
-            samples_per_proc = int(math.ceil(total_samples/self.comm_size)) 
-            self.samples_per_thread = samples_per_proc // num_threads
-            start_sample_index = samples_per_proc * self.my_rank
-            end_sample_index = samples_per_proc * (self.my_rank + 1) - 1
-            if end_sample_index > total_samples - 1:
-                end_sample_index = total_samples - 1
-            sample_list = np.arange(start_sample_index, end_sample_index + 1)
-            self.logger.debug(f"{self.my_rank} {start_sample_index} {end_sample_index}")
-            if self.sample_shuffle is not Shuffle.OFF:
-                if self.seed_change_epoch:
-                    np.random.seed(self.seed + epoch_number)
-                else:
-                    np.random.seed(self.seed)
-                np.random.shuffle(sample_list)
-            sample_index = 0
-            if num_files > 0:
-                files_per_rank = (num_files // self.comm_size) % num_files
-                file_index = self.my_rank * files_per_rank
-                for thread_index in range(num_threads):
-                    process_thread_file_map[thread_index] = []
-                for sample in sample_list:
-                    samples_sum += sample
-                    thread_index = (sample_index // self.samples_per_thread) % num_threads
-                    abs_path = os.path.abspath(file_list[file_index])
-                    process_thread_file_map[thread_index].append((sample,
-                                                abs_path,
-                                                sample_list[sample_index] % self.num_samples_per_file))
-                    sample_index += 1
-                    file_index = (sample_index // self.num_samples_per_file) % num_files
-        return process_thread_file_map, samples_sum
+        num_threads = 1
+        if self.read_threads > 0 and self.data_loader is not DataLoaderType.DALI:
+            num_threads = self.read_threads
+        if num_files == 0:
+            empty = np.empty(0, dtype=np.int32)
+            return ThreadFileMap(empty.astype(np.int64), empty, empty, np.zeros(num_threads + 1, dtype=np.int64), []), samples_sum
+        samples_per_proc = int(math.ceil(total_samples/self.comm_size)) 
+        self.samples_per_thread = self.thread_share(samples_per_proc, num_threads)
+        start_sample_index = samples_per_proc * self.my_rank
+        end_sample_index = samples_per_proc * (self.my_rank + 1) - 1
+        if end_sample_index > total_samples - 1:
+            end_sample_index = total_samples - 1
+        sample_list = np.arange(start_sample_index, end_sample_index + 1, dtype=np.int64)
+        self.logger.debug(f"{self.my_rank} {start_sample_index} {end_sample_index}")
+        if self.sample_shuffle is not Shuffle.OFF:
+            if self.seed_change_epoch:
+                np.random.seed(self.seed + epoch_number)
+            else:
+                np.random.seed(self.seed)
+            np.random.shuffle(sample_list)
+        samples_sum = int(sample_list.sum())
+        positions = np.arange(len(sample_list), dtype=np.int64)
+        threads = (positions // self.samples_per_thread) % num_threads
+        file_indices = ((positions // self.num_samples_per_file) % num_files).astype(np.int32)
+        if len(file_indices) > 0:
+            # the first sample of a rank starts from the rank's share of the files
+            file_indices[0] = self.my_rank * ((num_files // self.comm_size) % num_files)
+        sample_indices = (sample_list % self.num_samples_per_file).astype(np.int32)
+        # entries of a thread become contiguous, keeping their order
+        order = np.argsort(threads, kind="stable")
+        thread_offsets = np.searchsorted(threads[order], np.arange(num_threads + 1))
+        file_map = ThreadFileMap(sample_list[order], file_indices[order], sample_indices[order],
+                                 thread_offsets, [os.path.abspath(f) for f in file_list])
+        return file_map, samples_sum
 
     @dlp.log
     def get_global_map_index(self, file_list, total_samples, epoch_number):
-        process_thread_file_map = {}
+        """
+        Maps the global indices of this rank to (file, index in the file) with array operations.
+        Lookups go by global index, so the order the samples are visited in does not change the map.
+        """
         num_files = len(file_list)
         start_sample = 0
-        end_sample = 0
-        samples_sum = 0
+        end_sample = -1
         if num_files > 0:
-            end_sample = total_samples - 1
             samples_per_proc = int(math.ceil(total_samples/self.comm_size)) 
             start_sample = self.my_rank * samples_per_proc
             end_sample = (self.my_rank + 1) * samples_per_proc - 1
             if end_sample > total_samples - 1:
                 end_sample = total_samples - 1
             self.logger.debug(f"my_rank: {self.my_rank}, start_sample: {start_sample}, end_sample: {end_sample}")
-            sample_list = np.arange(start_sample, end_sample + 1)
-            if self.sample_shuffle is not Shuffle.OFF:
-                if self.seed_change_epoch:
-                    np.random.seed(self.seed + epoch_number)
-                else:
-                    np.random.seed(self.seed)
-                np.random.shuffle(sample_list)
-            for sample_index in range(end_sample - start_sample + 1):
-                global_sample_index = sample_list[sample_index]
-                samples_sum += global_sample_index
-                file_index = int(math.floor(global_sample_index/self.num_samples_per_file))
-                abs_path = os.path.abspath(file_list[file_index])
-                sample_index = global_sample_index % self.num_samples_per_file
-                process_thread_file_map[global_sample_index] = (abs_path, sample_index)
-        return process_thread_file_map, samples_sum
+        global_indices = np.arange(start_sample, end_sample + 1, dtype=np.int64)
+        samples_sum = int(global_indices.sum())
+        file_indices, sample_indices = np.divmod(global_indices, self.num_samples_per_file)
+        index_map = GlobalIndexMap(start_sample, file_indices.astype(np.int32), sample_indices.astype(np.int32),
+                                   [os.path.abspath(f) for f in file_list])
+        return index_map, samples_sum
+
+    def permutation_key(self, epoch_number):
+        """
+        Key of the sample permutation of an epoch; None keeps samples in order.
+        """
+        if self.sample_shuffle is Shuffle.OFF:
+            return None
+        if self.sample_shuffle is Shuffle.RANDOM:
+            # every rank has to permute with the same key
+            key = int(np.random.randint(2**62)) if self.my_rank == 0 else None
+            return DLIOMPI.get_instance().comm().bcast(key, root=0)
+        return self.seed + epoch_number if self.seed_change_epoch else self.seed
+
+    def shuffle_rng(self, shuffle, epoch_number, stream):
+        """
+        Random generator of a shuffle level (stream) in an epoch; None when the level is not shuffled.
+        """
+        if shuffle is Shuffle.OFF:
+            return None
+        if shuffle is Shuffle.RANDOM:
+            return np.random.default_rng()
+        seed = self.seed + epoch_number if self.seed_change_epoch else self.seed
+        return np.random.default_rng([seed, stream])
+
+    @dlp.log
+    def sample_order(self, index_map, epoch_number):
+        """
+        Order in which the index based data loaders of this rank visit the global indices of index_map.
+        Samples are shuffled within the rank following sample_shuffle, or in two levels (file_shuffle over
+        files, then sample_shuffle within windows of sample_shuffle_window samples) when a window is set.
+        With sample_permutation the map is shuffled already and the indices are visited in order.
+        """
+        global_indices = np.arange(index_map.start, index_map.start + len(index_map), dtype=np.int64)
+        if self.sample_permutation:
+            return global_indices
+        file_indices = index_map.file_indices(global_indices) if self.sample_shuffle_window > 0 else None
+        return visit_order(global_indices, file_indices,
+                           sample_rng=self.shuffle_rng(self.sample_shuffle, epoch_number, 1),
+                           file_rng=self.shuffle_rng(Shuffle(self.file_shuffle), epoch_number, 0),
+                           window=self.sample_shuffle_window)
+
+    def thread_share(self, samples_per_proc, num_threads):
+        """
+        Samples each reader thread of a rank reads in a row with the iterative sampler.
+        """
+        samples_per_thread = samples_per_proc // num_threads
+        if samples_per_proc > 0 and samples_per_thread == 0:
+            raise Exception(f"Each rank reads {samples_per_proc} samples, fewer than its {num_threads} reader threads. "
+                            f"Lower reader.read_threads or add samples to the dataset.")
+        return samples_per_thread
+
+    @dlp.log
+    def build_permuted_map(self, file_list, total_samples, epoch_number):
+        """
+        Sample map of reader.sample_permutation: the rank owns the contiguous range of global
+        indices it would own otherwise, and global index g is read as dataset sample permutation(g).
+        Nothing is stored per sample, and the shuffle is global rather than within the rank.
+        """
+        num_threads = 1
+        if self.read_threads > 0 and self.data_loader is not DataLoaderType.DALI:
+            num_threads = self.read_threads
+        start, count = 0, 0
+        if len(file_list) > 0:
+            samples_per_proc = int(math.ceil(total_samples/self.comm_size))
+            start = samples_per_proc * self.my_rank
+            count = max(0, min(samples_per_proc, total_samples - start))
+        samples_sum = (2 * start + count - 1) * count // 2
+        permutation = FeistelPermutation(total_samples, self.permutation_key(epoch_number))
+        paths = [os.path.abspath(f) for f in file_list]
+        if self.data_loader_sampler == DataLoaderSampler.ITERATIVE:
+            if len(file_list) > 0:
+                self.samples_per_thread = self.thread_share(int(math.ceil(total_samples/self.comm_size)), num_threads)
+            return PermutedFileMap(start, count, num_threads, self.samples_per_thread, self.num_samples_per_file,
+                                   permutation, paths), samples_sum
+        return PermutedIndexMap(start, count, self.num_samples_per_file, permutation, paths), samples_sum
 
     @dlp.log
     def reconfigure(self, epoch_number):
@@ -454,7 +644,14 @@ class ConfigArguments:
                     np.random.seed(self.seed)
                 np.random.shuffle(self.file_list_train) 
                 np.random.shuffle(self.file_list_eval)
-        if self.data_loader_sampler == DataLoaderSampler.ITERATIVE:
+        if self.sample_permutation:
+            train_map, local_train_sample_sum = self.build_permuted_map(self.file_list_train, self.total_samples_train, epoch_number)
+            val_map, local_eval_sample_sum = self.build_permuted_map(self.file_list_eval, self.total_samples_eval, epoch_number)
+            if self.data_loader_sampler == DataLoaderSampler.ITERATIVE:
+                self.train_file_map, self.val_file_map = train_map, val_map
+            else:
+                self.train_global_index_map, self.val_global_index_map = train_map, val_map
+        elif self.data_loader_sampler == DataLoaderSampler.ITERATIVE:
             self.train_file_map, local_train_sample_sum = self.build_sample_map_iter(self.file_list_train, self.total_samples_train,
                                                              epoch_number)
             self.val_file_map, local_eval_sample_sum = self.build_sample_map_iter(self.file_list_eval, self.total_samples_eval, epoch_number)
@@ -484,6 +681,16 @@ def GetConfig(args, key):
             value = args.storage_type
         elif keys[1] == "storage_root":
             value = args.storage_root
+        elif keys[1] == "s3_block_size":
+            value = args.s3_block_size
+        elif keys[1] == "s3_max_readahead":
+            value = args.s3_max_readahead
+        elif keys[1] == "s3_cache_size":
+            value = args.s3_cache_size
+        elif keys[1] == "byte_source":
+            value = args.byte_source
+        elif keys[1] == "cache_folder":
+            value = args.cache_folder
     
     if len(keys) > 1 and keys[0] == "dataset":
         if keys[1] == "record_length_bytes":
@@ -510,10 +717,24 @@ def GetConfig(args, key):
             value = args.enable_chunking
         elif keys[1] == "chunk_size":
             value = args.chunk_size
+        elif keys[1] == "hdf5_page_size":
+            value = args.hdf5_page_size
+        elif keys[1] == "parquet_row_group_size":
+            value = args.parquet_row_group_size
+        elif keys[1] == "parquet_num_columns":
+            value = args.parquet_num_columns
+        elif keys[1] == "parquet_compression":
+            value = args.parquet_compression
+        elif keys[1] == "array_chunk_shape":
+            value = args.array_chunk_shape
         elif keys[1] == "compression":
             value = args.compression
         elif keys[1] == "compression_level":
             value = args.compression_level
+        elif keys[1] == "compression_block_size":
+            value = args.compression_block_size
+        elif keys[1] == "compressible_fraction":
+            value = args.compressible_fraction
         elif keys[1] == "file_prefix":
             value = args.file_prefix
         elif keys[1] == "format":
@@ -526,6 +747,8 @@ def GetConfig(args, key):
     if len(keys) > 1 and (keys[0] == "data_reader" or keys[0] == "reader"):
         if keys[1] == "dont_use_mmap":
             value = args.dont_use_mmap
+        elif keys[1] == "tfrecord_verify_crc":
+            value = args.tfrecord_verify_crc
         elif keys[1] == "reader_classname":
             value = args.reader_classname
         elif keys[1] == "multiprocessing_context":
@@ -554,10 +777,70 @@ def GetConfig(args, key):
             value = args.shuffle_size
         elif keys[1] == "sample_shuffle":
             value = args.sample_shuffle
+        elif keys[1] == "sample_shuffle_window":
+            value = args.sample_shuffle_window
         elif keys[1] == "read_type":
             value = args.read_type
         elif keys[1] == "transfer_size":
             value = args.transfer_size
+        elif keys[1] == "max_open_files":
+            value = args.max_open_files
+        elif keys[1] == "file_prefetch_depth":
+            value = args.file_prefetch_depth
+        elif keys[1] == "file_prefetch_max_bytes":
+            value = args.file_prefetch_max_bytes
+        elif keys[1] == "sample_cache_size":
+            value = args.sample_cache_size
+        elif keys[1] == "sample_cache_policy":
+            value = args.sample_cache_policy
+        elif keys[1] == "sample_cache_preprocessed":
+            value = args.sample_cache_preprocessed
+        elif keys[1] == "hdf5_rdcc_nbytes":
+            value = args.hdf5_rdcc_nbytes
+        elif keys[1] == "hdf5_rdcc_nslots":
+            value = args.hdf5_rdcc_nslots
+        elif keys[1] == "hdf5_rdcc_w0":
+            value = args.hdf5_rdcc_w0
+        elif keys[1] == "hdf5_page_buffer_size":
+            value = args.hdf5_page_buffer_size
+        elif keys[1] == "parquet_columns":
+            value = args.parquet_columns
+        elif keys[1] == "parquet_row_group_concurrency":
+            value = args.parquet_row_group_concurrency
+        elif keys[1] == "tar_stream_read_size":
+            value = args.tar_stream_read_size
+        elif keys[1] == "chunk_fetch_threads":
+            value = args.chunk_fetch_threads
+        elif keys[1] == "decompression_threads":
+            value = args.decompression_threads
+        elif keys[1] == "image_decode":
+            value = args.image_decode
+        elif keys[1] == "image_decode_threads":
+            value = args.image_decode_threads
+        elif keys[1] == "image_jpeg_draft":
+            value = args.image_jpeg_draft
+        elif keys[1] == "return_payload":
+            value = args.return_payload
+        elif keys[1] == "payload_bucket_size":
+            value = args.payload_bucket_size
+        elif keys[1] == "sample_permutation":
+            value = args.sample_permutation
+        elif keys[1] == "batch_read_threads":
+            value = args.batch_read_threads
+        elif keys[1] == "batch_ring":
+            value = args.batch_ring
+        elif keys[1] == "in_order":
+            value = args.in_order
+        elif keys[1] == "reorder_window":
+            value = args.reorder_window
+        elif keys[1] == "prefetch_memory_budget":
+            value = args.prefetch_memory_budget
+        elif keys[1] == "node_prefetch_memory_budget":
+            value = args.node_prefetch_memory_budget
+        elif keys[1] == "async_concurrency":
+            value = args.async_concurrency
+        elif keys[1] == "batch_ring_slot_size":
+            value = args.batch_ring_slot_size
         elif keys[1] == "preprocess_time":
             value = args.preprocess_time.get("mean", 0)
         elif keys[1] == "preprocess_time_stdev":
@@ -704,6 +987,16 @@ def LoadConfig(args, config):
             args.storage_type = StorageType(config['storage']['storage_type'])
         if 'storage_root' in config['storage']:
             args.storage_root = config['storage']['storage_root']
+        if 's3_block_size' in config['storage']:
+            args.s3_block_size = config['storage']['s3_block_size']
+        if 's3_max_readahead' in config['storage']:
+            args.s3_max_readahead = config['storage']['s3_max_readahead']
+        if 's3_cache_size' in config['storage']:
+            args.s3_cache_size = config['storage']['s3_cache_size']
+        if 'byte_source' in config['storage']:
+            args.byte_source = ByteSourceType(config['storage']['byte_source'])
+        if 'cache_folder' in config['storage']:
+            args.cache_folder = config['storage']['cache_folder']
 
     # dataset related settings
     if 'dataset' in config:
@@ -732,10 +1025,24 @@ def LoadConfig(args, config):
             args.enable_chunking = config['dataset']['enable_chunking']
         if 'chunk_size' in config['dataset']:
             args.chunk_size = config['dataset']['chunk_size']
+        if 'hdf5_page_size' in config['dataset']:
+            args.hdf5_page_size = config['dataset']['hdf5_page_size']
+        if 'parquet_row_group_size' in config['dataset']:
+            args.parquet_row_group_size = config['dataset']['parquet_row_group_size']
+        if 'parquet_num_columns' in config['dataset']:
+            args.parquet_num_columns = config['dataset']['parquet_num_columns']
+        if 'parquet_compression' in config['dataset']:
+            args.parquet_compression = config['dataset']['parquet_compression']
+        if 'array_chunk_shape' in config['dataset']:
+            args.array_chunk_shape = list(config['dataset']['array_chunk_shape'])
         if 'compression' in config['dataset']:
             args.compression = config['dataset']['compression']
         if 'compression_level' in config['dataset']:
             args.compression_level = config['dataset']['compression_level']
+        if 'compression_block_size' in config['dataset']:
+            args.compression_block_size = config['dataset']['compression_block_size']
+        if 'compressible_fraction' in config['dataset']:
+            args.compressible_fraction = config['dataset']['compressible_fraction']
         if 'file_prefix' in config['dataset']:
             args.file_prefix = config['dataset']['file_prefix']
         if 'format' in config['dataset']:
@@ -752,6 +1059,8 @@ def LoadConfig(args, config):
     if reader is not None:
         if 'dont_use_mmap' in reader:
             args.dont_use_mmap = reader['dont_use_mmap']
+        if 'tfrecord_verify_crc' in reader:
+            args.tfrecord_verify_crc = reader['tfrecord_verify_crc']
         if 'reader_classname' in reader:
             args.reader_classname = reader['reader_classname']
         if 'multiprocessing_context' in reader:
@@ -780,10 +1089,70 @@ def LoadConfig(args, config):
             args.shuffle_size = reader['shuffle_size']
         if 'sample_shuffle' in reader:
             args.sample_shuffle = Shuffle(reader['sample_shuffle'])
+        if 'sample_shuffle_window' in reader:
+            args.sample_shuffle_window = reader['sample_shuffle_window']
         if 'read_type' in reader:
             args.read_type = reader['read_type']
         if 'transfer_size' in reader:
             args.transfer_size = reader['transfer_size']
+        if 'max_open_files' in reader:
+            args.max_open_files = reader['max_open_files']
+        if 'file_prefetch_depth' in reader:
+            args.file_prefetch_depth = reader['file_prefetch_depth']
+        if 'file_prefetch_max_bytes' in reader:
+            args.file_prefetch_max_bytes = reader['file_prefetch_max_bytes']
+        if 'sample_cache_size' in reader:
+            args.sample_cache_size = reader['sample_cache_size']
+        if 'sample_cache_policy' in reader:
+            args.sample_cache_policy = CachePolicy(reader['sample_cache_policy'])
+        if 'sample_cache_preprocessed' in reader:
+            args.sample_cache_preprocessed = reader['sample_cache_preprocessed']
+        if 'hdf5_rdcc_nbytes' in reader:
+            args.hdf5_rdcc_nbytes = reader['hdf5_rdcc_nbytes']
+        if 'hdf5_rdcc_nslots' in reader:
+            args.hdf5_rdcc_nslots = reader['hdf5_rdcc_nslots']
+        if 'hdf5_rdcc_w0' in reader:
+            args.hdf5_rdcc_w0 = reader['hdf5_rdcc_w0']
+        if 'hdf5_page_buffer_size' in reader:
+            args.hdf5_page_buffer_size = reader['hdf5_page_buffer_size']
+        if 'parquet_columns' in reader:
+            args.parquet_columns = list(reader['parquet_columns'])
+        if 'parquet_row_group_concurrency' in reader:
+            args.parquet_row_group_concurrency = reader['parquet_row_group_concurrency']
+        if 'tar_stream_read_size' in reader:
+            args.tar_stream_read_size = reader['tar_stream_read_size']
+        if 'chunk_fetch_threads' in reader:
+            args.chunk_fetch_threads = reader['chunk_fetch_threads']
+        if 'decompression_threads' in reader:
+            args.decompression_threads = reader['decompression_threads']
+        if 'image_decode' in reader:
+            args.image_decode = reader['image_decode']
+        if 'image_decode_threads' in reader:
+            args.image_decode_threads = reader['image_decode_threads']
+        if 'image_jpeg_draft' in reader:
+            args.image_jpeg_draft = reader['image_jpeg_draft']
+        if 'return_payload' in reader:
+            args.return_payload = reader['return_payload']
+        if 'payload_bucket_size' in reader:
+            args.payload_bucket_size = reader['payload_bucket_size']
+        if 'sample_permutation' in reader:
+            args.sample_permutation = reader['sample_permutation']
+        if 'batch_read_threads' in reader:
+            args.batch_read_threads = reader['batch_read_threads']
+        if 'batch_ring' in reader:
+            args.batch_ring = reader['batch_ring']
+        if 'in_order' in reader:
+            args.in_order = reader['in_order']
+        if 'reorder_window' in reader:
+            args.reorder_window = reader['reorder_window']
+        if 'prefetch_memory_budget' in reader:
+            args.prefetch_memory_budget = reader['prefetch_memory_budget']
+        if 'node_prefetch_memory_budget' in reader:
+            args.node_prefetch_memory_budget = reader['node_prefetch_memory_budget']
+        if 'async_concurrency' in reader:
+            args.async_concurrency = reader['async_concurrency']
+        if 'batch_ring_slot_size' in reader:
+            args.batch_ring_slot_size = reader['batch_ring_slot_size']
         
         args.preprocess_time = {}
         if 'preprocess_time' in reader:
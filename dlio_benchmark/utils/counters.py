@@ -0,0 +1,174 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import ctypes
+import multiprocessing
+import os
+import threading
+
+# Names of the counters kept per rank. Readers run in data loader worker processes,
+# so everything they report goes through shared memory to reach the StatsCounter.
+COUNTERS = [
+    "files_opened",
+    "files_closed",
+    "handle_pool_hits",
+    "files_prefetched",
+    "prefetched_bytes",
+    "sample_cache_hits",
+    "sample_cache_misses",
+    "sample_cache_bytes_saved",
+    "chunks_fetched",
+    "compressed_bytes_read",
+    "logical_bytes_read",
+    "images_decoded",
+    "image_read_ns",
+    "image_decode_ns",
+    "image_resize_ns",
+    "sampled_steps",
+    "sampled_step_files",
+    "ring_batches",
+    "ring_overflows",
+    "delivered_batches",
+    "reordered_batches",
+    "reorder_depth_sum",
+    "reorder_saved_ns",
+    "budget_waits",
+    "budget_wait_ns",
+    "inflight_samples",
+    "inflight_bytes_sum",
+    "inflight_bytes_peak",
+]
+
+# Counters that keep the largest value reported through maximum rather than a sum.
+# StatsCounter clears them when a training epoch starts, so they hold the peak of that epoch.
+MAXIMA = [
+    "inflight_bytes_peak",
+]
+
+
+class SharedCounters(object):
+    """
+    Integer counters shared by a rank and its data loader workers.
+    add only counts in the calling thread; flush moves what the threads of a process counted into
+    the shared counters under one lock. Workers flush after every batch they read, and snapshot
+    flushes the threads of the calling process.
+    The instance has to be created in the main process before the workers start;
+    workers started with spawn or forkserver receive it through set_instance.
+    """
+    __instance = None
+
+    def __init__(self, context=None):
+        ctx = multiprocessing.get_context(context)
+        self.index = {name: i for i, name in enumerate(COUNTERS)}
+        self.values = ctx.RawArray(ctypes.c_int64, len(COUNTERS))
+        self.lock = ctx.Lock()
+        self._reset_threads()
+
+    def _reset_threads(self):
+        self.local = threading.local()
+        # [thread, counted, flushed] for every thread of this process that added to the counters
+        self.threads = []
+        self.threads_lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ["local", "threads", "threads_lock"]:
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_threads()
+
+    @staticmethod
+    def _after_fork():
+        # a forked worker starts without the counts of the threads of its parent
+        if SharedCounters.__instance is not None:
+            SharedCounters.__instance._reset_threads()
+
+    @staticmethod
+    def get_instance():
+        if SharedCounters.__instance is None:
+            SharedCounters.__instance = SharedCounters()
+        return SharedCounters.__instance
+
+    @staticmethod
+    def initialize(context=None):
+        """
+            Creates a fresh set of counters usable by workers of the given multiprocessing context.
+        """
+        SharedCounters.__instance = SharedCounters(context)
+        return SharedCounters.__instance
+
+    @staticmethod
+    def set_instance(instance):
+        SharedCounters.__instance = instance
+
+    def _counted(self):
+        counted = [0] * len(COUNTERS)
+        with self.threads_lock:
+            self.threads.append([threading.current_thread(), counted, [0] * len(COUNTERS)])
+        self.local.counted = counted
+        return counted
+
+    def add(self, name, value=1):
+        counted = getattr(self.local, "counted", None)
+        if counted is None:
+            counted = self._counted()
+        counted[self.index[name]] += value
+
+    def flush(self):
+        """
+            Adds what the threads of this process counted since the last flush to the shared counters.
+        """
+        deltas = [0] * len(COUNTERS)
+        with self.threads_lock:
+            alive = []
+            for entry in self.threads:
+                thread, counted, flushed = entry
+                # checked first, so that nothing a finished thread counted is dropped
+                if thread.is_alive():
+                    alive.append(entry)
+                for i, value in enumerate(counted):
+                    if value != flushed[i]:
+                        deltas[i] += value - flushed[i]
+                        flushed[i] = value
+            self.threads = alive
+        if any(deltas):
+            with self.lock:
+                for i, delta in enumerate(deltas):
+                    self.values[i] += delta
+
+    def maximum(self, name, value):
+        with self.lock:
+            i = self.index[name]
+            self.values[i] = max(self.values[i], value)
+
+    def clear(self, name):
+        with self.lock:
+            self.values[self.index[name]] = 0
+
+    def get(self, name):
+        self.flush()
+        return self.values[self.index[name]]
+
+    def snapshot(self):
+        self.flush()
+        with self.lock:
+            return {name: self.values[i] for name, i in self.index.items()}
+
+
+os.register_at_fork(after_in_child=SharedCounters._after_fork)
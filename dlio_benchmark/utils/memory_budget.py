@@ -0,0 +1,151 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import ctypes
+import multiprocessing
+from time import perf_counter_ns
+
+from dlio_benchmark.utils.counters import SharedCounters
+
+# slots of MemoryBudget.state
+IN_FLIGHT = 0
+PEAK = 1
+EPOCH = 2
+NEXT_SEQUENCE = 3
+
+
+class MemoryBudget(object):
+    """
+    Caps the bytes of the batches a rank has in flight, i.e., read or being read by its workers or
+    threads but not yet consumed by the training loop.
+
+    Before a batch is read it reserves estimate bytes, which are corrected to the size of the batch
+    once it is read, and the loader releases them when the training loop asks for the next batch.
+    Batches reserve in the order they are requested, so an older batch never waits for a newer one,
+    and a batch is admitted whenever nothing else is in flight, even if it exceeds the budget alone.
+    Reservations of an epoch that has ended are not counted, so reads left over from an epoch that
+    stopped early do not block.
+
+    Like SharedCounters, it has to be created in the main process before the workers start.
+    """
+
+    def __init__(self, budget, estimate, context=None):
+        ctx = multiprocessing.get_context(context)
+        self.budget = budget
+        self.estimate = estimate
+        self.state = ctx.RawArray(ctypes.c_int64, 4)
+        self.state[EPOCH] = -1
+        self.condition = ctx.Condition()
+        # in flight bytes sampled by the main process at every delivered batch
+        self.samples = 0
+        self.sampled_bytes = 0
+
+    def reset(self, epoch):
+        """
+        Starts counting the batches of epoch, dropping everything still counted.
+        """
+        with self.condition:
+            self.state[IN_FLIGHT] = 0
+            self.state[PEAK] = 0
+            self.state[EPOCH] = epoch
+            self.state[NEXT_SEQUENCE] = 0
+            self.condition.notify_all()
+        self.samples = 0
+        self.sampled_bytes = 0
+
+    def close(self):
+        """
+        Ends the current epoch and wakes the reads waiting for it.
+        """
+        with self.condition:
+            self.state[EPOCH] = -1
+            self.condition.notify_all()
+
+    def _add(self, nbytes):
+        self.state[IN_FLIGHT] += nbytes
+        self.state[PEAK] = max(self.state[PEAK], self.state[IN_FLIGHT])
+
+    def reserve(self, epoch, sequence):
+        """
+        Blocks until batch sequence of epoch fits into the budget and reserves estimate bytes for it.
+        Returns whether the bytes were reserved.
+        """
+        start = perf_counter_ns()
+        waited = False
+        with self.condition:
+            while True:
+                if self.state[EPOCH] != epoch:
+                    return False
+                if self.state[NEXT_SEQUENCE] == sequence and \
+                        (self.state[IN_FLIGHT] == 0 or self.state[IN_FLIGHT] + self.estimate <= self.budget):
+                    break
+                waited = True
+                self.condition.wait()
+            self.state[NEXT_SEQUENCE] = sequence + 1
+            self._add(self.estimate)
+            self.condition.notify_all()
+        if waited:
+            counters = SharedCounters.get_instance()
+            counters.add("budget_waits")
+            counters.add("budget_wait_ns", perf_counter_ns() - start)
+        return True
+
+    def adjust(self, epoch, nbytes):
+        """
+        Adds nbytes, which may be negative, to the bytes in flight of epoch.
+        """
+        with self.condition:
+            if self.state[EPOCH] != epoch:
+                return
+            self._add(nbytes)
+            if nbytes < 0:
+                self.condition.notify_all()
+
+    def release(self, epoch, nbytes):
+        self.adjust(epoch, -nbytes)
+
+    def read(self, epoch, sequence, read, *args):
+        """
+        Reads batch sequence of epoch with read(*args) once it fits into the budget.
+        """
+        reserved = self.reserve(epoch, sequence)
+        try:
+            batch = read(*args)
+        except BaseException:
+            if reserved:
+                self.release(epoch, self.estimate)
+            raise
+        if reserved:
+            self.adjust(epoch, batch.nbytes - self.estimate)
+        return batch
+
+    def sample(self):
+        """
+        Records the bytes in flight at this moment and returns them.
+        """
+        in_flight = self.state[IN_FLIGHT]
+        self.samples += 1
+        self.sampled_bytes += in_flight
+        return in_flight
+
+    def report(self):
+        """
+        Adds the sampled bytes in flight of the epoch to the shared counters and records their peak.
+        """
+        counters = SharedCounters.get_instance()
+        counters.add("inflight_samples", self.samples)
+        counters.add("inflight_bytes_sum", self.sampled_bytes)
+        counters.maximum("inflight_bytes_peak", self.state[PEAK])
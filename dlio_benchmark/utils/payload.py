@@ -0,0 +1,46 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import numpy as np
+
+"""
+Helpers for reader.return_payload, where the samples a reader read travel to the training loop
+instead of the shared resized_image. A payload is the sample as a flat uint8 array (a view of the
+sample whenever it is contiguous), and the payloads of a batch are zero padded to a common length.
+"""
+
+
+def as_payload(sample):
+    return np.ascontiguousarray(sample).reshape(-1).view(np.uint8)
+
+
+def padded_length(length, bucket_size=0):
+    """
+    Length a batch whose longest payload has length bytes is padded to. With a bucket size the
+    length is rounded up to a multiple of it, so batches only come in a few shapes.
+    """
+    if bucket_size > 0:
+        return -(-length // bucket_size) * bucket_size
+    return length
+
+
+def pad_payloads(samples, bucket_size=0):
+    payloads = [as_payload(sample) for sample in samples]
+    length = padded_length(max(len(payload) for payload in payloads), bucket_size)
+    batch = np.zeros((len(payloads), length), dtype=np.uint8)
+    for row, payload in zip(batch, payloads):
+        row[:len(payload)] = payload
+    return batch
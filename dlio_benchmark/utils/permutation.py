@@ -0,0 +1,99 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import numpy as np
+
+"""
+Keyed pseudo-random permutation of [0, size) evaluated one index at a time.
+
+A balanced Feistel network permutes the smallest even-bit domain holding size indices, and
+cycle walking (re-encrypting until the result falls below size) restricts it to [0, size).
+The domain is at most four times size, so an index takes a few encryptions on average.
+The scalar and the vectorized path compute the same permutation.
+"""
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+ROUNDS = 4
+
+
+def mix64(z):
+    """
+    splitmix64 finalizer on a Python int.
+    """
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def mix64_array(z):
+    """
+    splitmix64 finalizer on a uint64 array; products wrap modulo 2**64.
+    """
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class FeistelPermutation(object):
+    """
+    Bijection of [0, size) keyed by a seed; FeistelPermutation(size, None) is the identity.
+    """
+
+    def __init__(self, size, key):
+        self.size = size
+        self.key = key
+        bits = max(2, int(size - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.mask = (1 << self.half) - 1
+        if key is None:
+            self.keys = []
+        else:
+            self.keys = [mix64((key * 0x9E3779B97F4A7C15 + r + 1) & MASK64) for r in range(ROUNDS)]
+
+    def _encrypt(self, x):
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (mix64(right ^ key) & self.mask)
+        return (left << self.half) | right
+
+    def __call__(self, index):
+        if not self.keys:
+            return index
+        index = self._encrypt(index)
+        while index >= self.size:
+            index = self._encrypt(index)
+        return index
+
+    def _encrypt_array(self, x):
+        half, mask = np.uint64(self.half), np.uint64(self.mask)
+        left, right = x >> half, x & mask
+        for key in self.keys:
+            left, right = right, left ^ (mix64_array(right ^ np.uint64(key)) & mask)
+        return (left << half) | right
+
+    def permute(self, indices):
+        """
+        Vectorized __call__ over an array of indices; returns an int64 array.
+        """
+        indices = np.asarray(indices, dtype=np.uint64)
+        if not self.keys:
+            return indices.astype(np.int64)
+        result = self._encrypt_array(indices)
+        outside = result >= np.uint64(self.size)
+        while outside.any():
+            result[outside] = self._encrypt_array(result[outside])
+            outside = result >= np.uint64(self.size)
+        return result.astype(np.int64)
@@ -0,0 +1,92 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from time import perf_counter_ns
+
+import numpy as np
+
+from dlio_benchmark.utils.counters import SharedCounters
+
+
+class ReorderBuffer(object):
+    """
+    Releases batches in the order they complete instead of the order they were requested.
+
+    Batch s is released on arrival when s < head + window, where head is the oldest batch not
+    released yet, and held back otherwise until head has moved on; a window of 0 never holds
+    batches back. For every released batch it records how far ahead of head it was and how much
+    earlier it was released than in order delivery would have allowed, i.e., once all batches up to
+    it had arrived.
+    """
+
+    def __init__(self, window=0):
+        self.window = window
+        self.head = 0
+        self.held = {}
+        self.released = set()
+        self.arrivals = {}
+        self.releases = {}
+        self.depths = []
+
+    def holding(self):
+        """
+        Number of batches that arrived but are held back by the window.
+        """
+        return len(self.held)
+
+    def push(self, sequence, batch):
+        """
+        Adds the batch with the given sequence number and returns the batches that can be released now.
+        """
+        now = perf_counter_ns()
+        self.arrivals[sequence] = now
+        self.held[sequence] = batch
+        ready = []
+        for s in sorted(self.held):
+            if self.window > 0 and s >= self.head + self.window:
+                break
+            ready.append(self.held.pop(s))
+            self.depths.append(s - self.head)
+            self.releases[s] = now
+            self.released.add(s)
+            while self.head in self.released:
+                self.released.discard(self.head)
+                self.head += 1
+        return ready
+
+    def report(self):
+        """
+        Adds the statistics of the released batches to the shared counters.
+        """
+        if len(self.releases) == 0:
+            return
+        sequences = np.arange(max(self.arrivals) + 1)
+        arrivals = np.array([self.arrivals.get(s, -1) for s in sequences.tolist()], dtype=np.int64)
+        # a batch is delivered in order once every batch up to it has arrived
+        in_order = np.maximum.accumulate(arrivals)
+        # batches after one that never arrived have no in order delivery time
+        missing = np.flatnonzero(arrivals < 0)
+        complete = missing[0] if len(missing) > 0 else len(arrivals)
+        released = np.array(list(self.releases.keys()), dtype=np.int64)
+        times = np.array(list(self.releases.values()), dtype=np.int64)
+        mask = released < complete
+        saved = int(np.maximum(in_order[released[mask]] - times[mask], 0).sum())
+        depths = np.array(self.depths, dtype=np.int64)
+        counters = SharedCounters.get_instance()
+        counters.add("delivered_batches", len(depths))
+        counters.add("reordered_batches", int(np.count_nonzero(depths)))
+        counters.add("reorder_depth_sum", int(depths.sum()))
+        counters.add("reorder_saved_ns", saved)
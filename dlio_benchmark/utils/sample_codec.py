@@ -0,0 +1,116 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from dlio_benchmark.common.enumerations import Compression
+
+"""
+Per-sample compression of the indexed binary format.
+
+A compressed sample is stored as
+    uint32 block count | uint64 logical size | uint32 compressed size[block count] | blocks
+where every block holds up to block_size bytes of the sample compressed on its own,
+so the blocks of one sample can be decompressed in parallel. All integers are little endian.
+"""
+
+HEADER = struct.Struct("<IQ")
+
+SAMPLE_CODECS = [Compression.ZSTD, Compression.LZ4, Compression.ZLIB]
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+
+class SampleCodec(object):
+    """
+    Compresses and decompresses samples with zstd, lz4 or zlib. All three release the GIL
+    while working on a block, so decompress() spreads the blocks of a sample over a thread pool.
+    """
+
+    def __init__(self, compression, level, block_size):
+        self.compression = Compression(compression)
+        self.level = level
+        self.block_size = block_size
+        self.local = threading.local()
+        if self.compression == Compression.ZSTD and zstandard is None:
+            raise Exception("zstd compression requires the zstandard package; install dlio_benchmark[compression].")
+        if self.compression == Compression.LZ4 and not LZ4_AVAILABLE:
+            raise Exception("lz4 compression requires the lz4 package; install dlio_benchmark[compression].")
+        if self.compression not in SAMPLE_CODECS:
+            raise Exception(f"{self.compression} is not a per-sample codec; use one of zstd, lz4 or zlib.")
+
+    def _compress_block(self, block):
+        if self.compression == Compression.ZSTD:
+            return zstandard.ZstdCompressor(level=self.level).compress(block)
+        elif self.compression == Compression.LZ4:
+            return lz4.frame.compress(block, compression_level=self.level)
+        return zlib.compress(block, self.level)
+
+    def _decompress_block(self, block):
+        if self.compression == Compression.ZSTD:
+            # decompressor objects may not be shared by threads running at the same time
+            if not hasattr(self.local, "zstd"):
+                self.local.zstd = zstandard.ZstdDecompressor()
+            return self.local.zstd.decompress(block)
+        elif self.compression == Compression.LZ4:
+            return lz4.frame.decompress(block)
+        return zlib.decompress(block)
+
+    def compress(self, data):
+        view = memoryview(data).cast("B")
+        blocks = [self._compress_block(view[i:i + self.block_size])
+                  for i in range(0, len(view), self.block_size)]
+        header = HEADER.pack(len(blocks), len(view)) + struct.pack(f"<{len(blocks)}I", *[len(b) for b in blocks])
+        return header + b"".join(blocks)
+
+    @staticmethod
+    def logical_size(data):
+        return HEADER.unpack_from(memoryview(data).cast("B"), 0)[1]
+
+    def decompress(self, data, executor=None):
+        """
+        Returns the sample stored in data as a uint8 array, decompressing its blocks
+        through executor when one is given.
+        """
+        view = memoryview(data).cast("B")
+        count, size = HEADER.unpack_from(view, 0)
+        sizes = struct.unpack_from(f"<{count}I", view, HEADER.size)
+        blocks = []
+        start = HEADER.size + 4 * count
+        for n in sizes:
+            blocks.append(view[start:start + n])
+            start += n
+        if executor is None or count == 1:
+            parts = [self._decompress_block(block) for block in blocks]
+        else:
+            parts = list(executor.map(self._decompress_block, blocks))
+        image = np.frombuffer(b"".join(parts), dtype=np.uint8)
+        if image.size != size:
+            raise Exception(f"decompressed sample has {image.size} bytes but {size} were expected.")
+        return image
@@ -0,0 +1,444 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+"""
+Compact sample maps shared with data loader workers.
+
+The sample maps of a rank are kept as numpy arrays in one memory-mapped file (in /dev/shm when
+available). Pickling a map only pickles the path of that file and the layout of its arrays, so a
+data loader worker that unpickles the configuration maps the file in constant time instead of
+rebuilding a dictionary with an entry per sample.
+"""
+
+SHARED_FOLDER = "/dev/shm"
+ALIGNMENT = 64
+# entries converted to Python objects at a time when iterating over a map
+ITERATION_BLOCK = 65536
+
+
+class SharedArrays(object):
+    """
+    Named arrays stored in a single memory-mapped file.
+    The file is removed when the object that wrote it is garbage collected in the writing process.
+    """
+
+    def __init__(self, arrays):
+        self.layout = []
+        offset = 0
+        for name, array in arrays.items():
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            self.layout.append((name, array.dtype.str, array.shape, offset))
+            offset += array.nbytes
+        folder = SHARED_FOLDER if os.path.isdir(SHARED_FOLDER) else None
+        fd, self.path = tempfile.mkstemp(prefix="dlio_sample_map_", suffix=".bin", dir=folder)
+        with os.fdopen(fd, "wb") as f:
+            for (_, _, _, start), array in zip(self.layout, arrays.values()):
+                f.seek(start)
+                f.write(np.ascontiguousarray(array).tobytes())
+        self.owner = os.getpid()
+        self._map()
+
+    def _map(self):
+        size = os.path.getsize(self.path)
+        buffer = np.memmap(self.path, dtype=np.uint8, mode="r") if size > 0 else None
+        self.arrays = {}
+        for name, dtype, shape, offset in self.layout:
+            count = int(np.prod(shape))
+            if count == 0:
+                self.arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                self.arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __getstate__(self):
+        return {"path": self.path, "layout": self.layout}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.owner = None
+        self._map()
+
+    def __del__(self):
+        if getattr(self, "owner", None) == os.getpid():
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+class FileTable(object):
+    """
+    Interned file paths, stored as one byte string and the offsets of the paths in it.
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.names = {}
+
+    @staticmethod
+    def arrays_for(paths):
+        encoded = [path.encode() for path in paths]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(path) for path in encoded])
+        return {"paths": np.frombuffer(b"".join(encoded), dtype=np.uint8), "path_offsets": offsets}
+
+    def __len__(self):
+        return len(self.arrays["path_offsets"]) - 1
+
+    def __getitem__(self, index):
+        name = self.names.get(index)
+        if name is None:
+            offsets = self.arrays["path_offsets"]
+            name = self.arrays["paths"][offsets[index]:offsets[index + 1]].tobytes().decode()
+            self.names[index] = name
+        return name
+
+    def __getstate__(self):
+        return {"arrays": self.arrays}
+
+    def __setstate__(self, state):
+        self.arrays = state["arrays"]
+        self.names = {}
+
+
+class GlobalIndexMap(object):
+    """
+    Maps the global index of a sample to (file path, index of the sample in the file) for the
+    contiguous range of global indices [start, start + len) assigned to a rank. Behaves like the
+    dictionary it replaces for lookups and iteration.
+    """
+
+    def __init__(self, start, file_indices, sample_indices, paths):
+        self.start = start
+        self.arrays = SharedArrays(dict(file_index=file_indices, sample_index=sample_indices,
+                                        **FileTable.arrays_for(paths)))
+        self.files = FileTable(self.arrays)
+
+    def __len__(self):
+        return len(self.arrays["file_index"])
+
+    def __contains__(self, global_sample_idx):
+        return 0 <= global_sample_idx - self.start < len(self)
+
+    def __getitem__(self, global_sample_idx):
+        position = global_sample_idx - self.start
+        if not 0 <= position < len(self):
+            raise KeyError(global_sample_idx)
+        return self.files[int(self.arrays["file_index"][position])], int(self.arrays["sample_index"][position])
+
+    def keys(self):
+        return range(self.start, self.start + len(self))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def items(self):
+        file_index, sample_index = self.arrays["file_index"], self.arrays["sample_index"]
+        for begin in range(0, len(self), ITERATION_BLOCK):
+            end = min(begin + ITERATION_BLOCK, len(self))
+            for position, f, s in zip(range(begin, end), file_index[begin:end].tolist(), sample_index[begin:end].tolist()):
+                yield self.start + position, (self.files[f], s)
+
+    def filenames(self):
+        """
+        Paths of the files holding at least one of the samples.
+        """
+        return [self.files[f] for f in np.unique(self.arrays["file_index"]).tolist()]
+
+    def file_indices(self, global_indices):
+        """
+        Indices in the file table of the files holding the given global indices.
+        """
+        return self.arrays["file_index"][np.asarray(global_indices) - self.start]
+
+    def __repr__(self):
+        return f"GlobalIndexMap({len(self)} samples starting at {self.start}, {len(self.files)} files)"
+
+
+class ThreadSamples(object):
+    """
+    The (global index, file path, index in the file) entries of one reader thread, in read order.
+    """
+
+    def __init__(self, file_map, begin, end):
+        self.file_map = file_map
+        self.begin = begin
+        self.end = end
+
+    def __len__(self):
+        return self.end - self.begin
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        arrays = self.file_map.arrays
+        position = self.begin + i
+        return (int(arrays["global_index"][position]),
+                self.file_map.files[int(arrays["file_index"][position])],
+                int(arrays["sample_index"][position]))
+
+    def __iter__(self):
+        arrays = self.file_map.arrays
+        files = self.file_map.files
+        for begin in range(self.begin, self.end, ITERATION_BLOCK):
+            end = min(begin + ITERATION_BLOCK, self.end)
+            for g, f, s in zip(arrays["global_index"][begin:end].tolist(), arrays["file_index"][begin:end].tolist(),
+                               arrays["sample_index"][begin:end].tolist()):
+                yield g, files[f], s
+
+    def filenames(self):
+        """
+        Paths of the files holding at least one of the samples.
+        """
+        file_index = self.file_map.arrays["file_index"][self.begin:self.end]
+        return [self.file_map.files[f] for f in np.unique(file_index).tolist()]
+
+
+class ThreadFileMap(object):
+    """
+    Samples of a rank split over its reader threads, replacing a dictionary of thread index to a
+    list of (global index, file path, index in the file). The samples of thread t are entries
+    [thread_offsets[t], thread_offsets[t + 1]) of the arrays.
+    """
+
+    def __init__(self, global_indices, file_indices, sample_indices, thread_offsets, paths):
+        self.arrays = SharedArrays(dict(global_index=global_indices, file_index=file_indices,
+                                        sample_index=sample_indices, thread_offsets=thread_offsets,
+                                        **FileTable.arrays_for(paths)))
+        self.files = FileTable(self.arrays)
+
+    def __len__(self):
+        return len(self.arrays["thread_offsets"]) - 1
+
+    def __contains__(self, thread_index):
+        return 0 <= thread_index < len(self)
+
+    def __getitem__(self, thread_index):
+        if thread_index not in self:
+            raise KeyError(thread_index)
+        offsets = self.arrays["thread_offsets"]
+        return ThreadSamples(self, int(offsets[thread_index]), int(offsets[thread_index + 1]))
+
+    def keys(self):
+        return range(len(self))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def items(self):
+        for thread_index in self.keys():
+            yield thread_index, self[thread_index]
+
+    def __repr__(self):
+        return f"ThreadFileMap({len(self)} threads, {len(self.arrays['global_index'])} samples, {len(self.files)} files)"
+
+
+class PermutedIndexMap(object):
+    """
+    Global index map computed on demand: global index g of [start, start + count) is the sample
+    permutation(g) of the dataset, i.e. file permutation(g) // num_samples_per_file. Only the file table
+    is stored, so the memory use does not depend on the number of samples.
+    """
+
+    def __init__(self, start, count, num_samples_per_file, permutation, paths):
+        self.start = start
+        self.count = count
+        self.num_samples_per_file = num_samples_per_file
+        self.permutation = permutation
+        self.arrays = SharedArrays(FileTable.arrays_for(paths))
+        self.files = FileTable(self.arrays)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, global_sample_idx):
+        return 0 <= global_sample_idx - self.start < self.count
+
+    def __getitem__(self, global_sample_idx):
+        if global_sample_idx not in self:
+            raise KeyError(global_sample_idx)
+        file_index, sample_index = divmod(self.permutation(int(global_sample_idx)), self.num_samples_per_file)
+        return self.files[file_index], sample_index
+
+    def keys(self):
+        return range(self.start, self.start + self.count)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def items(self):
+        for begin in range(self.start, self.start + self.count, ITERATION_BLOCK):
+            end = min(begin + ITERATION_BLOCK, self.start + self.count)
+            file_index, sample_index = np.divmod(self.permutation.permute(np.arange(begin, end)), self.num_samples_per_file)
+            for g, f, s in zip(range(begin, end), file_index.tolist(), sample_index.tolist()):
+                yield g, (self.files[f], s)
+
+    def filenames(self):
+        files = set()
+        for begin in range(self.start, self.start + self.count, ITERATION_BLOCK):
+            end = min(begin + ITERATION_BLOCK, self.start + self.count)
+            files.update((self.permutation.permute(np.arange(begin, end)) // self.num_samples_per_file).tolist())
+        return [self.files[f] for f in sorted(files)]
+
+    def file_indices(self, global_indices):
+        return self.permutation.permute(np.asarray(global_indices, dtype=np.int64)) // self.num_samples_per_file
+
+    def __repr__(self):
+        return f"PermutedIndexMap({self.count} samples starting at {self.start}, {len(self.files)} files)"
+
+
+class PermutedThreadSamples(object):
+    """
+    Samples of one reader thread of a PermutedFileMap: the positions p of the rank with
+    (p // samples_per_thread) % threads == thread, in increasing order.
+    """
+
+    def __init__(self, file_map, thread_index):
+        self.file_map = file_map
+        self.thread_index = thread_index
+        per_thread, threads, count = file_map.samples_per_thread, file_map.num_threads, file_map.count
+        # position blocks thread_index, thread_index + threads, ... of per_thread samples each
+        self.blocks = range(thread_index, -(-count // per_thread) if per_thread > 0 else 0, threads)
+        self.length = sum(min(per_thread, count - b * per_thread) for b in self.blocks) if per_thread > 0 else 0
+
+    def __len__(self):
+        return self.length
+
+    def position(self, i):
+        per_thread = self.file_map.samples_per_thread
+        block, offset = divmod(i, per_thread)
+        return self.blocks[block] * per_thread + offset
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.file_map.sample(self.position(i))
+
+    def positions(self):
+        per_thread, count = self.file_map.samples_per_thread, self.file_map.count
+        for block in self.blocks:
+            for begin in range(block * per_thread, min((block + 1) * per_thread, count), ITERATION_BLOCK):
+                yield np.arange(begin, min(begin + ITERATION_BLOCK, (block + 1) * per_thread, count))
+
+    def __iter__(self):
+        for positions in self.positions():
+            yield from self.file_map.samples(positions)
+
+    def filenames(self):
+        files = set()
+        for positions in self.positions():
+            files.update((self.file_map.permuted(positions) // self.file_map.num_samples_per_file).tolist())
+        return [self.file_map.files[f] for f in sorted(files)]
+
+
+class PermutedFileMap(object):
+    """
+    Iterative file map computed on demand: position p of the rank holds global sample start + p,
+    which is read as sample permutation(start + p) of the dataset.
+    """
+
+    def __init__(self, start, count, num_threads, samples_per_thread, num_samples_per_file, permutation, paths):
+        self.start = start
+        self.count = count
+        self.num_threads = num_threads
+        self.samples_per_thread = samples_per_thread
+        self.num_samples_per_file = num_samples_per_file
+        self.permutation = permutation
+        self.arrays = SharedArrays(FileTable.arrays_for(paths))
+        self.files = FileTable(self.arrays)
+
+    def __len__(self):
+        return self.num_threads
+
+    def __contains__(self, thread_index):
+        return 0 <= thread_index < self.num_threads
+
+    def __getitem__(self, thread_index):
+        if thread_index not in self:
+            raise KeyError(thread_index)
+        return PermutedThreadSamples(self, thread_index)
+
+    def permuted(self, positions):
+        return self.permutation.permute(positions + self.start)
+
+    def sample(self, position):
+        file_index, sample_index = divmod(self.permutation(self.start + position), self.num_samples_per_file)
+        return self.start + position, self.files[file_index], sample_index
+
+    def samples(self, positions):
+        file_index, sample_index = np.divmod(self.permuted(positions), self.num_samples_per_file)
+        for p, f, s in zip(positions.tolist(), file_index.tolist(), sample_index.tolist()):
+            yield self.start + p, self.files[f], s
+
+    def keys(self):
+        return range(self.num_threads)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def items(self):
+        for thread_index in self.keys():
+            yield thread_index, self[thread_index]
+
+    def __repr__(self):
+        return f"PermutedFileMap({self.num_threads} threads, {self.count} samples, {len(self.files)} files)"
+
+
+def visit_order(global_indices, file_indices, sample_rng=None, file_rng=None, window=0):
+    """
+    Order in which a rank visits its global indices in an epoch.
+
+    Without a window the indices are shuffled with sample_rng. With a window the shuffle has two
+    levels: the files are shuffled with file_rng, keeping the samples of a file together, and the
+    samples are then shuffled with sample_rng within consecutive windows of window samples, so a
+    window touches about window / num_samples_per_file + 1 files. A None generator skips its level.
+    """
+    order = np.asarray(global_indices, dtype=np.int64)
+    if window <= 0:
+        if sample_rng is not None:
+            order = sample_rng.permutation(order)
+        return order
+    if file_rng is not None and len(order) > 0:
+        files, local_files = np.unique(file_indices, return_inverse=True)
+        ranks = file_rng.permutation(len(files))
+        order = order[np.argsort(ranks[local_files], kind="stable")]
+    if sample_rng is not None:
+        keys = np.arange(len(order)) // window + sample_rng.random(len(order))
+        order = order[np.argsort(keys, kind="stable")]
+    return order
+
+
+def distinct_per_batch(values, batch_size):
+    """
+    Number of distinct values in each complete batch of batch_size consecutive values.
+    """
+    num_batches = len(values) // batch_size
+    if num_batches == 0:
+        return np.zeros(0, dtype=np.int64)
+    batches = np.sort(np.asarray(values)[:num_batches * batch_size].reshape(num_batches, batch_size), axis=1)
+    return 1 + np.count_nonzero(np.diff(batches, axis=1), axis=1)
+
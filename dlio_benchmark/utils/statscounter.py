@@ -15,7 +15,10 @@
    limitations under the License.
 """
 from numpy import append
+from dlio_benchmark.common.enumerations import Compression, FormatType
 from dlio_benchmark.utils.config import ConfigArguments
+from dlio_benchmark.utils.counters import MAXIMA, SharedCounters
+from dlio_benchmark.utils.sample_codec import SAMPLE_CODECS
 from dlio_benchmark.utils.utility import utcnow, DLIOMPI, DLIOLogger
 
 import os
@@ -62,6 +65,26 @@ class StatsCounter(object):
         self.summary['num_hosts'] = self.comm_size //self.MPI.npernode()
         self.summary['hostname'] = socket.gethostname()
         self.summary['metric'] = {}
+        self.counters = SharedCounters.initialize(self.args.multiprocessing_context)
+        self.counters_start = self.counters.snapshot()
+        self.files_opened = []
+        self.files_closed = []
+        self.sample_cache_hits = []
+        self.sample_cache_lookups = []
+        self.sample_cache_bytes_saved = []
+        self.chunks_fetched = []
+        self.sample_compression = Compression(self.args.compression) in SAMPLE_CODECS
+        self.compressed_io = []
+        self.logical_io = []
+        self.image_decode = self.args.image_decode and self.args.format in [FormatType.JPEG, FormatType.PNG]
+        self.image_stages = []
+        self.sampled_steps = []
+        self.sampled_step_files = []
+        # columns: delivered and reordered batches, summed reorder depth and nanoseconds saved
+        self.reorder_stats = []
+        self.memory_budget = self.args.prefetch_memory_budget > 0 or self.args.node_prefetch_memory_budget > 0
+        # columns: sampled and peak bytes in flight, number of samples and nanoseconds reads waited
+        self.inflight_stats = []
         self.summary['num_files_train'] = self.args.num_files_train
         self.summary['num_files_eval'] = self.args.num_files_eval
         self.summary['num_samples_per_file'] = self.args.num_samples_per_file
@@ -184,6 +207,48 @@ class StatsCounter(object):
                 self.summary['metric']['train_throughput_stdev_samples_per_second'] = np.std(train_throughput)
                 self.summary['metric']['train_io_mean_MB_per_second'] = np.mean(train_throughput)*self.record_size/1024./1024.
                 self.summary['metric']['train_io_stdev_MB_per_second'] = np.std(train_throughput)*self.record_size/1024./1024.
+                self.summary['metric']['train_files_opened'] = self.comm.allreduce(np.array(self.files_opened)).tolist()
+                self.summary['metric']['train_files_closed'] = self.comm.allreduce(np.array(self.files_closed)).tolist()
+                if self.args.sample_cache_size > 0:
+                    hits = self.comm.allreduce(np.array(self.sample_cache_hits))
+                    lookups = self.comm.allreduce(np.array(self.sample_cache_lookups))
+                    self.summary['metric']['train_sample_cache_hit_ratio'] = (hits / np.maximum(lookups, 1)).tolist()
+                    self.summary['metric']['train_sample_cache_bytes_saved'] = self.comm.allreduce(np.array(self.sample_cache_bytes_saved)).tolist()
+                if self.args.format == FormatType.CHUNKED_ARRAY:
+                    self.summary['metric']['train_chunks_fetched'] = self.comm.allreduce(np.array(self.chunks_fetched)).tolist()
+                if self.sample_compression:
+                    compressed_io = self.comm.allreduce(np.array(self.compressed_io))
+                    logical_io = self.comm.allreduce(np.array(self.logical_io))
+                    self.summary['metric']['train_compressed_io_MB_per_second'] = list(compressed_io)
+                    self.summary['metric']['train_compressed_io_mean_MB_per_second'] = np.mean(compressed_io)
+                    self.summary['metric']['train_logical_io_MB_per_second'] = list(logical_io)
+                    self.summary['metric']['train_logical_io_mean_MB_per_second'] = np.mean(logical_io)
+                sampled_steps = self.comm.allreduce(np.array(self.sampled_steps))
+                if np.sum(sampled_steps) > 0:
+                    files_per_step = self.comm.allreduce(np.array(self.sampled_step_files)) / np.maximum(sampled_steps, 1)
+                    self.summary['metric']['train_files_per_step'] = files_per_step.tolist()
+                    self.summary['metric']['train_files_per_step_mean'] = np.mean(files_per_step)
+                if not self.args.in_order:
+                    reorder_stats = self.comm.allreduce(np.array(self.reorder_stats, dtype=np.int64).reshape(-1, 4))
+                    delivered = np.maximum(reorder_stats[:, 0], 1)
+                    self.summary['metric']['train_reordered_batches_fraction'] = (reorder_stats[:, 1] / delivered).tolist()
+                    self.summary['metric']['train_reorder_depth_mean'] = (reorder_stats[:, 2] / delivered).tolist()
+                    self.summary['metric']['train_reorder_latency_saved_seconds'] = (reorder_stats[:, 3] / 1e9).tolist()
+                if self.memory_budget:
+                    inflight_stats = np.array(self.inflight_stats, dtype=np.int64).reshape(-1, 4)
+                    inflight_mean = inflight_stats[:, 0] / np.maximum(inflight_stats[:, 2], 1)
+                    self.summary['metric']['train_inflight_mean_MB'] = (self.comm.allreduce(inflight_mean) / self.comm_size / 1024. / 1024.).tolist()
+                    self.summary['metric']['train_inflight_peak_MB'] = (np.max(self.comm.allgather(inflight_stats[:, 1]), axis=0) / 1024. / 1024.).tolist()
+                    self.summary['metric']['train_budget_wait_seconds'] = (self.comm.allreduce(inflight_stats[:, 3]) / self.comm_size / 1e9).tolist()
+                if self.image_decode:
+                    # columns: images, read, decode and resize nanoseconds
+                    stages = self.comm.allreduce(np.array(self.image_stages, dtype=np.int64).reshape(-1, 4))
+                    images = np.maximum(stages[:, 0], 1)
+                    self.summary['metric']['train_image_read_ms_per_image'] = (stages[:, 1] / images / 1e6).tolist()
+                    self.summary['metric']['train_image_decode_ms_per_image'] = (stages[:, 2] / images / 1e6).tolist()
+                    self.summary['metric']['train_image_resize_ms_per_image'] = (stages[:, 3] / images / 1e6).tolist()
+                    cpu_seconds = np.maximum(stages[:, 2] + stages[:, 3], 1) / 1e9
+                    self.summary['metric']['train_image_decode_images_per_core_second'] = (stages[:, 0] / cpu_seconds).tolist()
             
             if self.args.do_eval:
                 eval_au = np.array(self.comm.allreduce(self.eval_au))/self.comm.size
@@ -208,6 +273,18 @@ class StatsCounter(object):
                     metric = metric + f"[METRIC] Training Accelerator Utilization [AU] (%): {np.mean(train_au):.4f} ({np.std(train_au):.4f})\n"
                     metric = metric + f"[METRIC] Training Throughput (samples/second): {np.mean(train_throughput):.4f} ({np.std(train_throughput):.4f})\n"
                     metric = metric + f"[METRIC] Training I/O Throughput (MB/second): {np.mean(train_throughput)*self.record_size/1024/1024:.4f} ({np.std(train_throughput)*self.record_size/1024/1024:.4f})\n"
+                    if self.sample_compression:
+                        metric = metric + f"[METRIC] Training Compressed I/O Throughput (MB/second): {np.mean(compressed_io):.4f} ({np.std(compressed_io):.4f})\n"
+                        metric = metric + f"[METRIC] Training Logical I/O Throughput (MB/second): {np.mean(logical_io):.4f} ({np.std(logical_io):.4f})\n"
+                    if self.image_decode:
+                        metric = metric + f"[METRIC] Training Image Read / Decode / Resize (ms/image): {np.mean(self.summary['metric']['train_image_read_ms_per_image']):.4f} / {np.mean(self.summary['metric']['train_image_decode_ms_per_image']):.4f} / {np.mean(self.summary['metric']['train_image_resize_ms_per_image']):.4f}\n"
+                        metric = metric + f"[METRIC] Training Image Decode Ceiling (images/core/second): {np.mean(self.summary['metric']['train_image_decode_images_per_core_second']):.4f}\n"
+                    if 'train_files_per_step_mean' in self.summary['metric']:
+                        metric = metric + f"[METRIC] Training Distinct Files per Step: {self.summary['metric']['train_files_per_step_mean']:.4f}\n"
+                    if self.memory_budget:
+                        metric = metric + f"[METRIC] Training In-flight Prefetch Memory per Rank (MB): {np.mean(self.summary['metric']['train_inflight_mean_MB']):.4f}, peak: {np.max(self.summary['metric']['train_inflight_peak_MB']):.4f}\n"
+                    if not self.args.in_order:
+                        metric = metric + f"[METRIC] Training Reordered Batches (fraction): {np.mean(self.summary['metric']['train_reordered_batches_fraction']):.4f}, mean depth: {np.mean(self.summary['metric']['train_reorder_depth_mean']):.4f}, latency saved (seconds): {np.mean(self.summary['metric']['train_reorder_latency_saved_seconds']):.4f}\n"
                     metric = metric + f"[METRIC] train_au_meet_expectation: {self.summary['metric']['train_au_meet_expectation']}\n"
                 if self.args.do_checkpoint: 
                     if self.args.num_checkpoints_write > 0:
@@ -234,6 +311,9 @@ class StatsCounter(object):
                 self.logger.output(f"{ts} Starting epoch {epoch}: Overriding number of steps to {self.steps}.")
             else:
                 self.logger.output(f"{ts} Starting epoch {epoch}: {self.steps} steps expected")
+        for name in MAXIMA:
+            self.counters.clear(name)
+        self.counters_start = self.counters.snapshot()
         # Initialize dicts for the current epoch
         self.output[epoch] = {}
         self.output[epoch]['load'] = {}
@@ -256,14 +336,54 @@ class StatsCounter(object):
             throughput = np.sum(throughput*steps)/np.sum(steps)
         self.train_au.append(au)
         self.train_throughput.append(throughput)
+        counters = self.counters.snapshot()
+        reader = {k: counters[k] - self.counters_start[k] for k in counters}
+        self.output[epoch]['reader'] = reader
+        self.files_opened.append(reader['files_opened'])
+        self.files_closed.append(reader['files_closed'])
+        self.sample_cache_hits.append(reader['sample_cache_hits'])
+        self.sample_cache_lookups.append(reader['sample_cache_hits'] + reader['sample_cache_misses'])
+        self.sample_cache_bytes_saved.append(reader['sample_cache_bytes_saved'])
+        self.chunks_fetched.append(reader['chunks_fetched'])
+        self.image_stages.append([reader['images_decoded'], reader['image_read_ns'], reader['image_decode_ns'], reader['image_resize_ns']])
+        self.sampled_steps.append(reader['sampled_steps'])
+        self.sampled_step_files.append(reader['sampled_step_files'])
+        self.inflight_stats.append([reader['inflight_bytes_sum'], reader['inflight_bytes_peak'], reader['inflight_samples'], reader['budget_wait_ns']])
+        self.reorder_stats.append([reader['delivered_batches'], reader['reordered_batches'], reader['reorder_depth_sum'], reader['reorder_saved_ns']])
 
         ts = utcnow()
         duration = pd.to_datetime(ts) - pd.to_datetime(self.per_epoch_stats[epoch]['start'])
         duration = '{:.2f}'.format(duration.total_seconds())
         self.per_epoch_stats[epoch]['end'] = ts
         self.per_epoch_stats[epoch]['duration'] = duration
+        if self.sample_compression:
+            seconds = max(float(duration), 1e-6)
+            self.compressed_io.append(reader['compressed_bytes_read']/seconds/1024./1024.)
+            self.logical_io.append(reader['logical_bytes_read']/seconds/1024./1024.)
         if self.my_rank == 0:
             self.logger.output(f"{ts} Ending epoch {epoch} - {np.sum(steps)} steps completed in {duration} s")
+            self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Files opened: {reader['files_opened']}, closed: {reader['files_closed']}, handle pool hits: {reader['handle_pool_hits']}, prefetched: {reader['files_prefetched']} ({reader['prefetched_bytes']/1024./1024.:.4f} MB) (rank 0)")
+            if self.args.sample_cache_size > 0:
+                lookups = reader['sample_cache_hits'] + reader['sample_cache_misses']
+                hit_ratio = reader['sample_cache_hits'] / lookups if lookups > 0 else 0.0
+                self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Sample cache hit ratio: {hit_ratio:.4f}, saved: {reader['sample_cache_bytes_saved']/1024./1024.:.4f} MB (rank 0)")
+            if self.args.format == FormatType.CHUNKED_ARRAY:
+                self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Chunks fetched: {reader['chunks_fetched']} (rank 0)")
+            if self.sample_compression:
+                self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Compressed I/O: {self.compressed_io[-1]:.4f} MB/s, logical I/O: {self.logical_io[-1]:.4f} MB/s (rank 0)")
+            if self.image_decode:
+                images = max(reader['images_decoded'], 1)
+                self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Images decoded: {reader['images_decoded']}, read: {reader['image_read_ns']/images/1e6:.4f} ms, decode: {reader['image_decode_ns']/images/1e6:.4f} ms, resize: {reader['image_resize_ns']/images/1e6:.4f} ms per image (rank 0)")
+            if self.args.batch_ring:
+                self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Batches through the batch ring: {reader['ring_batches']}, too large for a slot: {reader['ring_overflows']} (rank 0)")
+            if self.memory_budget:
+                samples = max(reader['inflight_samples'], 1)
+                self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Prefetch memory in flight: {reader['inflight_bytes_sum']/samples/1024./1024.:.4f} MB mean, {reader['inflight_bytes_peak']/1024./1024.:.4f} MB peak, reads waiting for the budget: {reader['budget_waits']} for {reader['budget_wait_ns']/1e9:.4f} s (rank 0)")
+            if not self.args.in_order:
+                delivered = max(reader['delivered_batches'], 1)
+                self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Batches delivered out of order: {reader['reordered_batches']} of {reader['delivered_batches']}, mean reorder depth: {reader['reorder_depth_sum']/delivered:.4f}, latency saved: {reader['reorder_saved_ns']/1e9:.4f} s (rank 0)")
+            if reader['sampled_steps'] > 0:
+                self.logger.output(f"{utcnow()} Epoch {epoch} [Reader] Distinct files per step: {reader['sampled_step_files']/reader['sampled_steps']:.4f} (rank 0)")
 
     def start_eval(self, epoch):
         self.start_timestamp = time()
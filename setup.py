@@ -10,6 +10,7 @@ test_deps = [
 ]
 core_deps = [
     "Pillow>=9.3.0",
+    "crc32c>=2.3",
     "PyYAML>=6.0.0",
     "h5py>=3.11.0",
     "mpi4py>=3.1.4",
@@ -42,6 +43,13 @@ extras = {
     "dftracer": [
         "pydftracer==1.0.11",
     ],
+    "arrow": [
+        "pyarrow>=12.0.0",
+    ],
+    "compression": [
+        "zstandard>=0.21.0",
+        "lz4>=4.0.0",
+    ],
 }
 
 here = pathlib.Path(__file__).parent.resolve()
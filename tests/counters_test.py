@@ -0,0 +1,89 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import multiprocessing
+import threading
+import unittest
+
+from dlio_benchmark.utils.counters import SharedCounters
+
+
+def count_in_worker(counters, n):
+    SharedCounters.set_instance(counters)
+    for _ in range(n):
+        SharedCounters.get_instance().add("files_opened")
+    SharedCounters.get_instance().flush()
+
+
+class TestSharedCounters(unittest.TestCase):
+
+    def test_threads_are_flushed_by_snapshot(self):
+        counters = SharedCounters()
+        barrier = threading.Barrier(5)
+
+        def count():
+            for _ in range(1000):
+                counters.add("files_opened")
+                counters.add("files_closed", 2)
+            barrier.wait()
+
+        threads = [threading.Thread(target=count) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        # counted by live threads, and after they finished, without counting anything twice
+        self.assertEqual(counters.snapshot()["files_opened"], 4000)
+        for thread in threads:
+            thread.join()
+        counters.add("files_opened")
+        snapshot = counters.snapshot()
+        self.assertEqual(snapshot["files_opened"], 4001)
+        self.assertEqual(snapshot["files_closed"], 8000)
+        self.assertEqual(len(counters.threads), 1)
+
+    def test_counts_are_shared_only_once_flushed(self):
+        counters = SharedCounters()
+        counters.add("chunks_fetched", 3)
+        self.assertEqual(counters.values[counters.index["chunks_fetched"]], 0)
+        counters.flush()
+        counters.flush()
+        self.assertEqual(counters.values[counters.index["chunks_fetched"]], 3)
+
+    def test_workers(self):
+        for method in multiprocessing.get_all_start_methods():
+            counters = SharedCounters(method)
+            SharedCounters.set_instance(counters)
+            # counted but not flushed before the workers start
+            counters.add("files_opened", 100)
+            ctx = multiprocessing.get_context(method)
+            workers = [ctx.Process(target=count_in_worker, args=(counters, 10)) for _ in range(2)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            self.assertEqual(counters.get("files_opened"), 120, method)
+
+    def test_maximum(self):
+        counters = SharedCounters()
+        counters.maximum("inflight_bytes_peak", 5)
+        counters.maximum("inflight_bytes_peak", 3)
+        self.assertEqual(counters.get("inflight_bytes_peak"), 5)
+        counters.clear("inflight_bytes_peak")
+        self.assertEqual(counters.get("inflight_bytes_peak"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -341,6 +341,31 @@ def test_eval() -> None:
         clean()
     finalize()
 
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("nt", [0, 2])
+def test_eval_after_epoch(nt) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO test for evaluation starting after the second epoch read_threads={nt}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config',
+                      overrides=['++workload.workflow.train=True', \
+                                 '++workload.workflow.generate_data=True', \
+                                 '++workload.framework=pytorch', \
+                                 '++workload.reader.data_loader=pytorch', \
+                                 f'++workload.reader.read_threads={nt}', \
+                                 'workload.train.computation_time=0.01', \
+                                 'workload.evaluation.eval_time=0.005', \
+                                 '++workload.evaluation.eval_after_epoch=2', \
+                                 '++workload.train.epochs=3', '++workload.workflow.evaluation=True'])
+        benchmark = run_benchmark(cfg)
+        clean()
+    finalize()
+
 @pytest.mark.timeout(60, method="thread")
 
 @pytest.mark.parametrize("framework, nt", [("tensorflow", 0), ("tensorflow", 1),("tensorflow", 2),
@@ -369,6 +394,30 @@ def test_multi_threads(framework, nt) -> None:
     clean()
     finalize()
 
+@pytest.mark.timeout(60, method="thread")
+def test_too_few_samples_per_thread() -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(" DLIO test for a rank with fewer samples than read threads")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True',
+                                                       '++workload.workflow.generate_data=True',
+                                                       "++workload.framework=tensorflow",
+                                                       "++workload.reader.data_loader=tensorflow",
+                                                       "++workload.reader.read_threads=4",
+                                                       'workload.train.computation_time=0.01',
+                                                       '++workload.train.epochs=1',
+                                                       '++workload.dataset.num_samples_per_file=1',
+                                                       '++workload.dataset.num_files_train=2'])
+        with pytest.raises(Exception, match="fewer than its 4 reader threads"):
+            run_benchmark(cfg)
+    clean()
+    finalize()
+
 @pytest.mark.timeout(60, method="thread")
 
 @pytest.mark.parametrize("nt, context", [(0, None), (1, "fork"), (2, "spawn"), (2, "forkserver")])
@@ -406,6 +455,10 @@ def test_pytorch_multiprocessing_context(nt, context) -> None:
                                             ("jpeg", "pytorch", "pytorch", True), ("hdf5", "pytorch", "pytorch", True),
                                             ("csv", "pytorch", "pytorch", True), ("indexed_binary", "pytorch", "pytorch", True),
                                             ("mmap_indexed_binary", "pytorch", "pytorch", True),
+                                            ("hdf5_opt", "tensorflow", "tensorflow", True), ("hdf5_opt", "pytorch", "pytorch", True),
+                                            ("tfrecord", "pytorch", "pytorch", True), ("tfrecord", "pytorch", "dali", True),
+                                            ("parquet", "tensorflow", "tensorflow", True), ("parquet", "pytorch", "pytorch", True),
+                                            ("tar_shard", "tensorflow", "tensorflow", True), ("tar_shard", "pytorch", "pytorch", True),
                                             ("png", "tensorflow", "dali", True), ("npz", "tensorflow", "dali", True),
                                             ("jpeg", "tensorflow", "dali", True), ("hdf5", "tensorflow", "dali", True),
                                             ("csv", "tensorflow", "dali", True), ("indexed_binary", "tensorflow", "dali", True),
@@ -422,6 +475,10 @@ def test_pytorch_multiprocessing_context(nt, context) -> None:
                                             ("jpeg", "pytorch", "pytorch", False), ("hdf5", "pytorch", "pytorch", False),
                                             ("csv", "pytorch", "pytorch", False), ("indexed_binary", "pytorch", "pytorch", False),
                                             ("mmap_indexed_binary", "pytorch", "pytorch", False),
+                                            ("hdf5_opt", "tensorflow", "tensorflow", False), ("hdf5_opt", "pytorch", "pytorch", False),
+                                            ("tfrecord", "pytorch", "pytorch", False), ("tfrecord", "pytorch", "dali", False),
+                                            ("parquet", "tensorflow", "tensorflow", False), ("parquet", "pytorch", "pytorch", False),
+                                            ("tar_shard", "tensorflow", "tensorflow", False), ("tar_shard", "pytorch", "pytorch", False),
                                             ("png", "tensorflow", "dali", False), ("npz", "tensorflow", "dali", False),
                                             ("jpeg", "tensorflow", "dali", False), ("hdf5", "tensorflow", "dali", False),
                                             ("csv", "tensorflow", "dali", False), ("indexed_binary", "tensorflow", "dali", False),
@@ -468,6 +525,7 @@ def test_train(fmt, framework, dataloader, is_even) -> None:
                                             ("jpeg", "pytorch"), ("hdf5", "pytorch"),
                                             ("csv", "pytorch"), ("indexed_binary", "pytorch"),
                                             ("mmap_indexed_binary", "pytorch"),
+                                            ("chunked_array", "tensorflow"), ("chunked_array", "pytorch"),
                                             ])
 def test_custom_storage_root_train(fmt, framework) -> None:
     init()
@@ -494,6 +552,667 @@ def test_custom_storage_root_train(fmt, framework) -> None:
     clean(storage_root)
     finalize()
 
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, byte_source", [("npy", "posix"), ("npy", "mmap"), ("npy", "cached"),
+                                              ("hdf5", "posix"), ("hdf5", "cached"),
+                                              ("hdf5_opt", "posix"), ("hdf5_opt", "cached"),
+                                              ("parquet", "posix"), ("parquet", "cached"),
+                                              ("indexed_binary", "posix"), ("indexed_binary", "mmap"),
+                                              ("indexed_binary", "cached"), ("png", "cached")])
+def test_byte_source_train(fmt, byte_source) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} format through the {byte_source} byte source")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=pytorch", \
+                                                       f"++workload.dataset.format={fmt}",
+                                                       f"++workload.storage.byte_source={byte_source}", \
+                                                       "++workload.storage.cache_folder=data/cache", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=1'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, framework, max_open_files", [("npy", "pytorch", 0), ("npy", "pytorch", 1),
+                                                            ("hdf5", "pytorch", 2), ("hdf5", "tensorflow", 2),
+                                                            ("indexed_binary", "pytorch", 4), ("hdf5_opt", "pytorch", 1)])
+def test_handle_pool_train(fmt, framework, max_open_files) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} format with max_open_files={max_open_files}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       f"++workload.framework={framework}", \
+                                                       f"++workload.reader.data_loader={framework}", \
+                                                       f"++workload.dataset.format={fmt}",
+                                                       f"++workload.reader.max_open_files={max_open_files}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.dataset.num_samples_per_file=4', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, depth, max_bytes", [("npz", 1, 0), ("npz", 4, 0), ("hdf5", 2, 1),
+                                                   ("png", 4, 0), ("indexed_binary", 2, 0), ("hdf5_opt", 2, 0)])
+def test_file_prefetch_train(fmt, depth, max_bytes) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} format with file prefetch depth {depth}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=tensorflow", \
+                                                       "++workload.reader.data_loader=tensorflow", \
+                                                       f"++workload.dataset.format={fmt}",
+                                                       f"++workload.reader.file_prefetch_depth={depth}", \
+                                                       f"++workload.reader.file_prefetch_max_bytes={max_bytes}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.dataset.num_samples_per_file=2', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, policy, cache_size, preprocessed", [("npz", "lru", 1048576, False), ("npz", "lfu", 1048576, False),
+                                                                   ("npz", "arc", 1048576, False), ("npz", "fifo", 1048576, False),
+                                                                   ("hdf5", "lru", 65536, False), ("indexed_binary", "arc", 4194304, True),
+                                                                   ("png", "lru", 4194304, True)])
+def test_sample_cache_train(fmt, policy, cache_size, preprocessed) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} format with a {policy} sample cache of {cache_size} bytes")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=pytorch", \
+                                                       f"++workload.dataset.format={fmt}",
+                                                       f"++workload.reader.sample_cache_size={cache_size}", \
+                                                       f"++workload.reader.sample_cache_policy={policy}", \
+                                                       f"++workload.reader.sample_cache_preprocessed={preprocessed}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=3', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+        if comm.rank == 0 and cache_size >= 1048576:
+            # every sample fits, so the second epoch finds samples cached by the first one
+            assert benchmark.stats.summary['metric']['train_sample_cache_hit_ratio'][1] > 0
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("framework, dont_use_mmap, samples_per_file", [("pytorch", False, 1), ("pytorch", False, 4),
+                                                                        ("pytorch", True, 4), ("tensorflow", False, 4)])
+def test_npy_mmap_train(framework, dont_use_mmap, samples_per_file) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for npy format with dont_use_mmap={dont_use_mmap}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       f"++workload.framework={framework}", \
+                                                       f"++workload.reader.data_loader={framework}", \
+                                                       "++workload.dataset.format=npy",
+                                                       f"++workload.reader.dont_use_mmap={dont_use_mmap}", \
+                                                       f"++workload.dataset.num_samples_per_file={samples_per_file}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("framework, compression", [("pytorch", "none"), ("pytorch", "gzip"),
+                                                    ("pytorch", "zip"), ("tensorflow", "none")])
+def test_csv_chunked_train(framework, compression) -> None:
+    pytest.importorskip("pyarrow")
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for csv format with compression={compression}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       f"++workload.framework={framework}", \
+                                                       f"++workload.reader.data_loader={framework}", \
+                                                       "++workload.dataset.format=csv",
+                                                       f"++workload.dataset.compression={compression}", \
+                                                       "++workload.dataset.num_samples_per_file=8", \
+                                                       "++workload.dataset.generation_buffer_size=65536", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("dont_use_mmap, verify_crc", [(False, False), (True, False), (False, True)])
+def test_tfrecord_index_train(dont_use_mmap, verify_crc) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for tfrecord with the pytorch data loader, dont_use_mmap={dont_use_mmap} verify_crc={verify_crc}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=pytorch", \
+                                                       "++workload.dataset.format=tfrecord",
+                                                       f"++workload.reader.dont_use_mmap={dont_use_mmap}", \
+                                                       f"++workload.reader.tfrecord_verify_crc={verify_crc}", \
+                                                       "++workload.dataset.num_samples_per_file=4", \
+                                                       "++workload.dataset.record_length_bytes=4096", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("row_group_size, num_columns, columns, compression", [(1, 1, "[]", "none"), (4, 1, "[]", "snappy"),
+                                                                               (3, 4, "[data_0,data_2]", "zstd"),
+                                                                               (16, 2, "[data_1]", "gzip")])
+def test_parquet_train(row_group_size, num_columns, columns, compression) -> None:
+    pytest.importorskip("pyarrow")
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for parquet with row groups of {row_group_size}, {num_columns} columns reading {columns}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=pytorch", \
+                                                       "++workload.dataset.format=parquet",
+                                                       f"++workload.dataset.parquet_row_group_size={row_group_size}", \
+                                                       f"++workload.dataset.parquet_num_columns={num_columns}", \
+                                                       f"++workload.dataset.parquet_compression={compression}", \
+                                                       f"++workload.reader.parquet_columns={columns}", \
+                                                       "++workload.dataset.num_samples_per_file=8", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+        if comm.rank == 0:
+            # rows hold distinct bytes, so neither dictionary encoding nor the codec can shrink the files
+            files = list(pathlib.Path(f"{cfg.workload.dataset.data_folder}/train").rglob("*.parquet"))
+            assert len(files) == 16
+            for path in files:
+                assert path.stat().st_size >= 0.95 * 8 * benchmark.args.record_length
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("file_shuffle, sample_shuffle, shuffle_size", [("off", "off", 1), ("seed", "seed", 16),
+                                                                        ("random", "random", 4), ("seed", "off", 1)])
+def test_tar_shard_stream_train(file_shuffle, sample_shuffle, shuffle_size) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for tar_shard streaming with file_shuffle={file_shuffle} sample_shuffle={sample_shuffle}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=tensorflow", \
+                                                       "++workload.reader.data_loader=tensorflow", \
+                                                       "++workload.dataset.format=tar_shard",
+                                                       f"++workload.reader.file_shuffle={file_shuffle}", \
+                                                       f"++workload.reader.sample_shuffle={sample_shuffle}", \
+                                                       f"++workload.reader.shuffle_size={shuffle_size}", \
+                                                       "++workload.dataset.num_samples_per_file=8", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("framework, chunk_shape, fetch_threads", [("pytorch", "[1,64,64]", 8), ("pytorch", "[2,100,30]", 1),
+                                                                   ("pytorch", "[4,512,512]", 4), ("tensorflow", "[1,32,32]", 8)])
+def test_chunked_array_train(framework, chunk_shape, fetch_threads) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for chunked_array with chunk shape {chunk_shape} and {fetch_threads} fetch threads")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       f"++workload.framework={framework}", \
+                                                       f"++workload.reader.data_loader={framework}", \
+                                                       "++workload.dataset.format=chunked_array",
+                                                       f"++workload.dataset.array_chunk_shape={chunk_shape}", \
+                                                       f"++workload.reader.chunk_fetch_threads={fetch_threads}", \
+                                                       "++workload.dataset.num_samples_per_file=4", \
+                                                       "++workload.dataset.record_length_bytes=65536", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, compression, framework", [("indexed_binary", "zlib", "pytorch"),
+                                                         ("mmap_indexed_binary", "zlib", "pytorch"),
+                                                         ("indexed_binary", "zstd", "tensorflow"),
+                                                         ("indexed_binary", "lz4", "pytorch")])
+def test_indexed_binary_compression_train(fmt, compression, framework) -> None:
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    elif compression == "lz4":
+        pytest.importorskip("lz4")
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} with {compression} compressed samples")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       f"++workload.framework={framework}", \
+                                                       f"++workload.reader.data_loader={framework}", \
+                                                       f"++workload.dataset.format={fmt}", \
+                                                       f"++workload.dataset.compression={compression}", \
+                                                       "++workload.dataset.compression_block_size=16384", \
+                                                       "++workload.reader.decompression_threads=2", \
+                                                       "++workload.dataset.record_length_bytes=65536", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, framework, decode_threads, draft", [("jpeg", "tensorflow", 4, True),
+                                                                   ("jpeg", "pytorch", 1, True),
+                                                                   ("jpeg", "tensorflow", 2, False),
+                                                                   ("jpeg", "pytorch", 4, False),
+                                                                   ("png", "pytorch", 4, True)])
+def test_image_decode_train(fmt, framework, decode_threads, draft) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} decoding with {decode_threads} threads and draft mode {draft}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       f"++workload.framework={framework}", \
+                                                       f"++workload.reader.data_loader={framework}", \
+                                                       f"++workload.dataset.format={fmt}", \
+                                                       "++workload.dataset.num_samples_per_file=1", \
+                                                       "++workload.dataset.record_length_bytes=262144", \
+                                                       "++workload.dataset.record_length_bytes_resize=16384", \
+                                                       "++workload.reader.image_decode=True", \
+                                                       f"++workload.reader.image_decode_threads={decode_threads}", \
+                                                       f"++workload.reader.image_jpeg_draft={draft}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("framework, fmt, bucket_size", [("pytorch", "npz", 0), ("pytorch", "hdf5", 4096),
+                                                         ("pytorch", "indexed_binary", 0), ("tensorflow", "npy", 0),
+                                                         ("tensorflow", "hdf5", 4096)])
+def test_return_payload_train(framework, fmt, bucket_size) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test returning {fmt} payloads to {framework} with bucket size {bucket_size}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       f"++workload.framework={framework}", \
+                                                       f"++workload.reader.data_loader={framework}", \
+                                                       f"++workload.dataset.format={fmt}", \
+                                                       "++workload.dataset.record_length_bytes=65536", \
+                                                       "++workload.dataset.record_length_bytes_stdev=16384", \
+                                                       "++workload.reader.return_payload=True", \
+                                                       f"++workload.reader.payload_bucket_size={bucket_size}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("framework, fmt, sample_shuffle", [("pytorch", "npz", "seed"), ("pytorch", "indexed_binary", "random"),
+                                                            ("pytorch", "mmap_indexed_binary", "seed"),
+                                                            ("tensorflow", "npz", "seed"), ("tensorflow", "hdf5", "off")])
+def test_sample_permutation_train(framework, fmt, sample_shuffle) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} with permuted sampling ({sample_shuffle}) on {framework}")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       f"++workload.framework={framework}", \
+                                                       f"++workload.reader.data_loader={framework}", \
+                                                       f"++workload.dataset.format={fmt}", \
+                                                       "++workload.reader.sample_permutation=True", \
+                                                       f"++workload.reader.sample_shuffle={sample_shuffle}", \
+                                                       "++workload.train.seed_change_epoch=True", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       # with one sample per file, a rank reads files in epoch 2 that it did not read in epoch 1
+                                                       '++workload.dataset.num_samples_per_file=1', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+        if framework == "pytorch" and sample_shuffle != "off":
+            from dlio_benchmark.common.enumerations import DatasetType
+            from dlio_benchmark.data_loader.torch_data_loader import dlio_batch_sampler
+            # workers resolve batches with the permutation sent along with them
+            loader = benchmark.framework.get_loader(DatasetType.TRAIN)
+            orders = []
+            for epoch in [1, 2]:
+                benchmark.args.reconfigure(epoch)
+                loader.sampler.set_epoch(epoch)
+                indices = next(iter(dlio_batch_sampler(loader.sampler, loader.batch_size)))
+                orders.append(indices.permutation.permute(indices).tolist())
+            assert orders[0] != orders[1]
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, batch_read_threads, return_payload", [("npz", 1, False), ("npz", 4, False),
+                                                                      ("hdf5_opt", 1, False), ("npy", 4, True)])
+def test_batch_fetch_train(fmt, batch_read_threads, return_payload) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} with batch fetch ({batch_read_threads} threads, payload {return_payload})")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=pytorch", \
+                                                       f"++workload.dataset.format={fmt}", \
+                                                       f"++workload.reader.batch_read_threads={batch_read_threads}", \
+                                                       f"++workload.reader.return_payload={return_payload}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=1', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.dataset.num_samples_per_file=4', \
+                                                       '++workload.reader.batch_size=4', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("sample_shuffle, file_shuffle, window", [("off", "off", 0), ("seed", "off", 0),
+                                                                  ("seed", "seed", 8), ("random", "random", 4)])
+def test_pytorch_sampler_shuffle_train(sample_shuffle, file_shuffle, window) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for the pytorch sampler ({sample_shuffle}, {file_shuffle}, window {window})")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=pytorch", \
+                                                       f"++workload.reader.sample_shuffle={sample_shuffle}", \
+                                                       f"++workload.reader.file_shuffle={file_shuffle}", \
+                                                       f"++workload.reader.sample_shuffle_window={window}", \
+                                                       "++workload.train.seed_change_epoch=True", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.dataset.num_samples_per_file=4', \
+                                                       '++workload.reader.batch_size=4', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+        if comm.rank == 0:
+            files_per_step = benchmark.stats.summary['metric']['train_files_per_step']
+            assert len(files_per_step) == 2
+            if sample_shuffle == "off":
+                assert files_per_step == [1.0, 1.0]
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("return_payload, slot_size", [(False, 0), (True, 0), (True, 1024)])
+def test_batch_ring_train(return_payload, slot_size) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for the batch ring (payload {return_payload}, slot size {slot_size})")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=pytorch", \
+                                                       "++workload.dataset.format=npy", \
+                                                       "++workload.reader.batch_ring=True", \
+                                                       f"++workload.reader.batch_ring_slot_size={slot_size}", \
+                                                       f"++workload.reader.return_payload={return_payload}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.batch_size=4', \
+                                                       '++workload.reader.read_threads=2'])
+        benchmark = run_benchmark(cfg)
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, in_order, return_payload", [("npy", True, False), ("npz", False, False),
+                                                            ("hdf5", True, True)])
+def test_threaded_data_loader_train(fmt, in_order, return_payload) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} with the threaded data loader (in order {in_order})")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=threaded", \
+                                                       f"++workload.dataset.format={fmt}", \
+                                                       f"++workload.reader.in_order={in_order}", \
+                                                       f"++workload.reader.return_payload={return_payload}", \
+                                                       "++workload.reader.sample_shuffle=seed", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.batch_size=4', \
+                                                       '++workload.reader.read_threads=4'])
+        benchmark = run_benchmark(cfg)
+        from dlio_benchmark.common.enumerations import DatasetType
+        # the pool and its readers are released once the run ends
+        loader = benchmark.framework.get_loader(DatasetType.TRAIN)
+        assert loader.executor is None and loader.readers == []
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("fmt, concurrency, in_order", [("npy", 16, True), ("npz", 4, False), ("hdf5", 32, True)])
+def test_asyncio_data_loader_train(fmt, concurrency, in_order) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for {fmt} with the asyncio data loader ({concurrency} reads in flight)")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       "++workload.reader.data_loader=asyncio", \
+                                                       f"++workload.dataset.format={fmt}", \
+                                                       f"++workload.reader.async_concurrency={concurrency}", \
+                                                       f"++workload.reader.in_order={in_order}", \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.batch_size=4'])
+        benchmark = run_benchmark(cfg)
+        from dlio_benchmark.common.enumerations import DatasetType
+        # the pool and its readers are released once the run ends
+        loader = benchmark.framework.get_loader(DatasetType.TRAIN)
+        assert loader.executor is None and loader.readers == []
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("loader, window", [("pytorch", 0), ("pytorch", 2), ("threaded", 0), ("threaded", 2),
+                                            ("asyncio", 0), ("asyncio", 2)])
+def test_out_of_order_train(loader, window) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for out of order delivery with the {loader} data loader (window {window})")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       f"++workload.reader.data_loader={loader}", \
+                                                       "++workload.reader.in_order=False", \
+                                                       f"++workload.reader.reorder_window={window}", \
+                                                       '++workload.reader.read_threads=2', \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.batch_size=4'])
+        benchmark = run_benchmark(cfg)
+        if comm.rank == 0:
+            metric = benchmark.stats.summary['metric']
+            assert len(metric['train_reordered_batches_fraction']) == 2
+            assert all(0.0 <= f <= 1.0 for f in metric['train_reordered_batches_fraction'])
+            if window > 0:
+                assert all(d < window for d in metric['train_reorder_depth_mean'])
+    clean()
+    finalize()
+
+@pytest.mark.timeout(60, method="thread")
+@pytest.mark.parametrize("loader, budget", [("pytorch", 1024), ("pytorch", 1048576), ("threaded", 1024),
+                                            ("threaded", 1048576), ("asyncio", 1024), ("asyncio", 1048576)])
+def test_prefetch_memory_budget_train(loader, budget) -> None:
+    init()
+    clean()
+    if (comm.rank == 0):
+        logging.info("")
+        logging.info("=" * 80)
+        logging.info(f" DLIO training test for a prefetch memory budget of {budget} bytes with the {loader} data loader")
+        logging.info("=" * 80)
+    with initialize_config_dir(version_base=None, config_dir=config_dir):
+        cfg = compose(config_name='config', overrides=['++workload.workflow.train=True', \
+                                                       '++workload.workflow.generate_data=True', \
+                                                       "++workload.framework=pytorch", \
+                                                       f"++workload.reader.data_loader={loader}", \
+                                                       f"++workload.reader.prefetch_memory_budget={budget}", \
+                                                       '++workload.reader.read_threads=2', \
+                                                       '++workload.reader.prefetch_size=4', \
+                                                       'workload.train.computation_time=0.01', \
+                                                       '++workload.train.epochs=2', \
+                                                       '++workload.dataset.num_files_train=16', \
+                                                       '++workload.reader.batch_size=4'])
+        benchmark = run_benchmark(cfg)
+        if comm.rank == 0:
+            metric = benchmark.stats.summary['metric']
+            assert len(metric['train_inflight_peak_MB']) == 2
+            assert all(peak > 0 for peak in metric['train_inflight_peak_MB'])
+    clean()
+    finalize()
+
 compute_time_distributions = {
     "uniform": {"type": "uniform", "min": 1.0, "max": 2.0},
     "normal": {"type": "normal", "mean": 1.0, "stdev": 1.0},
@@ -0,0 +1,102 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import os
+import tempfile
+import threading
+import unittest
+
+from dlio_benchmark.reader.reader_handler import FilePrefetcher
+from dlio_benchmark.storage.byte_source import CachedByteSource, MMapByteSource, PosixByteSource
+from dlio_benchmark.utils.config import ConfigArguments
+from dlio_benchmark.utils.counters import SharedCounters
+
+FILE_BYTES = 1000
+
+
+class FakePool(object):
+
+    def contains(self, reader, filename):
+        return False
+
+
+class FakeReader(object):
+    """
+    Records the order in which the prefetcher opens and reads ahead files.
+    """
+
+    def __init__(self):
+        self.handle_pool = FakePool()
+        self.events = []
+        self.lock = threading.Lock()
+
+    def open(self, filename):
+        with self.lock:
+            self.events.append(("open", filename))
+        return filename
+
+    def readahead(self, filename):
+        with self.lock:
+            self.events.append(("readahead", filename))
+        return FILE_BYTES
+
+    def close_handle(self, filename, handle):
+        pass
+
+
+class TestFilePrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.data = os.urandom(3 * 4096 + 17)
+        self.path = os.path.join(self.folder.name, "file.bin")
+        with open(self.path, "wb") as fd:
+            fd.write(self.data)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_files_are_read_ahead_before_they_are_taken(self):
+        counters = SharedCounters.initialize()
+        reader = FakeReader()
+        filenames = [f"file_{i}" for i in range(5)]
+        prefetcher = FilePrefetcher(reader, filenames, 2, 0, FILE_BYTES).start()
+        for filename in filenames:
+            self.assertEqual(prefetcher.take(filename), filename)
+            with reader.lock:
+                self.assertIn(("readahead", filename), reader.events)
+        prefetcher.stop()
+        self.assertEqual([event for event, _ in reader.events], ["open", "readahead"] * len(filenames))
+        self.assertEqual(counters.get("prefetched_bytes"), len(filenames) * FILE_BYTES)
+
+    def test_posix_and_mmap_read_ahead_the_whole_file(self):
+        for source in [PosixByteSource(), MMapByteSource()]:
+            self.assertEqual(source.readahead(self.path), len(self.data), type(source).__name__)
+            self.assertEqual(bytes(source.read(self.path, 5, 100)), self.data[5:105])
+            source.release(self.path)
+
+    def test_cached_read_ahead_fills_the_cache(self):
+        ConfigArguments.get_instance().cache_folder = os.path.join(self.folder.name, "cache")
+        source = CachedByteSource(PosixByteSource())
+        cache_path = source.cache_path(self.path)
+        self.assertFalse(os.path.exists(cache_path))
+        self.assertEqual(source.readahead(self.path), len(self.data))
+        with open(cache_path, "rb") as fd:
+            self.assertEqual(fd.read(), self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import unittest
+
+import numpy as np
+
+from dlio_benchmark.utils.permutation import FeistelPermutation
+
+SIZES = [1, 2, 3, 5, 7, 100, 1000, 1023, 1025, 4097, 65537]
+
+
+class TestFeistelPermutation(unittest.TestCase):
+
+    def test_bijection(self):
+        for size in SIZES:
+            for key in [0, 1, 12345]:
+                permuted = FeistelPermutation(size, key).permute(np.arange(size))
+                self.assertEqual(sorted(permuted.tolist()), list(range(size)), f"size {size} key {key}")
+
+    def test_scalar_matches_vectorized(self):
+        for size in SIZES:
+            permutation = FeistelPermutation(size, 42)
+            indices = np.arange(size)
+            self.assertEqual([permutation(i) for i in indices.tolist()], permutation.permute(indices).tolist(),
+                             f"size {size}")
+
+    def test_keys(self):
+        size = 1000
+        identity = FeistelPermutation(size, None)
+        self.assertEqual(identity.permute(np.arange(size)).tolist(), list(range(size)))
+        self.assertEqual(identity(7), 7)
+        first = FeistelPermutation(size, 1).permute(np.arange(size))
+        second = FeistelPermutation(size, 2).permute(np.arange(size))
+        self.assertNotEqual(first.tolist(), second.tolist())
+        self.assertEqual(first.tolist(), FeistelPermutation(size, 1).permute(np.arange(size)).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import io
+import unittest
+
+from dlio_benchmark.storage.s3_file import S3File
+
+BLOCK = 16
+
+
+class FakeStorage(object):
+    """
+    Serves one object from memory and records the offset and length of the ranges it returned.
+    """
+
+    def __init__(self, data, with_size=True):
+        self.data = data
+        self.with_size = with_size
+        self.reads = []
+
+    def get_size(self, path):
+        return len(self.data) if self.with_size else None
+
+    def read(self, path, offset=None, length=None):
+        if offset is None:
+            self.reads.append((0, len(self.data)))
+            return self.data
+        data = self.data[offset:offset + length]
+        self.reads.append((offset, len(data)))
+        return data
+
+
+class TestS3File(unittest.TestCase):
+
+    def open(self, size, **kwargs):
+        data = bytes(i % 251 for i in range(size))
+        storage = FakeStorage(data, kwargs.pop("with_size", True))
+        kwargs.setdefault("block_size", BLOCK)
+        kwargs.setdefault("max_readahead", 8 * BLOCK)
+        kwargs.setdefault("cache_size", 64 * BLOCK)
+        return data, storage, S3File(storage, "object", **kwargs)
+
+    def test_sequential_reads_double_the_readahead(self):
+        data, storage, f = self.open(64 * BLOCK)
+        while f.read(BLOCK):
+            pass
+        self.assertEqual([length // BLOCK for _, length in storage.reads], [1, 2, 4, 8, 8, 8, 8, 8, 8, 8, 1])
+        self.assertEqual(f.bytes_read, len(data))
+
+    def test_cache_hits_do_not_grow_the_readahead(self):
+        _, storage, f = self.open(64 * BLOCK)
+        f.read(BLOCK)
+        f.read(BLOCK)
+        # blocks 1 and 2 came with one read; reading block 2 again and on is a hit
+        for _ in range(3):
+            f.seek(2 * BLOCK)
+            f.read(BLOCK)
+        self.assertEqual(f._readahead_blocks, 2)
+        f.read(BLOCK)
+        self.assertEqual(storage.reads[-1], (3 * BLOCK, 4 * BLOCK))
+
+    def test_random_seek_resets_the_readahead(self):
+        _, storage, f = self.open(64 * BLOCK)
+        for _ in range(4):
+            f.read(BLOCK)
+        f.seek(40 * BLOCK)
+        f.read(BLOCK)
+        self.assertEqual(storage.reads[-1], (40 * BLOCK, BLOCK))
+
+    def test_cache_evicts_least_recently_used_blocks(self):
+        _, storage, f = self.open(64 * BLOCK, max_readahead=BLOCK, cache_size=4 * BLOCK)
+        for block in [0, 10, 20, 30]:
+            f.seek(block * BLOCK)
+            f.read(1)
+        f.seek(0)
+        f.read(1)
+        f.seek(40 * BLOCK)
+        f.read(1)
+        self.assertEqual(list(f._blocks.keys()), [20, 30, 0, 40])
+        reads = len(storage.reads)
+        f.seek(10 * BLOCK)
+        f.read(1)
+        self.assertEqual(len(storage.reads), reads + 1)
+        self.assertLessEqual(len(f._blocks), 4)
+
+    def test_read_across_block_boundaries(self):
+        data, _, f = self.open(10 * BLOCK + 5)
+        f.seek(BLOCK - 3)
+        self.assertEqual(f.read(2 * BLOCK + 6), data[BLOCK - 3:3 * BLOCK + 3])
+        buffer = bytearray(BLOCK + 2)
+        f.seek(4 * BLOCK + 7)
+        self.assertEqual(f.readinto(buffer), BLOCK + 2)
+        self.assertEqual(bytes(buffer), data[4 * BLOCK + 7:5 * BLOCK + 9])
+
+    def test_read_at_and_past_the_end(self):
+        data, _, f = self.open(3 * BLOCK + 5)
+        f.seek(-4, io.SEEK_END)
+        self.assertEqual(f.read(100), data[-4:])
+        self.assertEqual(f.read(10), b"")
+        f.seek(10 * BLOCK)
+        self.assertEqual(f.read(10), b"")
+        self.assertEqual(f.readinto(bytearray(0)), 0)
+        f.seek(0)
+        self.assertEqual(f.read(), data)
+
+    def test_seek_whence_and_errors(self):
+        data, _, f = self.open(2 * BLOCK)
+        self.assertEqual(f.seek(5), 5)
+        self.assertEqual(f.seek(3, io.SEEK_CUR), 8)
+        self.assertEqual(f.seek(-1, io.SEEK_END), len(data) - 1)
+        self.assertEqual(f.tell(), len(data) - 1)
+        with self.assertRaises(ValueError):
+            f.seek(-1)
+        with self.assertRaises(ValueError):
+            f.seek(0, 3)
+
+    def test_unknown_size_fetches_the_object_once(self):
+        data, storage, f = self.open(5 * BLOCK + 1, with_size=False)
+        self.assertEqual(f.size(), len(data))
+        self.assertEqual(f.read(), data)
+        self.assertEqual(storage.reads, [(0, len(data))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import unittest
+
+from dlio_benchmark.common.enumerations import CachePolicy
+from dlio_benchmark.reader.sample_cache import ARCCache, FIFOCache, LFUCache, LRUCache, SampleCacheFactory
+
+
+def fill(cache, keys, nbytes=1):
+    for key in keys:
+        cache.put(key, f"value of {key}", nbytes)
+
+
+def cached(cache, keys):
+    return [key for key in keys if cache.get(key) is not None]
+
+
+class TestSampleCache(unittest.TestCase):
+
+    def test_factory(self):
+        for policy, cls in [(CachePolicy.LRU, LRUCache), (CachePolicy.LFU, LFUCache),
+                            (CachePolicy.ARC, ARCCache), (CachePolicy.FIFO, FIFOCache)]:
+            self.assertIsInstance(SampleCacheFactory.get_cache(policy, 16), cls)
+
+    def test_capacity_bound(self):
+        for cls in [FIFOCache, LRUCache, LFUCache, ARCCache]:
+            cache = cls(10)
+            cache.put("large", "x", 11)
+            self.assertIsNone(cache.get("large"), cls.__name__)
+            for i, nbytes in enumerate([4, 3, 4, 2, 5, 1, 4, 3, 2, 4]):
+                cache.put(i, i, nbytes)
+                self.assertLessEqual(cache.size, 10, cls.__name__)
+                self.assertEqual(cache.get(i), i, cls.__name__)
+
+    def test_fifo_evicts_in_insertion_order(self):
+        cache = FIFOCache(3)
+        fill(cache, "abc")
+        cache.get("a")
+        fill(cache, "d")
+        self.assertEqual(cached(cache, "abcd"), ["b", "c", "d"])
+        fill(cache, "e")
+        self.assertEqual(cached(cache, "abcde"), ["c", "d", "e"])
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = LRUCache(3)
+        fill(cache, "abc")
+        cache.get("a")
+        fill(cache, "d")
+        self.assertEqual(cached(cache, "abcd"), ["a", "c", "d"])
+        # the lookups above made d the most and a the least recently used entry
+        fill(cache, "e")
+        self.assertEqual(cached(cache, "acde"), ["c", "d", "e"])
+
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = LFUCache(3)
+        fill(cache, "abc")
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        fill(cache, "d")
+        self.assertEqual(set(cached(cache, "abcd")), {"a", "b", "d"})
+
+    def test_lfu_breaks_ties_by_recency(self):
+        cache = LFUCache(2)
+        fill(cache, "xy")
+        fill(cache, "z")
+        self.assertIsNone(cache.get("x"))
+        self.assertEqual(cache.get("y"), "value of y")
+        self.assertEqual(cache.get("z"), "value of z")
+
+    def test_arc_ghost_transitions(self):
+        cache = ARCCache(4)
+        fill(cache, "abcd")
+        self.assertEqual(list(cache.t1), ["a", "b", "c", "d"])
+        # a second reference promotes an entry from t1 to t2
+        cache.get("a")
+        self.assertEqual(list(cache.t1), ["b", "c", "d"])
+        self.assertEqual(list(cache.t2), ["a"])
+        # t1 is above its target, so its oldest entry becomes a ghost in b1
+        fill(cache, "e")
+        self.assertEqual(list(cache.t1), ["c", "d", "e"])
+        self.assertEqual(list(cache.b1), ["b"])
+        # a hit in b1 grows the target of t1 and brings the entry back into t2
+        fill(cache, "b")
+        self.assertEqual(cache.p, 1)
+        self.assertEqual(list(cache.t2), ["a", "b"])
+        self.assertEqual(list(cache.t1), ["d", "e"])
+        self.assertEqual(list(cache.b1), ["c"])
+        # with t1 at its target, room is made in t2, whose oldest entry becomes a ghost in b2
+        fill(cache, "c")
+        self.assertEqual(cache.p, 2)
+        self.assertEqual(list(cache.t2), ["b", "c"])
+        self.assertEqual(list(cache.b2), ["a"])
+        # a hit in b2 shrinks the target of t1
+        fill(cache, "a")
+        self.assertEqual(cache.p, 1)
+        self.assertEqual(list(cache.t2), ["b", "c", "a"])
+        self.assertEqual(list(cache.t1), ["e"])
+        self.assertEqual(list(cache.b1), ["d"])
+        self.assertEqual(list(cache.b2), [])
+        self.assertEqual(len(cache), 4)
+        self.assertEqual(cache.size, 4)
+
+    def test_arc_bounds_ghost_lists(self):
+        cache = ARCCache(4)
+        fill(cache, range(100))
+        self.assertLessEqual(cache.t1_bytes + cache.b1_bytes, 4)
+        self.assertLessEqual(cache.t1_bytes + cache.t2_bytes + cache.b1_bytes + cache.b2_bytes, 8)
+        self.assertEqual(cached(cache, range(100)), [96, 97, 98, 99])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+   Copyright (c) 2025, UChicago Argonne, LLC
+   All Rights Reserved
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import struct
+import unittest
+
+import numpy as np
+
+from dlio_benchmark.common.enumerations import Compression
+from dlio_benchmark.utils.sample_codec import HEADER, LZ4_AVAILABLE, SampleCodec, zstandard
+
+BLOCK = 1024
+
+
+def codecs():
+    available = [Compression.ZLIB]
+    if zstandard is not None:
+        available.append(Compression.ZSTD)
+    if LZ4_AVAILABLE:
+        available.append(Compression.LZ4)
+    return available
+
+
+def sample(size):
+    # half random, half zeros, so the blocks compress to different sizes
+    data = np.zeros(size, dtype=np.uint8)
+    data[:size // 2] = np.random.default_rng(size).integers(0, 256, size // 2, dtype=np.uint8)
+    return data
+
+
+class TestSampleCodec(unittest.TestCase):
+
+    def test_round_trip(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for compression in codecs():
+                codec = SampleCodec(compression, 1, BLOCK)
+                for size in [1, BLOCK - 1, BLOCK, BLOCK + 1, 10 * BLOCK + 17]:
+                    data = sample(size)
+                    compressed = codec.compress(data)
+                    count, logical = HEADER.unpack_from(compressed, 0)
+                    self.assertEqual(count, -(-size // BLOCK))
+                    self.assertEqual(logical, size)
+                    self.assertEqual(SampleCodec.logical_size(compressed), size)
+                    inline = codec.decompress(compressed)
+                    threaded = codec.decompress(compressed, executor)
+                    self.assertEqual(inline.dtype, np.uint8)
+                    self.assertTrue(np.array_equal(inline, data), f"{compression} {size}")
+                    self.assertTrue(np.array_equal(threaded, data), f"{compression} {size}")
+
+    def test_size_mismatch(self):
+        codec = SampleCodec(Compression.ZLIB, 1, BLOCK)
+        compressed = bytearray(codec.compress(sample(3 * BLOCK)))
+        struct.pack_into("<Q", compressed, 4, 3 * BLOCK + 1)
+        with self.assertRaises(Exception):
+            codec.decompress(bytes(compressed))
+
+    def test_unsupported_codec(self):
+        with self.assertRaises(Exception):
+            SampleCodec(Compression.NONE, 1, BLOCK)
+
+
+if __name__ == '__main__':
+    unittest.main()